@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import AsyncGenerator
 from uuid import UUID
@@ -5,58 +6,158 @@ from uuid import UUID
 from _decimal import Decimal
 
 from app.application.common.collector import Collector
+from app.infrastructure.clients.frame_recorder import FrameRecorder
 from app.infrastructure.clients.order_book_client.binance_http_client import \
     BinanceHttpClient
+from app.infrastructure.clients.order_book_client.binance_stream_manager import \
+    BinanceStreamManager
 from app.infrastructure.clients.order_book_client.binance_websocket_client import \
     BinanceWebsocketClient
+from app.infrastructure.clients.order_book_client.schemas.binance import \
+    BinanceOrderBookDepthUpdate
 from app.infrastructure.clients.order_book_client.schemas.common import \
     OrderBookEvent
+from app.utilities.fixed_point_utils import DecimalScale, LevelParser
+from app.utilities.metrics_utils import (ORDER_BOOK_RESYNCS,
+                                         ORDER_BOOK_SEQUENCE_GAPS)
+from app.utilities.reconnect_utils import ReconnectPolicy
+
+# Priorities of snapshot fetches in the Binance request queue
+RESYNC_SNAPSHOT_PRIORITY = 0
+INITIAL_SNAPSHOT_PRIORITY = 1
 
 
 class BinanceCollector(Collector):
+    exchange_name = "BINANCE"
+    host = "stream.binance.com"
+    # Every reconnection fetches a REST snapshot, which costs request weight
+    reconnect_policy = ReconnectPolicy(initial_delay=2.0, max_delay=60.0)
+
     def __init__(
-        self, launch_id: UUID, pair_id: UUID, symbol: str, delimiter: Decimal
+        self,
+        launch_id: UUID,
+        pair_id: UUID,
+        symbol: str,
+        delimiter: Decimal,
+        scale: LevelParser = DecimalScale(),
+        max_resync_attempts: int = 3,
+        stream_manager: BinanceStreamManager | None = None,
+        recorder: FrameRecorder | None = None,
     ):
         super().__init__(
             launch_id=launch_id,
             pair_id=pair_id,
             symbol=symbol,
             delimiter=delimiter,
+            scale=scale,
+        )
+        self._http_client = BinanceHttpClient(
+            symbol, scale=scale, recorder=recorder
+        )
+        self._ws_client = BinanceWebsocketClient(
+            symbol,
+            scale=scale,
+            stream_manager=stream_manager,
+            recorder=recorder,
         )
-        self._http_client = BinanceHttpClient(symbol)
-        self._ws_client = BinanceWebsocketClient(symbol)
+        # Consecutive resyncs before giving up and reconnecting
+        self._max_resync_attempts = max_resync_attempts
 
     async def _broadcast_stream(self) -> AsyncGenerator[OrderBookEvent, None]:
-        # Open the stream and start the generator for the stream events
-        event_generator = self._ws_client.listen_depth_stream()
+        # Read the stream in the background, so that diffs keep being
+        # buffered while a snapshot is fetched
+        events_queue: asyncio.Queue[
+            BinanceOrderBookDepthUpdate | None
+        ] = asyncio.Queue()
+        reader_task = asyncio.create_task(
+            self.__read_depth_stream(events_queue)
+        )
+
+        try:
+            last_update_id: int | None = None
+            pending_event: BinanceOrderBookDepthUpdate | None = None
+            resync_attempts = 0
+
+            while True:
+                if last_update_id is None:
+                    # Fetch the initial or resync snapshot from exchange.
+                    # Resyncs go first, as their pairs already have a
+                    # book which became stale.
+                    snapshot = (
+                        await self._http_client.fetch_order_book_snapshot(
+                            priority=(
+                                RESYNC_SNAPSHOT_PRIORITY
+                                if resync_attempts
+                                else INITIAL_SNAPSHOT_PRIORITY
+                            )
+                        )
+                    )
+
+                    if snapshot is None:
+                        return
+
+                    # Handle the snapshot
+                    yield snapshot
+
+                    last_update_id = snapshot.last_update_id
+
+                if pending_event is not None:
+                    update_event = pending_event
+                    pending_event = None
+                else:
+                    queued_event = await events_queue.get()
+
+                    if queued_event is None:
+                        # Raises the error the stream was closed with
+                        await reader_task
+                        return
+
+                    update_event = queued_event
 
-        # Fetch the initial snapshot from exchange
-        snapshot = await self._http_client.fetch_order_book_snapshot()
+                logging.debug(
+                    f"Processing update event {update_event} [symbol={self.symbol}]"
+                )
 
-        if snapshot is None:
-            await event_generator.aclose()
-            return
+                # Drop any event where u is <= lastUpdateId in the snapshot
+                if update_event.final_update_id <= last_update_id:
+                    continue
 
-        # Handle the initial snapshot
-        yield snapshot
+                # The first processed event should have U <= lastUpdateId+1 AND u >= lastUpdateId+1
+                # After the first update, each new event's U should be equal to the previous event's u+1
+                if update_event.first_update_id > last_update_id + 1:
+                    if resync_attempts == self._max_resync_attempts:
+                        raise Exception("Update event out of order")
 
-        last_update_id = snapshot.last_update_id
+                    logging.warning(
+                        f"Gap in update events, resynchronizing order book "
+                        f"[symbol={self.symbol}]"
+                    )
+                    ORDER_BOOK_SEQUENCE_GAPS.labels(
+                        exchange="BINANCE", symbol=self.symbol
+                    ).inc()
+                    ORDER_BOOK_RESYNCS.labels(
+                        exchange="BINANCE", symbol=self.symbol
+                    ).inc()
 
-        # Process the buffered and incoming stream events
-        async for update_event in event_generator:
-            logging.debug(
-                f"Processing update event {update_event} [symbol={self.symbol}]"
-            )
+                    # The event is replayed on top of the new snapshot
+                    resync_attempts += 1
+                    pending_event = update_event
+                    last_update_id = None
+                    continue
 
-            # Drop any event where u is <= lastUpdateId in the snapshot
-            if update_event.final_update_id <= last_update_id:
-                continue
+                resync_attempts = 0
+                last_update_id = update_event.final_update_id
 
-            # The first processed event should have U <= lastUpdateId+1 AND u >= lastUpdateId+1
-            # After the first update, each new event's U should be equal to the previous event's u+1
-            assert (
-                last_update_id < update_event.first_update_id
-            ), "Update event out of order"
-            last_update_id = update_event.final_update_id
+                yield update_event
+        finally:
+            reader_task.cancel()
 
-            yield update_event
+    async def __read_depth_stream(
+        self, events_queue: asyncio.Queue[BinanceOrderBookDepthUpdate | None]
+    ) -> None:
+        try:
+            async for update_event in self._ws_client.listen_depth_stream():
+                events_queue.put_nowait(update_event)
+        finally:
+            # Marks the end of the stream
+            events_queue.put_nowait(None)
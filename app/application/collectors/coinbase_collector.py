@@ -4,23 +4,43 @@ from uuid import UUID
 from _decimal import Decimal
 
 from app.application.common.collector import Collector
+from app.infrastructure.clients.frame_recorder import FrameRecorder
+from app.infrastructure.clients.order_book_client.coinbase_shared_connection import \
+    CoinbaseSharedConnection
 from app.infrastructure.clients.order_book_client.coinbase_websocket_client import \
     CoinbaseWebsocketClient
 from app.infrastructure.clients.order_book_client.schemas.common import \
     OrderBookEvent
+from app.utilities.fixed_point_utils import DecimalScale, LevelParser
 
 
 class CoinbaseCollector(Collector):
+    exchange_name = "COINBASE"
+    host = "ws-feed.exchange.coinbase.com"
+
     def __init__(
-        self, launch_id: UUID, pair_id: UUID, symbol: str, delimiter: Decimal
+        self,
+        launch_id: UUID,
+        pair_id: UUID,
+        symbol: str,
+        delimiter: Decimal,
+        scale: LevelParser = DecimalScale(),
+        connection: CoinbaseSharedConnection | None = None,
+        recorder: FrameRecorder | None = None,
     ):
         super().__init__(
             launch_id=launch_id,
             pair_id=pair_id,
             symbol=symbol,
             delimiter=delimiter,
+            scale=scale,
+        )
+        self._ws_client = CoinbaseWebsocketClient(
+            symbol=symbol,
+            scale=scale,
+            connection=connection,
+            recorder=recorder,
         )
-        self._ws_client = CoinbaseWebsocketClient(symbol=symbol)
 
     async def _broadcast_stream(
         self,
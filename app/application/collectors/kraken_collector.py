@@ -4,23 +4,43 @@ from uuid import UUID
 from _decimal import Decimal
 
 from app.application.common.collector import Collector
+from app.infrastructure.clients.frame_recorder import FrameRecorder
+from app.infrastructure.clients.order_book_client.kraken_shared_connection import \
+    KrakenSharedConnection
 from app.infrastructure.clients.order_book_client.kraken_websocket_client import \
     KrakenWebsocketClient
 from app.infrastructure.clients.order_book_client.schemas.common import \
     OrderBookEvent
+from app.utilities.fixed_point_utils import DecimalScale, LevelScale
 
 
 class KrakenCollector(Collector):
+    exchange_name = "KRAKEN"
+    host = "ws.kraken.com"
+
     def __init__(
-        self, launch_id: UUID, pair_id: UUID, symbol: str, delimiter: Decimal
+        self,
+        launch_id: UUID,
+        pair_id: UUID,
+        symbol: str,
+        delimiter: Decimal,
+        scale: LevelScale = DecimalScale(),
+        connection: KrakenSharedConnection | None = None,
+        recorder: FrameRecorder | None = None,
     ):
         super().__init__(
             launch_id=launch_id,
             pair_id=pair_id,
             symbol=symbol,
             delimiter=delimiter,
+            scale=scale,
+        )
+        self._ws_client = KrakenWebsocketClient(
+            symbol=symbol,
+            scale=scale,
+            connection=connection,
+            recorder=recorder,
         )
-        self._ws_client = KrakenWebsocketClient(symbol=symbol)
 
     async def _broadcast_stream(
         self,
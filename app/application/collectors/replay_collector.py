@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import AsyncGenerator, AsyncIterator
+from uuid import UUID
+
+from _decimal import Decimal
+
+from app.application.common.collector import Collector
+from app.infrastructure.clients.frame_recorder import (RecordedFrame,
+                                                       get_recording_directory,
+                                                       read_frames_in_thread)
+from app.infrastructure.clients.order_book_client.binance_http_client import \
+    BinanceHttpClient
+from app.infrastructure.clients.order_book_client.binance_websocket_client import \
+    BinanceWebsocketClient
+from app.infrastructure.clients.order_book_client.coinbase_websocket_client import \
+    CoinbaseWebsocketClient
+from app.infrastructure.clients.order_book_client.kraken_websocket_client import \
+    KrakenWebsocketClient
+from app.infrastructure.clients.order_book_client.schemas.common import \
+    OrderBookEvent
+from app.utilities.fixed_point_utils import (DecimalScale, LevelParser,
+                                             get_level_scale)
+from app.utilities.time_utils import ReplayClock
+
+
+class ReplayCollector(Collector):
+    """
+    Replays the frames recorded for a pair by FrameRecorder through the
+    parsers of the exchange clients.
+
+    Frames are replayed at their original pace divided by speed, or as fast
+    as possible when speed is 0. The replay clock is advanced to the receive
+    time of every frame, so that the workers follow the replayed time, and
+    paces all pairs from its start time, so that they stay aligned.
+    """
+
+    host = "replay"
+
+    def __init__(
+        self,
+        launch_id: UUID,
+        pair_id: UUID,
+        symbol: str,
+        delimiter: Decimal,
+        exchange_name: str,
+        directory: str | Path,
+        scale: LevelParser = DecimalScale(),
+        speed: float = 1.0,
+        clock: ReplayClock | None = None,
+    ):
+        super().__init__(
+            launch_id=launch_id,
+            pair_id=pair_id,
+            symbol=symbol,
+            delimiter=delimiter,
+            scale=scale,
+        )
+        self.exchange_name = exchange_name
+        self._directory = get_recording_directory(
+            directory, exchange_name, symbol
+        )
+        self._speed = speed
+        self._clock = clock
+
+    async def _broadcast_stream(
+        self,
+    ) -> AsyncGenerator[OrderBookEvent | None, None]:
+        events: AsyncGenerator[OrderBookEvent | None, None]
+
+        try:
+            if self.exchange_name == "BINANCE":
+                events = self.__replay_binance_frames()
+            else:
+                events = self.__create_websocket_client().listen_frames(
+                    self.__replay_frame_texts()
+                )
+
+            async for event in events:
+                yield event
+        finally:
+            # A recording is replayed only once
+            self.is_interrupted = True
+
+        logging.info(f"Replay finished [symbol={self.symbol}]")
+
+    def __create_websocket_client(
+        self,
+    ) -> KrakenWebsocketClient | CoinbaseWebsocketClient:
+        match self.exchange_name:
+            case "KRAKEN":
+                # Kraken levels are decoded anyway to verify the checksums
+                return KrakenWebsocketClient(
+                    self.symbol, scale=get_level_scale(self.scale)
+                )
+            case "COINBASE":
+                return CoinbaseWebsocketClient(self.symbol, scale=self.scale)
+            case _:
+                raise Exception(
+                    f"Exchange {self.exchange_name} is not supported"
+                )
+
+    async def __replay_binance_frames(
+        self,
+    ) -> AsyncGenerator[OrderBookEvent, None]:
+        http_client = BinanceHttpClient(self.symbol, scale=self.scale)
+        ws_client = BinanceWebsocketClient(self.symbol, scale=self.scale)
+        last_update_id: int | None = None
+
+        async for frame in self.__replay_frames():
+            if frame.kind == "snapshot":
+                snapshot = http_client.parse_order_book_snapshot(frame.frame)
+                if snapshot is None:
+                    return
+
+                last_update_id = snapshot.last_update_id
+                yield snapshot
+                continue
+
+            update_event = ws_client.parse_depth_update(frame.frame)
+
+            # Updates buffered before the snapshot are applied only when
+            # they aren't part of it already
+            if (
+                last_update_id is None
+                or update_event.final_update_id <= last_update_id
+            ):
+                continue
+
+            last_update_id = update_event.final_update_id
+            yield update_event
+
+    async def __replay_frame_texts(self) -> AsyncIterator[str]:
+        async for frame in self.__replay_frames():
+            yield frame.frame
+
+    async def __replay_frames(self) -> AsyncIterator[RecordedFrame]:
+        first_received_at: int | None = None
+        started_at = time.monotonic()
+
+        for path in sorted(self._directory.glob("*.jsonl.gz")):
+            async for frame in read_frames_in_thread(path):
+                if first_received_at is None:
+                    first_received_at = frame.received_at
+
+                if self._speed > 0:
+                    if self._clock is not None:
+                        deadline = self._clock.get_replay_deadline(
+                            frame.received_at / 1e9, self._speed
+                        )
+                    else:
+                        deadline = started_at + (
+                            (frame.received_at - first_received_at)
+                            / 1e9
+                            / self._speed
+                        )
+                    await asyncio.sleep(max(deadline - time.monotonic(), 0))
+                else:
+                    # Lets the processor and workers run between frames
+                    await asyncio.sleep(0)
+
+                if self._clock is not None:
+                    self._clock.advance_to(frame.received_at / 1e9)
+
+                yield frame
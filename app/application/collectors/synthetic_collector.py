@@ -0,0 +1,213 @@
+import asyncio
+import random
+from typing import AsyncGenerator
+from uuid import UUID
+
+from _decimal import Decimal
+
+from app.application.common.collector import Collector
+from app.infrastructure.clients.order_book_client.schemas.common import (
+    OrderBookEvent, OrderBookSnapshot, OrderBookUpdate)
+from app.utilities.fixed_point_utils import (DecimalScale, LevelParser,
+                                             RawLevelValue)
+from app.utilities.time_utils import get_clock
+
+
+class SyntheticCollector(Collector):
+    """
+    Generates a synthetic order book of a pair: a snapshot of depth levels
+    per side followed by diff updates, used for load testing.
+
+    Levels are kept on a grid of ticks around a mid price which drifts as
+    a random walk. Every update changes levels_per_update levels, mostly
+    near the top of the book, and removes the levels crossed by the mid
+    price or left beyond the depth. Bursts multiply the update rate for
+    burst_duration seconds. Prices and quantities are generated as strings
+    and parsed by the scale, like exchange clients do.
+    """
+
+    exchange_name = "SYNTHETIC"
+    host = "synthetic"
+
+    def __init__(
+        self,
+        launch_id: UUID,
+        pair_id: UUID,
+        symbol: str,
+        delimiter: Decimal,
+        scale: LevelParser = DecimalScale(),
+        depth: int = 1000,
+        update_rate: float = 10.0,
+        levels_per_update: int = 20,
+        price_drift: float = 1.0,
+        tick_size: Decimal = Decimal("0.01"),
+        initial_price: Decimal = Decimal("100"),
+        burst_probability: float = 0.0,
+        burst_multiplier: float = 10.0,
+        burst_duration: float = 1.0,
+        seed: int | None = None,
+        max_updates: int | None = None,
+    ):
+        super().__init__(
+            launch_id=launch_id,
+            pair_id=pair_id,
+            symbol=symbol,
+            delimiter=delimiter,
+            scale=scale,
+        )
+        self._depth = depth
+        # Updates per second, generated as fast as possible at 0
+        self._update_rate = update_rate
+        self._levels_per_update = levels_per_update
+        # Standard deviation of the mid price move per update in ticks
+        self._price_drift = price_drift
+        self._tick_size = tick_size
+        self._initial_tick = int(initial_price / tick_size)
+        self._burst_probability = burst_probability
+        self._burst_multiplier = burst_multiplier
+        self._burst_duration = burst_duration
+        self._max_updates = max_updates
+        self._random = random.Random(seed)
+        # Quantities of the levels by their tick
+        self._asks: dict[int, str] = {}
+        self._bids: dict[int, str] = {}
+        self._mid_tick = self._initial_tick
+        # Number of updates generated, reported by load tests
+        self.updates_count = 0
+
+    async def _broadcast_stream(
+        self,
+    ) -> AsyncGenerator[OrderBookEvent | None, None]:
+        clock = get_clock()
+        yield self.__generate_snapshot()
+
+        updates_count = 0
+        burst_ends_at = 0.0
+
+        while self._max_updates is None or updates_count < self._max_updates:
+            interval = 0.0
+            if self._update_rate > 0:
+                now = clock.time()
+                if (
+                    now >= burst_ends_at
+                    and self._random.random() < self._burst_probability
+                ):
+                    burst_ends_at = now + self._burst_duration
+
+                interval = 1 / self._update_rate
+                if now < burst_ends_at:
+                    interval /= self._burst_multiplier
+
+            if interval:
+                await clock.sleep(interval)
+            else:
+                # Lets the processor and the workers run between updates
+                await asyncio.sleep(0)
+
+            yield self.__generate_update()
+            updates_count += 1
+            self.updates_count += 1
+
+        self.is_interrupted = True
+
+    def __generate_snapshot(self) -> OrderBookSnapshot:
+        self._mid_tick = self._initial_tick
+        self._asks = {
+            self._mid_tick + distance: self.__generate_quantity()
+            for distance in range(1, self._depth + 1)
+        }
+        self._bids = {
+            self._mid_tick - distance: self.__generate_quantity()
+            for distance in range(1, self._depth + 1)
+        }
+
+        return OrderBookSnapshot(
+            a=self.__parse_levels(self._asks),
+            b=self.__parse_levels(self._bids),
+        )
+
+    def __generate_update(self) -> OrderBookUpdate:
+        asks: dict[int, str] = {}
+        bids: dict[int, str] = {}
+
+        self.__drift(asks, bids)
+
+        # Distances to the mid price are exponential, so that most changes
+        # happen near the top of the book
+        mean_distance = max(self._depth / 10, 1)
+        for _ in range(self._levels_per_update):
+            distance = min(
+                1 + int(self._random.expovariate(1 / mean_distance)),
+                self._depth,
+            )
+            if self._random.random() < 0.5:
+                tick, levels, changes = (
+                    self._mid_tick + distance,
+                    self._asks,
+                    asks,
+                )
+            else:
+                tick, levels, changes = (
+                    self._mid_tick - distance,
+                    self._bids,
+                    bids,
+                )
+
+            # Existing levels are removed at times, the others are set
+            if tick in levels and self._random.random() < 0.3:
+                del levels[tick]
+                changes[tick] = "0"
+            else:
+                levels[tick] = changes[tick] = self.__generate_quantity()
+
+        return OrderBookUpdate(
+            a=self.__parse_levels(asks), b=self.__parse_levels(bids)
+        )
+
+    def __drift(self, asks: dict[int, str], bids: dict[int, str]) -> None:
+        move = round(self._random.gauss(0, self._price_drift))
+        if move == 0:
+            return
+
+        previous_mid_tick = self._mid_tick
+        self._mid_tick += move
+
+        # Only the ticks between the previous and the new mid price can be
+        # crossed or pushed beyond the depth
+        if move > 0:
+            crossed = range(previous_mid_tick + 1, self._mid_tick + 1)
+            beyond_depth = range(
+                previous_mid_tick - self._depth, self._mid_tick - self._depth
+            )
+            crossed_levels, crossed_changes = self._asks, asks
+            beyond_levels, beyond_changes = self._bids, bids
+        else:
+            crossed = range(self._mid_tick, previous_mid_tick)
+            beyond_depth = range(
+                self._mid_tick + self._depth + 1,
+                previous_mid_tick + self._depth + 1,
+            )
+            crossed_levels, crossed_changes = self._bids, bids
+            beyond_levels, beyond_changes = self._asks, asks
+
+        for levels, changes, ticks in (
+            (crossed_levels, crossed_changes, crossed),
+            (beyond_levels, beyond_changes, beyond_depth),
+        ):
+            for tick in ticks:
+                if levels.pop(tick, None) is not None:
+                    changes[tick] = "0"
+
+    def __generate_quantity(self) -> str:
+        return f"{self._random.lognormvariate(0, 1.5):.4f}"
+
+    def __parse_levels(
+        self, levels: dict[int, str]
+    ) -> dict[RawLevelValue, RawLevelValue]:
+        parse_price = self.scale.parse_price
+        parse_quantity = self.scale.parse_quantity
+
+        return {
+            parse_price(str(tick * self._tick_size)): parse_quantity(quantity)
+            for tick, quantity in levels.items()
+        }
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
 from typing import AsyncGenerator
 from uuid import UUID
@@ -7,16 +9,32 @@ from _decimal import Decimal
 
 from app.infrastructure.clients.order_book_client.schemas.common import \
     OrderBookEvent
+from app.utilities.fixed_point_utils import DecimalScale, LevelParser
+from app.utilities.metrics_utils import (COLLECTOR_CONNECT_LATENCY,
+                                         COLLECTOR_RECONNECTS)
+from app.utilities.reconnect_utils import ReconnectPolicy, get_circuit_breaker
 
 
 class Collector(ABC):
+    # Label of the collector metrics
+    exchange_name = "UNKNOWN"
+    # Host whose circuit breaker is shared by the collectors of the exchange
+    host = "unknown"
+    reconnect_policy = ReconnectPolicy()
+
     def __init__(
-        self, launch_id: UUID, pair_id: UUID, symbol: str, delimiter: Decimal
+        self,
+        launch_id: UUID,
+        pair_id: UUID,
+        symbol: str,
+        delimiter: Decimal,
+        scale: LevelParser = DecimalScale(),
     ):
         self.launch_id = launch_id
         self.pair_id = pair_id
         self.symbol = symbol
         self.delimiter = delimiter
+        self.scale = scale
         self.is_interrupted = False
 
     async def listen_stream(
@@ -24,10 +42,27 @@ class Collector(ABC):
     ) -> AsyncGenerator[OrderBookEvent | None, None]:
         logging.info(f"Collecting data for {self.symbol}")
 
-        # Open the stream and start the generator for the stream events
+        circuit_breaker = get_circuit_breaker(self.host)
+        failed_attempts_count = 0
+
+        # Open the stream and start the generator for the stream events.
+        # The processor keeps its last book until the stream is reopened
+        # and a new snapshot arrives.
         while self.is_interrupted is not True:
+            await circuit_breaker.wait()
+
+            started_at = time.monotonic()
+            is_connected = False
+
             try:
                 async for event in self._broadcast_stream():
+                    if not is_connected:
+                        is_connected = True
+                        circuit_breaker.record_success()
+                        COLLECTOR_CONNECT_LATENCY.labels(
+                            exchange=self.exchange_name
+                        ).observe(time.monotonic() - started_at)
+
                     yield event
             except Exception as err:
                 logging.exception(
@@ -35,6 +70,37 @@ class Collector(ABC):
                     msg=f"Collector with pair {self.pair_id} will be relaunched",
                 )
 
+            if self.is_interrupted:
+                break
+
+            # A stream which was alive for a while is reopened right away,
+            # failed or short-lived ones are backed off
+            if (
+                is_connected
+                and time.monotonic() - started_at
+                >= self.reconnect_policy.stable_stream_time
+            ):
+                failed_attempts_count = 0
+                delay = 0.0
+            else:
+                if not is_connected:
+                    circuit_breaker.record_failure()
+                failed_attempts_count += 1
+
+                if self.reconnect_policy.is_exhausted(failed_attempts_count):
+                    logging.error(
+                        f"Collector with pair {self.pair_id} stopped after "
+                        f"{failed_attempts_count} failed connection attempts"
+                    )
+                    return
+
+                delay = self.reconnect_policy.get_delay(failed_attempts_count)
+
+            COLLECTOR_RECONNECTS.labels(
+                exchange=self.exchange_name, symbol=self.symbol
+            ).inc()
+            await asyncio.sleep(delay)
+
     @abstractmethod
     async def _broadcast_stream(
         self,
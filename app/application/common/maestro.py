@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import logging
 from datetime import datetime, timedelta
 from uuid import UUID
@@ -8,6 +9,7 @@ from _decimal import Decimal
 from app.application.collectors.binance_collector import BinanceCollector
 from app.application.collectors.coinbase_collector import CoinbaseCollector
 from app.application.collectors.kraken_collector import KrakenCollector
+from app.application.collectors.replay_collector import ReplayCollector
 from app.application.common.collector import Collector
 from app.application.common.processor import Processor
 from app.application.messengers.discord.order_book_discord_messenger import \
@@ -29,8 +31,17 @@ from app.application.workers.orders_anomalies_summary_worker import \
 from app.application.workers.orders_worker import OrdersWorker
 from app.application.workers.volume_worker import VolumeWorker
 from app.config import settings
+from app.infrastructure.clients.frame_recorder import (FrameRecorder,
+                                                       find_first_received_at)
+from app.infrastructure.clients.order_book_client.binance_stream_manager import \
+    BinanceStreamManager
+from app.infrastructure.clients.order_book_client.coinbase_shared_connection import \
+    CoinbaseSharedConnection
+from app.infrastructure.clients.order_book_client.kraken_shared_connection import \
+    KrakenSharedConnection
 from app.infrastructure.db.database import get_async_db
 from app.infrastructure.db.models.exchange import LiteralExchangeName
+from app.infrastructure.db.models.pair import LiteralOrderBookBackend
 from app.infrastructure.db.repositories.exchange_repository import \
     find_exchange_by_id
 from app.infrastructure.db.repositories.maestro_repository import (
@@ -40,7 +51,14 @@ from app.infrastructure.db.repositories.maestro_repository import (
     update_maestro_pair_associations)
 from app.infrastructure.db.repositories.pair_repository import find_pair_by_id
 from app.utilities.event_utils import EventHandler
-from app.utilities.scheduling_utils import SetInterval
+from app.utilities.fixed_point_utils import (FixedPointScale, LevelDecoder,
+                                             LevelParser, LevelScale, RawScale,
+                                             create_level_scale,
+                                             get_level_scale)
+from app.utilities.order_book_utils import OrderBookSide
+from app.utilities.scheduling_utils import (ScheduledJob, SetInterval,
+                                            get_scheduler)
+from app.utilities.time_utils import ReplayClock, set_clock
 
 
 class Maestro:
@@ -58,6 +76,24 @@ class Maestro:
             maestro_max_liveness_gap_minutes
         )
         self._processor_tasks: list[asyncio.Task] = []
+        # Scheduled jobs of the workers of every pair
+        self._worker_jobs: dict[UUID, list[ScheduledJob]] = {}
+        # Connections shared by the collectors of the same exchange
+        self._binance_stream_manager = BinanceStreamManager()
+        self._coinbase_connection = CoinbaseSharedConnection()
+        self._kraken_connection = KrakenSharedConnection()
+        # Recorded frames are replayed instead of collecting when set
+        self._replay_clock: ReplayClock | None = None
+        if settings.REPLAY_DIRECTORY is not None:
+            # Workers are scheduled on the replayed time, which starts at
+            # the first recorded frame
+            first_received_at = find_first_received_at(
+                settings.REPLAY_DIRECTORY
+            )
+            self._replay_clock = ReplayClock(
+                start_time=(first_received_at or 0) / 1e9
+            )
+            set_clock(self._replay_clock)
 
     async def run(self) -> None:
         await self._init_maestro()
@@ -136,6 +172,13 @@ class Maestro:
                 pair = await find_pair_by_id(session, pair_id)
                 exchange = await find_exchange_by_id(session, pair.exchange_id)
 
+            scale = create_level_scale(
+                price_precision=pair.price_precision,
+                quantity_precision=pair.quantity_precision,
+            )
+
+            level_decoder = self._get_level_decoder(exchange.name, scale)
+
             # Create collector for necessary exchange
             collector = self._create_collector(
                 exchange_name=exchange.name,
@@ -143,6 +186,7 @@ class Maestro:
                 pair_id=UUID(str(pair.id)),
                 symbol=pair.symbol,
                 delimiter=pair.delimiter,
+                scale=RawScale(scale) if level_decoder else scale,
             )
 
             # Create associated processor for collector
@@ -153,6 +197,19 @@ class Maestro:
                 symbol=pair.symbol,
                 delimiter=pair.delimiter,
                 pair_id=UUID(str(pair.id)),
+                scale=scale,
+                max_depth_levels=(
+                    pair.max_depth_levels
+                    if pair.max_depth_levels is not None
+                    else settings.ORDER_BOOK_MAX_DEPTH_LEVELS
+                ),
+                max_depth_percentage=self._get_max_depth_percentage(
+                    pair.max_depth_percentage
+                ),
+                side_type=self._get_order_book_side_type(
+                    pair.order_book_backend, scale
+                ),
+                level_decoder=level_decoder,
             )
 
             task = asyncio.create_task(processor.run())
@@ -161,6 +218,10 @@ class Maestro:
             self._create_default_workers(
                 processor=processor, event_handler=event_handler
             )
+            # Workers of a pair stop with its processor
+            task.add_done_callback(
+                functools.partial(self._remove_workers, processor.pair_id)
+            )
 
             self._processor_tasks.append(task)
 
@@ -195,8 +256,76 @@ class Maestro:
             ),
         ]
 
-        for worker in default_workers:
-            asyncio.create_task(worker.run())
+        self._worker_jobs[processor.pair_id] = [
+            worker.schedule() for worker in default_workers
+        ]
+
+    def _remove_workers(
+        self, pair_id: UUID, _: asyncio.Task | None = None
+    ) -> None:
+        for job in self._worker_jobs.pop(pair_id, []):
+            get_scheduler().remove_job(job)
+
+    def _get_max_depth_percentage(
+        self, pair_max_depth_percentage: Decimal | None
+    ) -> Decimal | None:
+        if pair_max_depth_percentage is not None:
+            return pair_max_depth_percentage
+        if settings.ORDER_BOOK_MAX_DEPTH_PERCENTAGE is not None:
+            return Decimal(str(settings.ORDER_BOOK_MAX_DEPTH_PERCENTAGE))
+        return None
+
+    def _get_level_decoder(
+        self, exchange_name: LiteralExchangeName, scale: LevelScale
+    ) -> LevelDecoder | None:
+        # Kraken levels are decoded by the client anyway to verify the book
+        # checksums
+        if (
+            not settings.PROCESSOR_LAZY_LEVEL_DECODING
+            or exchange_name == "KRAKEN"
+        ):
+            return None
+
+        return LevelDecoder(scale)
+
+    def _get_order_book_side_type(
+        self, backend: LiteralOrderBookBackend | None, scale: LevelScale
+    ) -> type[OrderBookSide]:
+        if backend != "NUMPY":
+            return OrderBookSide
+
+        if not isinstance(scale, FixedPointScale):
+            logging.warning(
+                "NumPy order book backend requires fixed-point precisions, "
+                "falling back to dict backend"
+            )
+            return OrderBookSide
+
+        try:
+            from app.utilities.columnar_order_book_utils import \
+                ColumnarOrderBookSide
+        except ImportError:
+            logging.warning(
+                "NumPy is not installed, falling back to dict order book "
+                "backend"
+            )
+            return OrderBookSide
+
+        return ColumnarOrderBookSide
+
+    def _create_frame_recorder(
+        self, exchange_name: LiteralExchangeName, symbol: str
+    ) -> FrameRecorder | None:
+        if settings.FRAME_RECORDER_DIRECTORY is None:
+            return None
+
+        return FrameRecorder(
+            directory=settings.FRAME_RECORDER_DIRECTORY,
+            exchange_name=str(exchange_name),
+            symbol=symbol,
+            rotation_interval=settings.FRAME_RECORDER_ROTATION_INTERVAL,
+            buffer_size=settings.FRAME_RECORDER_BUFFER_SIZE,
+        )
 
     def _create_collector(
         self,
@@ -205,7 +334,23 @@ class Maestro:
         pair_id: UUID,
         symbol: str,
         delimiter: Decimal,
+        scale: LevelParser,
     ) -> Collector:
+        if settings.REPLAY_DIRECTORY is not None:
+            return ReplayCollector(
+                launch_id=launch_id,
+                pair_id=pair_id,
+                symbol=symbol,
+                delimiter=delimiter,
+                exchange_name=str(exchange_name),
+                directory=settings.REPLAY_DIRECTORY,
+                scale=scale,
+                speed=settings.REPLAY_SPEED,
+                clock=self._replay_clock,
+            )
+
+        recorder = self._create_frame_recorder(exchange_name, symbol)
+
         match exchange_name:
             case "BINANCE":
                 return BinanceCollector(
@@ -213,6 +358,9 @@ class Maestro:
                     pair_id=pair_id,
                     symbol=symbol,
                     delimiter=delimiter,
+                    scale=scale,
+                    stream_manager=self._binance_stream_manager,
+                    recorder=recorder,
                 )
             case "KRAKEN":
                 return KrakenCollector(
@@ -220,6 +368,9 @@ class Maestro:
                     pair_id=pair_id,
                     symbol=symbol,
                     delimiter=delimiter,
+                    scale=get_level_scale(scale),
+                    connection=self._kraken_connection,
+                    recorder=recorder,
                 )
             case "COINBASE":
                 return CoinbaseCollector(
@@ -227,6 +378,9 @@ class Maestro:
                     pair_id=pair_id,
                     symbol=symbol,
                     delimiter=delimiter,
+                    scale=scale,
+                    connection=self._coinbase_connection,
+                    recorder=recorder,
                 )
             case _:
                 raise Exception(f"Exchange {exchange_name} is not supported")
@@ -1,12 +1,22 @@
+import asyncio
 import logging
+from typing import Mapping, cast
 from uuid import UUID
 
 from _decimal import Decimal
 
 from app.application.common.collector import Collector
+from app.config import settings
 from app.infrastructure.clients.order_book_client.schemas.common import (
-    EventTypeEnum, OrderBook, OrderBookEvent)
+    EventTypeEnum, OrderBook, OrderBookEvent, OrderBookUpdate)
 from app.utilities.event_utils import EventHandler
+from app.utilities.fixed_point_utils import (DecimalScale, LevelDecoder,
+                                             LevelScale, LevelValue,
+                                             RawLevelValue)
+from app.utilities.metrics_utils import ORDER_BOOK_PRUNED_LEVELS
+from app.utilities.order_book_utils import (OrderBookSide,
+                                            group_order_book_side,
+                                            update_grouped_order_book_side)
 
 
 class Processor:
@@ -18,16 +28,63 @@ class Processor:
         event_handler: EventHandler,
         symbol: str,
         delimiter: Decimal,
+        scale: LevelScale = DecimalScale(),
+        max_depth_levels: int | None = None,
+        max_depth_percentage: Decimal | None = None,
+        side_type: type[OrderBookSide] = OrderBookSide,
+        batch_updates: bool = settings.PROCESSOR_BATCH_UPDATES,
+        events_queue_size: int = settings.PROCESSOR_EVENTS_QUEUE_SIZE,
+        level_decoder: LevelDecoder | None = None,
     ):
         self._collector = collector
         self._symbol = symbol
         self._delimiter = delimiter
+        self._scale = scale
+        self._scaled_delimiter = scale.parse_price(delimiter)
+        # Delimiters finer than the price precision would be rounded, down
+        # to zero for the finest ones, and break the grouping
+        if (
+            self._scaled_delimiter <= 0
+            or scale.to_decimal_price(self._scaled_delimiter) != delimiter
+        ):
+            raise ValueError(
+                f"Delimiter {delimiter} of {symbol} is not a positive "
+                f"multiple of its price precision"
+            )
         self._pair_id = pair_id
         self._launch_id = launch_id
-        self._order_book = OrderBook(a={}, b={})
+        # Levels beyond these limits are pruned from the in-memory book
+        self._max_depth_levels = max_depth_levels
+        self._max_depth_percentage = max_depth_percentage
+        self._pruned_levels_count = 0
+        # Storage backend of the order book sides
+        self._side_type = side_type
+        self._batch_updates = batch_updates
+        self._events_queue_size = events_queue_size
+        # Set when the collector leaves levels undecoded (RawScale)
+        self._level_decoder = level_decoder
+        self._order_book = OrderBook(
+            a=side_type(), b=side_type(is_descending=True)
+        )
+        # Book grouped by delimiter, built on first demand and then
+        # maintained incrementally with every update
+        self._grouped_order_book: OrderBook | None = None
+        # Running sums of price * quantity of every level per side
+        self._asks_liquidity: LevelValue = 0
+        self._bids_liquidity: LevelValue = 0
+        # Incremented on every change of the order book
+        self._order_book_version = 0
+        self._order_book_snapshot: OrderBook | None = None
+        self._order_book_snapshot_version = -1
+        self._grouped_order_book_snapshot: OrderBook | None = None
+        self._grouped_order_book_snapshot_version = -1
         self.event_handler = event_handler
 
     async def run(self) -> None:
+        if self._batch_updates:
+            await self.__run_batched()
+            return
+
         # Open the stream and start the generator for the stream events
         event_generator = self._collector.listen_stream()
 
@@ -47,12 +104,115 @@ class Processor:
                 case _:
                     logging.warning(f"Unrecognised error event {event}")
 
+    async def __run_batched(self) -> None:
+        # Stream events are read by a separate task, so that every event
+        # received while the book was being updated can be drained at once
+        queue: asyncio.Queue[OrderBookEvent | None] = asyncio.Queue(
+            maxsize=self._events_queue_size
+        )
+        reader_task = asyncio.create_task(self.__read_events(queue))
+
+        try:
+            is_stream_finished = False
+            while not is_stream_finished:
+                events = [await queue.get()]
+                while not queue.empty():
+                    events.append(queue.get_nowait())
+
+                # None marks the end of the stream
+                if events[-1] is None:
+                    is_stream_finished = True
+                    events.pop()
+
+                self.__process_events_batch(
+                    [event for event in events if event is not None]
+                )
+
+            # The end marker is also sent when the stream failed, which is
+            # raised here like in the unbatched mode
+            await reader_task
+        finally:
+            reader_task.cancel()
+
+    async def __read_events(
+        self, queue: asyncio.Queue[OrderBookEvent | None]
+    ) -> None:
+        is_cancelled = False
+
+        try:
+            async for event in self._collector.listen_stream():
+                if event is not None:
+                    await queue.put(event)
+        except asyncio.CancelledError:
+            is_cancelled = True
+            raise
+        finally:
+            # Readers are cancelled once nothing consumes the queue, so
+            # waiting for room in a full queue would never end
+            if not is_cancelled:
+                await queue.put(None)
+
+    def __process_events_batch(self, events: list[OrderBookEvent]) -> None:
+        """
+        Merges consecutive updates into one last-write-wins update per price
+        level, so that the book is updated and UPDATE is emitted only once
+        for them. Snapshots split the batch, as they replace the whole book.
+        """
+        asks: dict[RawLevelValue, RawLevelValue] = {}
+        bids: dict[RawLevelValue, RawLevelValue] = {}
+        merged_events_count = 0
+
+        for event in events:
+            match event.event_type:
+                case EventTypeEnum.INIT:
+                    if merged_events_count:
+                        self.__apply_merged_update(
+                            asks, bids, merged_events_count
+                        )
+                        asks, bids, merged_events_count = {}, {}, 0
+
+                    self._init_order_book(snapshot=event)
+
+                    self.event_handler.emit(EventTypeEnum.INIT.value)
+                case EventTypeEnum.UPDATE:
+                    asks.update(event.a)
+                    bids.update(event.b)
+                    merged_events_count += 1
+                case _:
+                    logging.warning(f"Unrecognised error event {event}")
+
+        if merged_events_count:
+            self.__apply_merged_update(asks, bids, merged_events_count)
+
+    def __apply_merged_update(
+        self,
+        asks: dict[RawLevelValue, RawLevelValue],
+        bids: dict[RawLevelValue, RawLevelValue],
+        merged_events_count: int,
+    ) -> None:
+        logging.debug(
+            f"Applying {merged_events_count} merged updates "
+            f"[symbol={self.symbol}]"
+        )
+
+        self._update_order_book(update_event=OrderBookUpdate(a=asks, b=bids))
+
+        self.event_handler.emit(EventTypeEnum.UPDATE.value)
+
     def _init_order_book(self, snapshot: OrderBookEvent) -> None:
         logging.debug(
             f"Processing init event {snapshot} [symbol={self.symbol}]"
         )
 
-        self.order_book.a, self.order_book.b = snapshot.a, snapshot.b
+        self.order_book.a = self._side_type(self.__decode_levels(snapshot.a))
+        self.order_book.b = self._side_type(
+            self.__decode_levels(snapshot.b), is_descending=True
+        )
+        self._grouped_order_book = None
+        self._asks_liquidity = self.order_book.a.liquidity()
+        self._bids_liquidity = self.order_book.b.liquidity()
+        self.__prune_order_book()
+        self._order_book_version += 1
 
         logging.info(f"Initial snapshot saved [symbol={self.symbol}]")
 
@@ -61,34 +221,192 @@ class Processor:
             f"Processing update event {update_event} [symbol={self.symbol}]"
         )
 
+        grouped_order_book = self._grouped_order_book
+
         # Update the local order book with the event data
-        for bid in update_event.b.items():
-            self.__update_order_book(self.order_book.b, bid)
-        for ask in update_event.a.items():
-            self.__update_order_book(self.order_book.a, ask)
+        self._bids_liquidity += self.__update_order_book(
+            self.order_book.b,
+            grouped_order_book.b if grouped_order_book else None,
+            self.__decode_levels(update_event.b),
+        )
+        self._asks_liquidity += self.__update_order_book(
+            self.order_book.a,
+            grouped_order_book.a if grouped_order_book else None,
+            self.__decode_levels(update_event.a),
+        )
+
+        self.__prune_order_book()
+        self._order_book_version += 1
+
+    def __decode_levels(
+        self, levels: Mapping[RawLevelValue, RawLevelValue]
+    ) -> Mapping[LevelValue, LevelValue]:
+        # Merged batches are decoded once, so levels overwritten inside a
+        # batch are never decoded at all
+        if self._level_decoder is None:
+            # Collectors only keep raw strings when a decoder is set
+            return cast(Mapping[LevelValue, LevelValue], levels)
+
+        return self._level_decoder.decode(levels)
 
     def __update_order_book(
         self,
-        order_book: dict[Decimal, Decimal],
-        update: tuple[Decimal, Decimal],
-    ) -> None:
-        logging.debug(f"Updating order book with {update}")
-
-        price = update[0]
-        quantity = update[1]
+        order_book: OrderBookSide,
+        grouped_order_book: OrderBookSide | None,
+        levels: Mapping[LevelValue, LevelValue],
+    ) -> LevelValue:
+        """
+        Applies the level updates in one batch and returns the change of the
+        side liquidity they caused.
+        """
+        liquidity_change: LevelValue = 0
 
         # The data in each event is the absolute quantity for a price level
-        if price * quantity == 0.0:
-            # If the quantity is 0, remove the price level
-            order_book.pop(price, None)  # No error if the price is not found
-        else:
-            # Otherwise, update the quantity at this price level
-            order_book[price] = quantity
+        quantity_deltas = order_book.update_levels(levels)
+        for price, quantity_delta in quantity_deltas:
+            liquidity_change += price * quantity_delta
+
+        # Only the buckets of the changed levels are adjusted, in one batch
+        if grouped_order_book is not None:
+            update_grouped_order_book_side(
+                grouped_order_book, quantity_deltas, self._scaled_delimiter
+            )
+
+        return liquidity_change
+
+    def __prune_order_book(self) -> None:
+        asks, bids = self.order_book.a, self.order_book.b
+        pruned_asks = []
+        pruned_bids = []
+
+        if self._max_depth_levels is not None:
+            pruned_asks.extend(asks.truncate(self._max_depth_levels))
+            pruned_bids.extend(bids.truncate(self._max_depth_levels))
+
+        best_ask_price, best_bid_price = asks.best_price, bids.best_price
+        if (
+            self._max_depth_percentage is not None
+            and best_ask_price is not None
+            and best_bid_price is not None
+        ):
+            middle_price = Decimal(best_ask_price + best_bid_price) / 2
+            distance = middle_price * self._max_depth_percentage / 100
+
+            pruned_asks.extend(
+                asks.truncate_beyond_price(middle_price + distance)
+            )
+            pruned_bids.extend(
+                bids.truncate_beyond_price(middle_price - distance)
+            )
+
+        if not pruned_asks and not pruned_bids:
+            return
+
+        grouped_order_book = self._grouped_order_book
+
+        for price, quantity in pruned_asks:
+            self._asks_liquidity -= price * quantity
+        for price, quantity in pruned_bids:
+            self._bids_liquidity -= price * quantity
+
+        if grouped_order_book is not None:
+            update_grouped_order_book_side(
+                grouped_order_book.a,
+                [(price, -quantity) for price, quantity in pruned_asks],
+                self._scaled_delimiter,
+            )
+            update_grouped_order_book_side(
+                grouped_order_book.b,
+                [(price, -quantity) for price, quantity in pruned_bids],
+                self._scaled_delimiter,
+            )
+
+        self._pruned_levels_count += len(pruned_asks) + len(pruned_bids)
+        ORDER_BOOK_PRUNED_LEVELS.labels(symbol=self.symbol, side="ask").inc(
+            len(pruned_asks)
+        )
+        ORDER_BOOK_PRUNED_LEVELS.labels(symbol=self.symbol, side="bid").inc(
+            len(pruned_bids)
+        )
 
     @property
     def order_book(self) -> OrderBook:
         return self._order_book
 
+    def get_order_book_snapshot(self) -> OrderBook:
+        """
+        Returns a consistent read-only view of the order book. The view
+        shares storage with the live book until the next update, so the
+        same snapshot is reused while the book doesn't change.
+        """
+        snapshot = self._order_book_snapshot
+
+        if (
+            snapshot is None
+            or self._order_book_snapshot_version != self._order_book_version
+        ):
+            snapshot = OrderBook(
+                a=self._order_book.a.snapshot(),
+                b=self._order_book.b.snapshot(),
+            )
+            self._order_book_snapshot = snapshot
+            self._order_book_snapshot_version = self._order_book_version
+
+        return snapshot
+
+    def get_grouped_order_book_snapshot(self) -> OrderBook:
+        """
+        Returns a read-only view of the order book grouped by delimiter.
+        """
+        snapshot = self._grouped_order_book_snapshot
+
+        if (
+            snapshot is None
+            or self._grouped_order_book is None
+            or self._grouped_order_book_snapshot_version
+            != self._order_book_version
+        ):
+            grouped_order_book = self.__get_grouped_order_book()
+            snapshot = OrderBook(
+                a=grouped_order_book.a.snapshot(),
+                b=grouped_order_book.b.snapshot(),
+            )
+            self._grouped_order_book_snapshot = snapshot
+            self._grouped_order_book_snapshot_version = (
+                self._order_book_version
+            )
+
+        return snapshot
+
+    def __get_grouped_order_book(self) -> OrderBook:
+        if self._grouped_order_book is None:
+            self._grouped_order_book = OrderBook(
+                a=group_order_book_side(
+                    self._order_book.a, self._scaled_delimiter
+                ),
+                b=group_order_book_side(
+                    self._order_book.b, self._scaled_delimiter
+                ),
+            )
+
+        return self._grouped_order_book
+
+    @property
+    def asks_liquidity(self) -> LevelValue:
+        return self._asks_liquidity
+
+    @property
+    def bids_liquidity(self) -> LevelValue:
+        return self._bids_liquidity
+
+    @property
+    def pruned_levels_count(self) -> int:
+        return self._pruned_levels_count
+
+    @property
+    def order_book_version(self) -> int:
+        return self._order_book_version
+
     @property
     def collector(self) -> Collector:
         return self._collector
@@ -97,6 +415,19 @@ class Processor:
     def delimiter(self) -> Decimal:
         return self._delimiter
 
+    @property
+    def side_type(self) -> type[OrderBookSide]:
+        return self._side_type
+
+    @property
+    def scale(self) -> LevelScale:
+        return self._scale
+
+    @property
+    def scaled_delimiter(self) -> LevelValue:
+        # Delimiter expressed in the same units as the order book prices
+        return self._scaled_delimiter
+
     @property
     def pair_id(self) -> UUID:
         return self._pair_id
@@ -1,12 +1,10 @@
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict
-
-from _decimal import Decimal
 
 from app.application.common.processor import Processor
 from app.config import settings
+from app.utilities.scheduling_utils import ScheduledJob, get_set_interval
 from app.utilities.time_utils import (LONDON_TRADING_SESSION,
                                       NEW_YORK_TRADING_SESSION,
                                       TOKYO_TRADING_SESSION,
@@ -44,26 +42,15 @@ class Worker(ABC):
         except Exception as err:
             logging.exception(exc_info=err, msg="Error occurred")
 
+    def schedule(self) -> ScheduledJob:
+        """
+        Adds the runs of the worker to the process scheduler, on the
+        interval its run method is decorated with.
+        """
+        return get_set_interval(type(self).run).schedule(self)
+
     @abstractmethod
     async def _run_worker(
         self, callback_event: asyncio.Event | None = None
     ) -> None:
         pass
-
-    @staticmethod
-    def group_order_book(
-        order_book: Dict[Decimal, Decimal], delimiter: Decimal
-    ) -> Dict[Decimal, Decimal]:
-        grouped_order_book = {}
-        for price, quantity in order_book.items():
-            # Calculate bucketed price
-            bucketed_price = price - (price % delimiter)
-
-            # Initialize the bucket if it doesn't exist
-            if bucketed_price not in grouped_order_book:
-                grouped_order_book[bucketed_price] = Decimal(0.0)
-
-            # Accumulate quantity in the bucket
-            grouped_order_book[bucketed_price] += quantity
-
-        return grouped_order_book
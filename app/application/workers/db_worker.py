@@ -1,5 +1,4 @@
 import asyncio
-import copy
 import json
 import logging
 from dataclasses import asdict, dataclass
@@ -44,17 +43,7 @@ class DbWorker(Worker):
         await self.__db_worker()
 
     async def __db_worker(self) -> None:
-        collector_current_order_book = copy.deepcopy(
-            self._processor.order_book
-        )
-        order_book = OrderBook(
-            a=self.group_order_book(
-                collector_current_order_book.a, self._processor.delimiter
-            ),
-            b=self.group_order_book(
-                collector_current_order_book.b, self._processor.delimiter
-            ),
-        )
+        order_book = self._processor.get_grouped_order_book_snapshot()
 
         order_book_json = self.__convert_to_json(order_book)
 
@@ -79,12 +68,17 @@ class DbWorker(Worker):
             logging.error(f"Error: {e} [symbol={self._processor.symbol}]")
 
     def __convert_to_json(self, order_book: OrderBook) -> str:
+        scale = self._processor.scale
         asks = {
-            handle_decimal_type(ask[0]): handle_decimal_type(ask[1])
+            handle_decimal_type(
+                scale.to_decimal_price(ask[0])
+            ): handle_decimal_type(scale.to_decimal_quantity(ask[1]))
             for ask in order_book.a.items()
         }
         bids = {
-            handle_decimal_type(bid[0]): handle_decimal_type(bid[1])
+            handle_decimal_type(
+                scale.to_decimal_price(bid[0])
+            ): handle_decimal_type(scale.to_decimal_quantity(bid[1]))
             for bid in order_book.b.items()
         }
 
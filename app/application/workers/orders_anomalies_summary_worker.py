@@ -21,6 +21,7 @@ from app.infrastructure.db.repositories.orders_anomalies_summary_repository impo
 from app.utilities.math_utils import (calculate_decimal_ratio,
                                       numbers_have_same_sign)
 from app.utilities.scheduling_utils import SetInterval
+from app.utilities.time_utils import get_current_time
 
 
 class OrdersAnomaliesSummary(NamedTuple):
@@ -84,7 +85,7 @@ class OrdersAnomaliesSummaryWorker(Worker):
                 None,
             )
 
-            now_date = datetime.now()
+            now_date = datetime.fromtimestamp(get_current_time())
             bids_sum, asks_sum = await asyncio.gather(
                 get_order_book_anomalies_sum_in_date_range(
                     session=session,
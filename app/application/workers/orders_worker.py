@@ -19,7 +19,9 @@ from app.infrastructure.db.models.order_book_anomaly import \
     OrderBookAnomalyModel
 from app.infrastructure.db.repositories.order_book_anomaly_repository import (
     cancel_anomalies_list, confirm_anomalies_list, create_order_book_anomalies)
+from app.utilities.fixed_point_utils import LevelValue
 from app.utilities.math_utils import calculate_average_excluding_value_from_sum
+from app.utilities.order_book_utils import OrderBookSide
 from app.utilities.scheduling_utils import SetInterval
 from app.utilities.time_utils import get_current_time
 
@@ -55,9 +57,9 @@ class OrderAnomalyInTime(NamedTuple):
 
 class PositionedOrder(NamedTuple):
     position: int
-    price: Decimal
-    quantity: Decimal
-    liquidity: Decimal
+    price: LevelValue
+    quantity: LevelValue
+    liquidity: LevelValue
 
 
 class ObservingAnomaliesDestiny(NamedTuple):
@@ -120,10 +122,7 @@ class OrdersWorker(Worker):
             f"Orders processing cycle started [symbol={self._processor.symbol}]"
         )
 
-        order_book = self.__group_orders(
-            order_book=copy.deepcopy(self._processor.order_book),
-            delimiter=self._processor.delimiter,
-        )
+        order_book = self._processor.get_grouped_order_book_snapshot()
 
         await self.__handle_anomalies(order_book)
         await self.__handle_observing_anomalies_destiny(order_book)
@@ -132,14 +131,6 @@ class OrdersWorker(Worker):
             f"Orders processing cycle finished [symbol={self._processor.symbol}]"
         )
 
-    def __group_orders(
-        self, order_book: OrderBook, delimiter: Decimal
-    ) -> OrderBook:
-        return OrderBook(
-            a=self.group_order_book(order_book.a, delimiter),
-            b=self.group_order_book(order_book.b, delimiter),
-        )
-
     async def __handle_anomalies(self, order_book: OrderBook) -> None:
         with self._executor_factory() as executor:
             filtered_anomalies = (
@@ -214,22 +205,27 @@ class OrdersWorker(Worker):
             self._observing_saved_limit_anomalies
         )
 
-        if not order_book.a or not order_book.b:
+        scale = self._processor.scale
+        best_ask_price = order_book.a.best_price
+        best_bid_price = order_book.b.best_price
+
+        if best_ask_price is None or best_bid_price is None:
             return ObservingAnomaliesDestiny([], [])
 
         cancelled_anomalies = []
         realized_anomalies = []
 
-        lowest_ask = min(order_book.a)
-        highest_bid = max(order_book.b)
+        # Saved anomalies keep Decimal prices, so compare them in Decimal
+        lowest_ask = scale.to_decimal_price(best_ask_price)
+        highest_bid = scale.to_decimal_price(best_bid_price)
 
         for key, anomaly in saved_limit_anomalies.items():
             order_book_side = (
                 order_book.a if key.type == "ask" else order_book.b
             )
-            order_value = order_book_side.get(key.price)
+            order_quantity = order_book_side.get(scale.parse_price(key.price))
 
-            if order_value is None:
+            if order_quantity is None:
                 self._observing_saved_limit_anomalies.pop(key, None)
                 if (key.type == "ask" and key.price > lowest_ask) or (
                     key.type == "bid" and key.price < highest_bid
@@ -238,7 +234,9 @@ class OrdersWorker(Worker):
                 else:
                     realized_anomalies.append(anomaly)
             else:
-                order_liquidity = key.price * order_value
+                order_liquidity = key.price * scale.to_decimal_quantity(
+                    order_quantity
+                )
                 deviation = (
                     anomaly.order_liquidity - order_liquidity
                 ) / anomaly.order_liquidity
@@ -389,30 +387,23 @@ class OrdersWorker(Worker):
         ) + self.__get_anomalies(order_book.b, "bid")
 
     def __get_anomalies(
-        self, orders: Dict[Decimal, Decimal], order_type: Literal["ask", "bid"]
+        self, orders: OrderBookSide, order_type: Literal["ask", "bid"]
     ) -> list[OrderAnomaly]:
-        top_orders = self.__get_sorted_top_orders(orders, order_type)
+        # Top orders ranked by liquidity, the most liquid first
+        sorted_positioned_orders = [
+            PositionedOrder(*level)
+            for level in orders.rank_by_liquidity(self._top_n_orders)
+        ]
 
-        if len(top_orders) <= 1:
+        if len(sorted_positioned_orders) <= 1:
             return []
 
-        order_book_liquidity = Decimal(0.0)
-        positioned_orders: list[PositionedOrder] = []
-
-        for position, (price, qty) in enumerate(top_orders.items()):
-            order_liquidity = price * qty
-            order_book_liquidity += order_liquidity
-            positioned_orders.append(
-                PositionedOrder(
-                    position=position,
-                    price=price,
-                    quantity=qty,
-                    liquidity=order_liquidity,
-                )
-            )
-
-        sorted_positioned_orders = sorted(
-            positioned_orders, key=lambda order: order.liquidity, reverse=True
+        scale = self._processor.scale
+        order_anomaly_minimum_liquidity = scale.parse_liquidity(
+            self._order_anomaly_minimum_liquidity
+        )
+        order_book_liquidity: LevelValue = sum(
+            order.liquidity for order in sorted_positioned_orders
         )
 
         anomalies: list[OrderAnomaly] = []
@@ -425,15 +416,19 @@ class OrdersWorker(Worker):
             current_order = sorted_positioned_orders[i]
             previous_order = sorted_positioned_orders[i - 1]
 
+            # Averages are calculated in Decimal to keep their precision
+            previous_order_liquidity = scale.to_decimal_liquidity(
+                previous_order.liquidity
+            )
             current_available_liquidity = (
                 calculate_average_excluding_value_from_sum(
-                    order_book_liquidity,
+                    scale.to_decimal_liquidity(order_book_liquidity),
                     len(sorted_positioned_orders) - 1,
-                    previous_order.liquidity,
+                    previous_order_liquidity,
                 )
             )
 
-            if previous_order.liquidity < current_available_liquidity / len(
+            if previous_order_liquidity < current_available_liquidity / len(
                 sorted_positioned_orders
             ):
                 break
@@ -442,26 +437,20 @@ class OrdersWorker(Worker):
                 previous_order.liquidity
                 > self._orders_anomaly_multiplier * current_order.liquidity
             ):
-                if (
-                    current_order.liquidity
-                    < self._order_anomaly_minimum_liquidity
-                ):
+                if current_order.liquidity < order_anomaly_minimum_liquidity:
                     break
                 else:
                     for order in sorted_positioned_orders[:i]:
-                        average_liquidity = (
-                            calculate_average_excluding_value_from_sum(
-                                order_book_liquidity,
-                                len(sorted_positioned_orders) - 1,
-                                previous_order.liquidity,
-                            )
-                        )
                         anomalies.append(
                             OrderAnomaly(
-                                price=order.price,
-                                quantity=order.quantity,
-                                order_liquidity=order.liquidity,
-                                average_liquidity=average_liquidity,
+                                price=scale.to_decimal_price(order.price),
+                                quantity=scale.to_decimal_quantity(
+                                    order.quantity
+                                ),
+                                order_liquidity=scale.to_decimal_liquidity(
+                                    order.liquidity
+                                ),
+                                average_liquidity=current_available_liquidity,
                                 position=order.position,
                                 type=order_type,
                             )
@@ -607,16 +596,6 @@ class OrdersWorker(Worker):
         for key in keys_to_remove:
             del anomalies_dict[key]
 
-    def __get_sorted_top_orders(
-        self, orders: Dict[Decimal, Decimal], order_type: Literal["ask", "bid"]
-    ) -> Dict[Decimal, Decimal]:
-        reverse = order_type == "bid"
-        return dict(
-            sorted(orders.items(), key=lambda item: item[0], reverse=reverse)[
-                : self._top_n_orders
-            ]
-        )
-
     def __is_volume_significantly_increased(
         self, anomaly: OrderAnomaly, anomaly_key: AnomalyKey
     ) -> bool:
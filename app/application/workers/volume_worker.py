@@ -238,15 +238,15 @@ class VolumeWorker(Worker):
 
         self._volume_updates_counter_per_interval += 1
 
-        for price, quantity in {**self._processor.order_book.b}.items():
-            self._summary_bids_volume_per_interval += round_to_int(
-                price * quantity
-            )
+        # Liquidity totals are maintained by the processor on every update
+        to_decimal_liquidity = self._processor.scale.to_decimal_liquidity
 
-        for price, quantity in {**self._processor.order_book.a}.items():
-            self._summary_asks_volume_per_interval += round_to_int(
-                price * quantity
-            )
+        self._summary_bids_volume_per_interval += round_to_int(
+            to_decimal_liquidity(self._processor.bids_liquidity)
+        )
+        self._summary_asks_volume_per_interval += round_to_int(
+            to_decimal_liquidity(self._processor.asks_liquidity)
+        )
 
         # Concat bids with asks and calculate total volume of order_book
         self._summary_volume_per_interval = (
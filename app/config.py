@@ -35,6 +35,48 @@ class Settings(BaseSettings):
     ORDERS_ANOMALIES_SUMMARY_COMPARATIVE_ARRAY_SIZE: int
 
     TOP_N_ORDERS: int
+
+    # Defaults for pairs without own in-memory order book depth limits
+    ORDER_BOOK_MAX_DEPTH_LEVELS: int | None = None
+    ORDER_BOOK_MAX_DEPTH_PERCENTAGE: float | None = None
+
+    # Coalesce all queued depth updates of a pair into one update
+    PROCESSOR_BATCH_UPDATES: bool = False
+    PROCESSOR_EVENTS_QUEUE_SIZE: int = 10000
+    # Collectors pass levels as raw strings decoded by the processor
+    PROCESSOR_LAZY_LEVEL_DECODING: bool = False
+
+    # Binance allows up to 1024 streams per combined-stream connection
+    BINANCE_MAX_STREAMS_PER_CONNECTION: int = 200
+    # Binance allows 6000 per minute, the rest is kept for other requests
+    BINANCE_REQUEST_WEIGHT_PER_MINUTE: int = 5000
+
+    # Pool of the HTTP client shared by all REST clients, HTTP/2 needs h2
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20
+    HTTP_CLIENT_HTTP2: bool = False
+
+    # Exchange endpoints, pointed at a local exchange emulator in benchmarks
+    BINANCE_WEBSOCKET_URI: str = "wss://stream.binance.com:9443"
+    BINANCE_API_URI: str = "https://api.binance.com"
+    COINBASE_WEBSOCKET_URI: str = "wss://ws-feed.exchange.coinbase.com"
+    KRAKEN_WEBSOCKET_URI: str = "wss://ws.kraken.com/"
+
+    # Raw frames of every pair are recorded into this directory when set
+    FRAME_RECORDER_DIRECTORY: str | None = None
+    FRAME_RECORDER_ROTATION_INTERVAL: float = 3600.0
+    FRAME_RECORDER_BUFFER_SIZE: int = 100000
+
+    # Frames recorded into this directory are replayed instead of collected
+    # when set, at the original pace times speed or as fast as possible at 0
+    REPLAY_DIRECTORY: str | None = None
+    REPLAY_SPEED: float = 1.0
+
+    # Writes are discarded and reads find nothing in the dummy mode, used
+    # for load tests without a database
+    DB_PERSISTENCE_MODE: Literal["postgres", "dummy"] = "postgres"
+
+    # orjson is used when installed unless the json decoder is forced
+    JSON_DECODER: Literal["auto", "orjson", "json"] = "auto"
     ORDER_ANOMALY_MULTIPLIER: float
     ANOMALIES_DETECTION_TTL: int
     ANOMALIES_OBSERVING_TTL: int
@@ -0,0 +1,184 @@
+"""
+Serves synthetic or recorded order books over the protocol of an exchange,
+for the exchange clients pointed at it with the *_URI settings.
+
+Usage: python -m app.emulator --exchange binance --pairs BTC/USDT,ETH/USDT
+"""
+import argparse
+import asyncio
+import logging
+import uuid
+
+from _decimal import Decimal
+
+from app.application.collectors.replay_collector import ReplayCollector
+from app.application.collectors.synthetic_collector import SyntheticCollector
+from app.application.common.collector import Collector
+from app.infrastructure.exchange_emulator.binance_emulator import \
+    BinanceEmulator
+from app.infrastructure.exchange_emulator.coinbase_emulator import \
+    CoinbaseEmulator
+from app.infrastructure.exchange_emulator.emulated_book import EmulatedBook
+from app.infrastructure.exchange_emulator.exchange_emulator import (
+    ExchangeEmulator, FaultInjection)
+from app.infrastructure.exchange_emulator.kraken_emulator import KrakenEmulator
+from app.utilities.logging_utils import get_logging_level
+
+logging.basicConfig(
+    level=get_logging_level(),
+    format="%(asctime)s [%(filename)s] %(levelname)s %(message)s",
+    handlers=[
+        logging.StreamHandler(),
+    ],
+)
+
+EMULATORS: dict[str, type[ExchangeEmulator]] = {
+    "binance": BinanceEmulator,
+    "coinbase": CoinbaseEmulator,
+    "kraken": KrakenEmulator,
+}
+
+URI_SETTINGS = {
+    "binance": "BINANCE_WEBSOCKET_URI={uri} BINANCE_API_URI={http_uri}",
+    "coinbase": "COINBASE_WEBSOCKET_URI={uri}",
+    "kraken": "KRAKEN_WEBSOCKET_URI={uri}",
+}
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--exchange", choices=list(EMULATORS), required=True)
+    parser.add_argument(
+        "--pairs",
+        required=True,
+        help="Comma separated pairs, like BTC/USDT,ETH/USDT",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument(
+        "--replay-directory",
+        help="Serve the frames recorded into this directory instead of "
+        "synthetic books",
+    )
+    parser.add_argument(
+        "--replay-exchange",
+        help="Exchange of the recorded frames, the emulated one by default",
+    )
+    parser.add_argument("--replay-speed", type=float, default=1.0)
+    parser.add_argument(
+        "--depth", type=int, default=1000, help="Levels per side"
+    )
+    parser.add_argument(
+        "--update-rate",
+        type=float,
+        default=10.0,
+        help="Updates per second of every pair",
+    )
+    parser.add_argument("--levels-per-update", type=int, default=20)
+    parser.add_argument("--price-drift", type=float, default=1.0)
+    parser.add_argument("--burst-probability", type=float, default=0.0)
+    parser.add_argument("--burst-multiplier", type=float, default=10.0)
+    parser.add_argument("--burst-duration", type=float, default=1.0)
+    parser.add_argument(
+        "--disconnect-probability",
+        type=float,
+        default=0.0,
+        help="Probability of closing a connection before an update",
+    )
+    parser.add_argument(
+        "--gap-probability",
+        type=float,
+        default=0.0,
+        help="Probability of dropping an update of a connection",
+    )
+    parser.add_argument(
+        "--send-delay",
+        type=float,
+        default=0.0,
+        help="Seconds to wait before sending every frame",
+    )
+    parser.add_argument(
+        "--max-pending-frames",
+        type=int,
+        default=None,
+        help="Close connections with more pending frames as slow consumers",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+
+    return parser.parse_args()
+
+
+def _create_source(
+    arguments: argparse.Namespace, symbol: str, index: int
+) -> Collector:
+    launch_id = uuid.uuid4()
+    pair_id = uuid.uuid4()
+
+    if arguments.replay_directory is not None:
+        return ReplayCollector(
+            launch_id=launch_id,
+            pair_id=pair_id,
+            symbol=symbol,
+            delimiter=Decimal("0.1"),
+            exchange_name=(
+                arguments.replay_exchange or arguments.exchange
+            ).upper(),
+            directory=arguments.replay_directory,
+            speed=arguments.replay_speed,
+        )
+
+    return SyntheticCollector(
+        launch_id=launch_id,
+        pair_id=pair_id,
+        symbol=symbol,
+        delimiter=Decimal("0.1"),
+        depth=arguments.depth,
+        update_rate=arguments.update_rate,
+        levels_per_update=arguments.levels_per_update,
+        price_drift=arguments.price_drift,
+        burst_probability=arguments.burst_probability,
+        burst_multiplier=arguments.burst_multiplier,
+        burst_duration=arguments.burst_duration,
+        seed=None if arguments.seed is None else arguments.seed + index,
+    )
+
+
+async def main(arguments: argparse.Namespace) -> None:
+    books = [
+        EmulatedBook(
+            symbol, _create_source(arguments, symbol, index).listen_stream()
+        )
+        for index, symbol in enumerate(arguments.pairs.split(","))
+    ]
+    emulator = EMULATORS[arguments.exchange](
+        books=books,
+        faults=FaultInjection(
+            disconnect_probability=arguments.disconnect_probability,
+            gap_probability=arguments.gap_probability,
+            send_delay=arguments.send_delay,
+            max_pending_frames=arguments.max_pending_frames,
+        ),
+        host=arguments.host,
+        port=arguments.port,
+        seed=arguments.seed,
+    )
+
+    await emulator.start()
+    logging.info(
+        "Point the collectors at the emulator with "
+        + URI_SETTINGS[arguments.exchange].format(
+            uri=emulator.uri, http_uri=emulator.http_uri
+        )
+    )
+
+    try:
+        await asyncio.Future()
+    finally:
+        await emulator.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(_parse_arguments()))
+    except KeyboardInterrupt:
+        logging.info("\nInterrupted. Closing emulator...")
@@ -1,10 +1,9 @@
 import logging
 
-import httpx
-
 from app.infrastructure.clients.apy_client.schemas.binance import \
     BinanceAPYSnapshot
 from app.infrastructure.clients.common import HttpClient
+from app.infrastructure.clients.http_client_pool import get_http_client
 
 
 class BinanceHttpClient(HttpClient):
@@ -14,7 +13,7 @@ class BinanceHttpClient(HttpClient):
             f"https://www.binance.com/bapi/earn/v1/friendly/finance-earn/simple"
             f"/product/simpleEarnProducts?asset={self.symbol}"
         )
-        self.http_client = httpx.AsyncClient()
+        self.http_client = get_http_client()
 
     async def fetch_apy_snapshot(
         self,
@@ -0,0 +1,215 @@
+import asyncio
+import gzip
+import itertools
+import json
+import logging
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (IO, AsyncIterable, AsyncIterator, Iterator, Literal,
+                    NamedTuple)
+
+from app.utilities.metrics_utils import RECORDER_DROPPED_FRAMES
+
+LiteralFrameKind = Literal["ws", "snapshot"]
+
+
+class RecordedFrame(NamedTuple):
+    # Receive time in nanoseconds since the epoch
+    received_at: int
+    kind: LiteralFrameKind
+    frame: str
+
+
+class FrameRecorder:
+    """
+    Records the raw frames received for a pair into gzip compressed JSON
+    lines files, a new one every rotation_interval seconds.
+
+    Frames are only queued on the receiving side and written by a
+    background task. When the writer falls behind by more than buffer_size
+    frames, new frames are dropped rather than slowing down collection.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        exchange_name: str,
+        symbol: str,
+        rotation_interval: float = 3600.0,
+        buffer_size: int = 100_000,
+    ):
+        self.exchange_name = exchange_name
+        self.symbol = symbol
+        self._directory = get_recording_directory(
+            directory, exchange_name, symbol
+        )
+        self._rotation_interval = rotation_interval
+        self._frames: asyncio.Queue[RecordedFrame] = asyncio.Queue(
+            maxsize=buffer_size
+        )
+        self._writer_task: asyncio.Task | None = None
+        self._file: IO[str] | None = None
+        self._file_period: int | None = None
+
+    def record(
+        self,
+        frame: str | bytes,
+        kind: LiteralFrameKind = "ws",
+        received_at: int | None = None,
+    ) -> None:
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self.__write_frames())
+
+        try:
+            self._frames.put_nowait(
+                RecordedFrame(
+                    received_at=received_at or time.time_ns(),
+                    kind=kind,
+                    frame=frame if isinstance(frame, str) else frame.decode(),
+                )
+            )
+        except asyncio.QueueFull:
+            RECORDER_DROPPED_FRAMES.labels(
+                exchange=self.exchange_name, symbol=self.symbol
+            ).inc()
+
+    async def close(self) -> None:
+        if self._writer_task is not None:
+            # Frames still buffered are written before the file is closed
+            await self._frames.join()
+            self._writer_task.cancel()
+            self._writer_task = None
+
+        await asyncio.to_thread(self.__close_file)
+
+    async def __write_frames(self) -> None:
+        while True:
+            frames = [await self._frames.get()]
+            while not self._frames.empty():
+                frames.append(self._frames.get_nowait())
+
+            try:
+                await asyncio.to_thread(self.__write_batch, frames)
+            except Exception as err:
+                logging.exception(
+                    exc_info=err,
+                    msg=f"Error occurred while recording frames [symbol={self.symbol}]",
+                )
+            finally:
+                for _ in frames:
+                    self._frames.task_done()
+
+    def __write_batch(self, frames: list[RecordedFrame]) -> None:
+        for frame in frames:
+            period = int(frame.received_at / 1e9 // self._rotation_interval)
+
+            if self._file is None or period != self._file_period:
+                self.__close_file()
+                self._file = self.__open_file(period)
+                self._file_period = period
+
+            self._file.write(json.dumps(frame._asdict()) + "\n")
+
+        # Written frames stay readable even if the process is killed
+        if self._file is not None:
+            self._file.flush()
+
+    def __open_file(self, period: int) -> IO[str]:
+        started_at = datetime.fromtimestamp(
+            period * self._rotation_interval, tz=timezone.utc
+        )
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        return gzip.open(
+            self._directory / f"{started_at:%Y%m%dT%H%M%S}.jsonl.gz",
+            "at",
+            encoding="utf-8",
+        )
+
+    def __close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def get_recording_directory(
+    directory: str | Path, exchange_name: str, symbol: str
+) -> Path:
+    return (
+        Path(directory)
+        / exchange_name.lower()
+        / symbol.replace("/", "").replace("-", "")
+    )
+
+
+def record_frames(
+    frames: AsyncIterable[str | bytes], recorder: FrameRecorder | None
+) -> AsyncIterable[str | bytes]:
+    # Frames are passed through untouched when nothing is recorded
+    if recorder is None:
+        return frames
+
+    return _record_frames(frames, recorder)
+
+
+async def _record_frames(
+    frames: AsyncIterable[str | bytes], recorder: FrameRecorder
+) -> AsyncIterator[str | bytes]:
+    async for frame in frames:
+        recorder.record(frame)
+        yield frame
+
+
+def read_frames(path: str | Path) -> Iterator[RecordedFrame]:
+    """
+    Reads the frames of a recording file, ignoring the incomplete tail of
+    files whose recorder was not closed.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                yield RecordedFrame(**json.loads(line))
+        except (EOFError, zlib.error, json.JSONDecodeError):
+            return
+
+
+async def read_frames_in_thread(
+    path: str | Path, batch_size: int = 1000
+) -> AsyncIterator[RecordedFrame]:
+    """
+    Reads the frames of a recording file like read_frames, decompressing
+    them by batches in a thread so that the event loop is not blocked.
+    """
+    frames = read_frames(path)
+
+    def read_batch() -> list[RecordedFrame]:
+        return list(itertools.islice(frames, batch_size))
+
+    while batch := await asyncio.to_thread(read_batch):
+        for frame in batch:
+            yield frame
+
+
+def find_first_received_at(directory: str | Path) -> int | None:
+    """
+    Returns the receive time of the earliest frame recorded for any pair
+    into the directory, or None when nothing was recorded.
+    """
+    first_received_at: int | None = None
+
+    for pair_directory in Path(directory).glob("*/*"):
+        for path in sorted(pair_directory.glob("*.jsonl.gz")):
+            frame = next(read_frames(path), None)
+            if frame is None:
+                continue
+
+            if (
+                first_received_at is None
+                or frame.received_at < first_received_at
+            ):
+                first_received_at = frame.received_at
+            break
+
+    return first_received_at
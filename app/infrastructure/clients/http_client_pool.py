@@ -0,0 +1,45 @@
+import logging
+
+import httpx
+
+from app.config import settings
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the HTTP client shared by all REST clients of the process, so
+    that they reuse one pool of keep-alive connections per host.
+    """
+    global _http_client
+
+    if _http_client is None:
+        _http_client = _create_http_client()
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+    )
+
+    if settings.HTTP_CLIENT_HTTP2:
+        try:
+            return httpx.AsyncClient(limits=limits, http2=True)
+        except ImportError:
+            logging.warning(
+                "h2 is not installed, falling back to HTTP/1.1 client"
+            )
+
+    return httpx.AsyncClient(limits=limits)
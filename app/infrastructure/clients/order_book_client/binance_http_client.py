@@ -1,24 +1,65 @@
 import logging
 
-import httpx
-from _decimal import Decimal
-
+from app.config import settings
 from app.infrastructure.clients.common import HttpClient
+from app.infrastructure.clients.frame_recorder import FrameRecorder
+from app.infrastructure.clients.http_client_pool import get_http_client
+from app.infrastructure.clients.order_book_client.binance_request_limiter import (
+    BINANCE_DEPTH_SNAPSHOT_WEIGHT, BinanceRequestWeightLimiter,
+    get_binance_request_limiter)
 from app.infrastructure.clients.order_book_client.schemas.binance import \
     BinanceOrderBookSnapshot
+from app.utilities.fixed_point_utils import DecimalScale, LevelParser
+from app.utilities.json_utils import json_loads
 
 
 class BinanceHttpClient(HttpClient):
-    def __init__(self, symbol: str):
+    def __init__(
+        self,
+        symbol: str,
+        scale: LevelParser = DecimalScale(),
+        limiter: BinanceRequestWeightLimiter | None = None,
+        recorder: FrameRecorder | None = None,
+        api_uri: str = settings.BINANCE_API_URI,
+    ):
         super().__init__(symbol=symbol, symbol_splitter="")
-        self.fetch_order_book_snapshot_url = f"https://api.binance.com/api/v3/depth?symbol={self.symbol}&limit=1000"
-        self.http_client = httpx.AsyncClient()
+        self._scale = scale
+        self.fetch_order_book_snapshot_url = (
+            f"{api_uri}/api/v3/depth?symbol={self.symbol}&limit=1000"
+        )
+        self.http_client = get_http_client()
+        self._limiter = limiter or get_binance_request_limiter()
+        self._recorder = recorder
 
     async def fetch_order_book_snapshot(
-        self,
+        self, priority: int = 0
     ) -> BinanceOrderBookSnapshot | None:
+        await self._limiter.acquire(
+            BINANCE_DEPTH_SNAPSHOT_WEIGHT, priority=priority
+        )
         resp = await self.http_client.get(self.fetch_order_book_snapshot_url)
-        data = resp.json()
+
+        if "x-mbx-used-weight-1m" in resp.headers:
+            self._limiter.update_used_weight(
+                int(resp.headers["x-mbx-used-weight-1m"])
+            )
+
+        if resp.status_code in (418, 429):
+            self._limiter.block(float(resp.headers.get("retry-after", 60)))
+            raise Exception(
+                f"Binance request weight limit exceeded [symbol={self.symbol}]"
+            )
+
+        if self._recorder is not None:
+            self._recorder.record(resp.content, kind="snapshot")
+
+        return self.parse_order_book_snapshot(resp.content)
+
+    def parse_order_book_snapshot(
+        self, content: str | bytes
+    ) -> BinanceOrderBookSnapshot | None:
+        # Decoded straight from the response body bytes
+        data = json_loads(content)
 
         if "code" in data and data["code"] == -1121:
             logging.info(
@@ -28,8 +69,14 @@ class BinanceHttpClient(HttpClient):
 
             return None
 
-        bids = {Decimal(bid[0]): Decimal(bid[1]) for bid in data["bids"]}
-        asks = {Decimal(ask[0]): Decimal(ask[1]) for ask in data["asks"]}
+        parse_price = self._scale.parse_price
+        parse_quantity = self._scale.parse_quantity
+        bids = {
+            parse_price(bid[0]): parse_quantity(bid[1]) for bid in data["bids"]
+        }
+        asks = {
+            parse_price(ask[0]): parse_quantity(ask[1]) for ask in data["asks"]
+        }
         return BinanceOrderBookSnapshot(
             last_update_id=data["lastUpdateId"],
             b=bids,
@@ -0,0 +1,121 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from app.config import settings
+
+# Weight of the depth endpoint for limits from 501 to 1000 levels
+BINANCE_DEPTH_SNAPSHOT_WEIGHT = 50
+
+
+class BinanceRequestWeightLimiter:
+    """
+    Keeps the request weight used within each minute under the Binance
+    budget. Requests which don't fit into the current minute wait for the
+    next one in a priority queue, lower priorities being sent first.
+    """
+
+    def __init__(self, weight_per_minute: int):
+        self._weight_per_minute = weight_per_minute
+        self._used_weight = 0
+        self._window = self.__get_current_window()
+        self._blocked_until = 0.0
+        # Waiting requests as (priority, order, weight, future)
+        self._waiters: list[tuple[int, int, int, asyncio.Future[None]]] = []
+        self._waiters_order = itertools.count()
+        self._release_task: asyncio.Task | None = None
+
+    async def acquire(self, weight: int, priority: int = 0) -> None:
+        # Such a request would never fit and would hold back all the others
+        if weight > self._weight_per_minute:
+            raise ValueError(
+                f"Request weight {weight} exceeds the budget of "
+                f"{self._weight_per_minute} per minute"
+            )
+
+        if not self._waiters and self.__try_consume(weight):
+            return
+
+        future: asyncio.Future[
+            None
+        ] = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters,
+            (priority, next(self._waiters_order), weight, future),
+        )
+
+        if self._release_task is None or self._release_task.done():
+            self._release_task = asyncio.create_task(self.__release_waiters())
+
+        await future
+
+    def update_used_weight(self, used_weight: int) -> None:
+        """
+        Syncs the used weight with the one reported by Binance, which also
+        counts requests sent by other processes from the same IP.
+        """
+        self.__roll_window()
+        self._used_weight = max(self._used_weight, used_weight)
+
+    def block(self, seconds: float) -> None:
+        # Binance asks to back off with Retry-After on 429 and 418 responses
+        self._blocked_until = max(self._blocked_until, time.time() + seconds)
+
+    async def __release_waiters(self) -> None:
+        while self._waiters:
+            priority, _, weight, future = self._waiters[0]
+
+            if future.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+
+            if self.__try_consume(weight):
+                heapq.heappop(self._waiters)
+                future.set_result(None)
+                continue
+
+            await asyncio.sleep(self.__get_wait_time())
+
+    def __try_consume(self, weight: int) -> bool:
+        if time.time() < self._blocked_until:
+            return False
+
+        self.__roll_window()
+
+        if self._used_weight + weight > self._weight_per_minute:
+            return False
+
+        self._used_weight += weight
+        return True
+
+    def __roll_window(self) -> None:
+        window = self.__get_current_window()
+
+        if window != self._window:
+            self._window = window
+            self._used_weight = 0
+
+    def __get_wait_time(self) -> float:
+        now = time.time()
+
+        return max(self._blocked_until, (self._window + 1) * 60) - now
+
+    @staticmethod
+    def __get_current_window() -> int:
+        # Binance counts the weight per calendar minute
+        return int(time.time() // 60)
+
+
+_binance_request_limiter: BinanceRequestWeightLimiter | None = None
+
+
+def get_binance_request_limiter() -> BinanceRequestWeightLimiter:
+    global _binance_request_limiter
+
+    if _binance_request_limiter is None:
+        _binance_request_limiter = BinanceRequestWeightLimiter(
+            settings.BINANCE_REQUEST_WEIGHT_PER_MINUTE
+        )
+
+    return _binance_request_limiter
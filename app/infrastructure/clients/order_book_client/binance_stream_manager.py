@@ -0,0 +1,114 @@
+import asyncio
+import itertools
+import json
+from typing import Any
+
+from websockets import WebSocketClientProtocol
+
+from app.config import settings
+from app.infrastructure.clients.frame_recorder import FrameRecorder
+from app.infrastructure.clients.shared_websocket_connection import \
+    SharedWebsocketConnection
+from app.utilities.reconnect_utils import ReconnectPolicy
+
+
+class BinanceCombinedStreamConnection(SharedWebsocketConnection):
+    _are_uri_topics_subscribed = True
+
+    exchange_name = "BINANCE"
+    host = "stream.binance.com"
+    # Every reconnection resyncs the books with REST snapshots
+    reconnect_policy = ReconnectPolicy(initial_delay=2.0, max_delay=60.0)
+
+    def __init__(self, uri: str = settings.BINANCE_WEBSOCKET_URI) -> None:
+        super().__init__(uri=f"{uri}/stream")
+        self._request_ids = itertools.count(1)
+
+    def _get_uri(self, topics: list[str]) -> str:
+        return f"{self._uri}?streams={'/'.join(topics)}"
+
+    async def _send_subscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        await self.__send_request(websocket, "SUBSCRIBE", topics)
+
+    async def _send_unsubscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        await self.__send_request(websocket, "UNSUBSCRIBE", topics)
+
+    async def __send_request(
+        self,
+        websocket: WebSocketClientProtocol,
+        method: str,
+        topics: list[str],
+    ) -> None:
+        await websocket.send(
+            json.dumps(
+                {
+                    "method": method,
+                    "params": topics,
+                    "id": next(self._request_ids),
+                }
+            )
+        )
+
+    def _route(self, message: Any) -> tuple[str, Any] | None:
+        # Responses to requests carry no stream
+        if "stream" not in message:
+            return None
+
+        return message["stream"], message["data"]
+
+
+class BinanceStreamManager:
+    """
+    Shares combined-stream connections between Binance collectors, opening
+    a new connection only when the existing ones reached the stream limit.
+    """
+
+    def __init__(
+        self,
+        max_streams_per_connection: int = settings.BINANCE_MAX_STREAMS_PER_CONNECTION,
+    ):
+        self._max_streams_per_connection = max_streams_per_connection
+        self._connections: list[BinanceCombinedStreamConnection] = []
+        self._stream_connections: dict[
+            str, BinanceCombinedStreamConnection
+        ] = {}
+
+    def subscribe(
+        self, stream: str, recorder: FrameRecorder | None = None
+    ) -> asyncio.Queue[Any]:
+        # A stream subscribed again is kept on its connection
+        connection = self._stream_connections.get(stream) or next(
+            (
+                connection
+                for connection in self._connections
+                if connection.subscriptions_count
+                < self._max_streams_per_connection
+            ),
+            None,
+        )
+
+        if connection is None:
+            connection = BinanceCombinedStreamConnection()
+            self._connections.append(connection)
+
+        self._stream_connections[stream] = connection
+
+        return connection.subscribe(stream, recorder=recorder)
+
+    def unsubscribe(self, stream: str, queue: asyncio.Queue[Any]) -> None:
+        connection = self._stream_connections.get(stream)
+
+        if connection is not None and connection.unsubscribe(stream, queue):
+            del self._stream_connections[stream]
+
+    @property
+    def connections_count(self) -> int:
+        return sum(
+            1
+            for connection in self._connections
+            if connection.subscriptions_count
+        )
@@ -1,33 +1,90 @@
-import json
 from typing import AsyncGenerator
 
 import websockets
-from _decimal import Decimal
 
+from app.config import settings
 from app.infrastructure.clients.common import WebsocketClient
+from app.infrastructure.clients.frame_recorder import (FrameRecorder,
+                                                       record_frames)
+from app.infrastructure.clients.order_book_client.binance_stream_manager import \
+    BinanceStreamManager
 from app.infrastructure.clients.order_book_client.schemas.binance import \
     BinanceOrderBookDepthUpdate
+from app.infrastructure.clients.shared_websocket_connection import get_message
+from app.utilities.fixed_point_utils import DecimalScale, LevelParser
+from app.utilities.json_utils import json_loads
 
 
 class BinanceWebsocketClient(WebsocketClient):
-    def __init__(self, symbol: str):
+    def __init__(
+        self,
+        symbol: str,
+        scale: LevelParser = DecimalScale(),
+        stream_manager: BinanceStreamManager | None = None,
+        recorder: FrameRecorder | None = None,
+        uri: str = settings.BINANCE_WEBSOCKET_URI,
+    ):
         super().__init__(symbol=symbol, symbol_splitter="")
-        self.uri = (
-            f"wss://stream.binance.com:9443/ws/{self.symbol.lower()}@depth"
-        )
+        self._scale = scale
+        # Depth stream is read from a shared combined-stream connection
+        # when the manager is set
+        self._stream_manager = stream_manager
+        self._recorder = recorder
+        self.stream = f"{self.symbol.lower()}@depth"
+        self.uri = f"{uri}/ws/{self.stream}"
 
     async def listen_depth_stream(
         self,
     ) -> AsyncGenerator[BinanceOrderBookDepthUpdate, None]:
+        if self._stream_manager is not None:
+            async for update in self.__listen_shared_depth_stream(
+                self._stream_manager
+            ):
+                yield update
+            return
+
         async with websockets.connect(self.uri) as websocket:
-            async for message in websocket:
-                data = json.loads(message)
-                bids = {Decimal(bid[0]): Decimal(bid[1]) for bid in data["b"]}
-                asks = {Decimal(ask[0]): Decimal(ask[1]) for ask in data["a"]}
-                yield BinanceOrderBookDepthUpdate(
-                    b=bids,
-                    a=asks,
-                    event_time=data["E"],
-                    first_update_id=data["U"],
-                    final_update_id=data["u"],
-                )
+            async for message in record_frames(websocket, self._recorder):
+                yield self.__convert_to_depth_update(json_loads(message))
+
+    async def __listen_shared_depth_stream(
+        self, stream_manager: BinanceStreamManager
+    ) -> AsyncGenerator[BinanceOrderBookDepthUpdate, None]:
+        queue = stream_manager.subscribe(self.stream, recorder=self._recorder)
+
+        try:
+            while True:
+                yield self.__convert_to_depth_update(await get_message(queue))
+        finally:
+            stream_manager.unsubscribe(self.stream, queue)
+
+    def parse_depth_update(
+        self, frame: str | bytes
+    ) -> BinanceOrderBookDepthUpdate:
+        data = json_loads(frame)
+
+        # Frames of combined-stream connections wrap the stream event
+        if "stream" in data:
+            data = data["data"]
+
+        return self.__convert_to_depth_update(data)
+
+    def __convert_to_depth_update(
+        self, data: dict
+    ) -> BinanceOrderBookDepthUpdate:
+        parse_price = self._scale.parse_price
+        parse_quantity = self._scale.parse_quantity
+        bids = {
+            parse_price(bid[0]): parse_quantity(bid[1]) for bid in data["b"]
+        }
+        asks = {
+            parse_price(ask[0]): parse_quantity(ask[1]) for ask in data["a"]
+        }
+
+        return BinanceOrderBookDepthUpdate(
+            b=bids,
+            a=asks,
+            event_time=data["E"],
+            first_update_id=data["U"],
+            final_update_id=data["u"],
+        )
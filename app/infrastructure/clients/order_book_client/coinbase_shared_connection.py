@@ -0,0 +1,57 @@
+import logging
+from typing import Any
+
+from websockets import WebSocketClientProtocol
+
+from app.config import settings
+from app.infrastructure.clients.order_book_client.schemas.coinbase import (
+    CoinbaseEventType, CoinbaseSnapshotPayload)
+from app.infrastructure.clients.shared_websocket_connection import \
+    SharedWebsocketConnection
+
+EVENT_TYPE_KEY = "type"
+
+
+class CoinbaseSharedConnection(SharedWebsocketConnection):
+    """
+    Single ws-feed connection carrying the level2 channel of every product
+    subscribed by Coinbase collectors.
+    """
+
+    exchange_name = "COINBASE"
+    host = "ws-feed.exchange.coinbase.com"
+
+    def __init__(
+        self,
+        channel: str = "level2_batch",
+        uri: str = settings.COINBASE_WEBSOCKET_URI,
+    ) -> None:
+        super().__init__(uri=uri)
+        self._channel = channel
+
+    async def _send_subscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        ws_payload = CoinbaseSnapshotPayload(
+            product_ids=topics, channels=[self._channel]
+        )
+
+        await websocket.send(ws_payload.model_dump_json())
+
+    async def _send_unsubscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        ws_payload = CoinbaseSnapshotPayload(
+            product_ids=topics, channels=[self._channel], type="unsubscribe"
+        )
+
+        await websocket.send(ws_payload.model_dump_json())
+
+    def _route(self, message: Any) -> tuple[str, Any] | None:
+        match message.get(EVENT_TYPE_KEY):
+            case CoinbaseEventType.SNAPSHOT.value | CoinbaseEventType.UPDATE.value:
+                return message["product_id"], message
+            case "error":
+                logging.error(f"Coinbase shared connection error {message}")
+
+        return None
@@ -1,29 +1,52 @@
-import json
 import logging
-from typing import AsyncGenerator, Callable, Union
+from typing import Any, AsyncGenerator, AsyncIterable, Union
 
 import websockets
-from _decimal import Decimal
 
+from app.config import settings
 from app.infrastructure.clients.common import WebsocketClient
+from app.infrastructure.clients.frame_recorder import (FrameRecorder,
+                                                       record_frames)
+from app.infrastructure.clients.order_book_client.coinbase_shared_connection import (
+    EVENT_TYPE_KEY, CoinbaseSharedConnection)
 from app.infrastructure.clients.order_book_client.schemas.coinbase import (
-    CoinbaseEventType, CoinbaseOrderBook, CoinbaseOrderBookDepthUpdate,
-    CoinbaseOrderBookSnapshot, CoinbaseOrderType, CoinbaseSnapshotPayload)
+    CoinbaseErrorMessage, CoinbaseEventType, CoinbaseOrderType,
+    CoinbaseSnapshotPayload)
 from app.infrastructure.clients.order_book_client.schemas.common import (
     OrderBookEvent, OrderBookSnapshot, OrderBookUpdate)
-
-EVENT_TYPE_KEY = "type"
+from app.infrastructure.clients.shared_websocket_connection import get_message
+from app.utilities.fixed_point_utils import (DecimalScale, LevelParser,
+                                             RawLevelValue)
+from app.utilities.json_utils import json_loads
 
 
 class CoinbaseWebsocketClient(WebsocketClient):
-    def __init__(self, symbol: str):
+    def __init__(
+        self,
+        symbol: str,
+        scale: LevelParser = DecimalScale(),
+        connection: CoinbaseSharedConnection | None = None,
+        recorder: FrameRecorder | None = None,
+        uri: str = settings.COINBASE_WEBSOCKET_URI,
+    ):
         super().__init__(symbol=symbol, symbol_splitter="-")
-        self._uri = "wss://ws-feed.exchange.coinbase.com"
+        self._scale = scale
+        # Product is subscribed on a shared connection when it is set
+        self._connection = connection
+        self._recorder = recorder
+        self._uri = uri
         self._channel = "level2_batch"
 
     async def listen_depth_stream(
         self,
     ) -> AsyncGenerator[OrderBookEvent | None, None]:
+        if self._connection is not None:
+            async for event in self.__listen_shared_depth_stream(
+                self._connection
+            ):
+                yield event
+            return
+
         async with websockets.connect(self._uri) as websocket:
             ws_payload = CoinbaseSnapshotPayload(
                 product_ids=[self.symbol], channels=[self._channel]
@@ -31,39 +54,60 @@ class CoinbaseWebsocketClient(WebsocketClient):
 
             await websocket.send(ws_payload.model_dump_json())
 
-            async for message in websocket:
-                body = self.__deserialize_message(message=message)
+            async for event in self.listen_frames(
+                record_frames(websocket, self._recorder)
+            ):
+                yield event
 
-                if body is None:
-                    continue
+    async def listen_frames(
+        self, frames: AsyncIterable[str | bytes]
+    ) -> AsyncGenerator[OrderBookEvent | None, None]:
+        async for frame in frames:
+            yield self.__deserialize_message(message=frame)
 
-                switch: dict[type[CoinbaseOrderBook], Callable] = {
-                    CoinbaseOrderBookSnapshot: self.__handle_snapshot,
-                    CoinbaseOrderBookDepthUpdate: self.__handle_update,
-                }
+    async def __listen_shared_depth_stream(
+        self, connection: CoinbaseSharedConnection
+    ) -> AsyncGenerator[OrderBookEvent | None, None]:
+        queue = connection.subscribe(self.symbol, recorder=self._recorder)
 
-                # Retrieve and execute the handler
-                handler = switch.get(type(body))
-                if handler:
-                    yield handler(body)
-                else:
-                    yield None
+        try:
+            while True:
+                yield self.__handle_body(await get_message(queue))
+        finally:
+            connection.unsubscribe(self.symbol, queue)
 
     def __deserialize_message(
         self, message: Union[str, bytes]
-    ) -> CoinbaseOrderBook | None:
+    ) -> OrderBookEvent | None:
         try:
             if message is None:
                 return None
 
-            body = json.loads(message)
+            return self.__handle_body(json_loads(message))
+        except Exception as err:
+            logging.exception(
+                exc_info=err, msg="Error occurred in Coinbase collector"
+            )
 
-            if EVENT_TYPE_KEY in body:
-                if body[EVENT_TYPE_KEY] == CoinbaseEventType.SNAPSHOT.value:
-                    return CoinbaseOrderBookSnapshot.model_validate(body)
+        return None
 
-                if body[EVENT_TYPE_KEY] == CoinbaseEventType.UPDATE.value:
-                    return CoinbaseOrderBookDepthUpdate.model_validate(body)
+    def __handle_body(self, body: dict[str, Any]) -> OrderBookEvent | None:
+        """
+        Converts book messages straight into events, validating only the
+        rare control messages against their schemas.
+        """
+        try:
+            match body.get(EVENT_TYPE_KEY):
+                case CoinbaseEventType.UPDATE.value:
+                    return self.__handle_update(body)
+                case CoinbaseEventType.SNAPSHOT.value:
+                    return self.__handle_snapshot(body)
+                case "error":
+                    error = CoinbaseErrorMessage.model_validate(body)
+                    logging.error(
+                        f"Coinbase error {error.message}: {error.reason} "
+                        f"[symbol={self.symbol}]"
+                    )
         except Exception as err:
             logging.exception(
                 exc_info=err, msg="Error occurred in Coinbase collector"
@@ -71,31 +115,37 @@ class CoinbaseWebsocketClient(WebsocketClient):
 
         return None
 
-    def __handle_snapshot(
-        self, body: CoinbaseOrderBookSnapshot
-    ) -> OrderBookEvent:
+    def __handle_snapshot(self, body: dict[str, Any]) -> OrderBookEvent:
+        parse_price = self._scale.parse_price
+        parse_quantity = self._scale.parse_quantity
+
         return OrderBookSnapshot(
-            a={Decimal(order[0]): Decimal(order[1]) for order in body.asks},
-            b={Decimal(order[0]): Decimal(order[1]) for order in body.bids},
+            a={
+                parse_price(order[0]): parse_quantity(order[1])
+                for order in body["asks"]
+            },
+            b={
+                parse_price(order[0]): parse_quantity(order[1])
+                for order in body["bids"]
+            },
         )
 
-    def __handle_update(
-        self, body: CoinbaseOrderBookDepthUpdate
-    ) -> OrderBookEvent:
-        type_position = 0
-        price_position = 1
-        volume_position = 2
-
-        asks = {
-            Decimal(order[price_position]): Decimal(order[volume_position])
-            for order in body.changes
-            if order[type_position] == CoinbaseOrderType.SELL.value
-        }
-
-        bids = {
-            Decimal(order[price_position]): Decimal(order[volume_position])
-            for order in body.changes
-            if order[type_position] == CoinbaseOrderType.BUY.value
-        }
+    def __handle_update(self, body: dict[str, Any]) -> OrderBookEvent:
+        parse_price = self._scale.parse_price
+        parse_quantity = self._scale.parse_quantity
+        asks: dict[RawLevelValue, RawLevelValue] = {}
+        bids: dict[RawLevelValue, RawLevelValue] = {}
+
+        # Changes are split by side in a single pass
+        for side, price, volume in body["changes"]:
+            match side:
+                case CoinbaseOrderType.BUY.value:
+                    bids[parse_price(price)] = parse_quantity(volume)
+                case CoinbaseOrderType.SELL.value:
+                    asks[parse_price(price)] = parse_quantity(volume)
+                case _:
+                    logging.warning(
+                        f"Unknown Coinbase change side {side} [symbol={self.symbol}]"
+                    )
 
         return OrderBookUpdate(a=asks, b=bids)
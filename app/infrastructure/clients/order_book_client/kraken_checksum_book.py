@@ -0,0 +1,120 @@
+import zlib
+from bisect import bisect_left, insort
+
+from app.utilities.fixed_point_utils import LevelValue
+
+KRAKEN_CHECKSUM_LEVELS = 10
+
+# Parsed price and volume of a level along with the strings Kraken sent
+KrakenLevel = tuple[LevelValue, LevelValue, str, str]
+
+
+def to_checksum_string(value: str) -> str:
+    # Kraken checksums use the exchange formatting with the decimal point
+    # and leading zeros removed
+    return value.replace(".", "").lstrip("0")
+
+
+class KrakenChecksumBookSide:
+    __slots__ = ("_levels", "_prices", "_is_descending")
+
+    def __init__(self, is_descending: bool = False):
+        # Checksum string form of every level, cached on insert
+        self._levels: dict[LevelValue, str] = {}
+        self._prices: list[LevelValue] = []
+        self._is_descending = is_descending
+
+    def clear(self) -> None:
+        self._levels = {}
+        self._prices = []
+
+    def update(self, level: KrakenLevel) -> None:
+        price, volume, price_string, volume_string = level
+
+        if volume == 0:
+            if self._levels.pop(price, None) is not None:
+                del self._prices[bisect_left(self._prices, price)]
+            return
+
+        if price not in self._levels:
+            insort(self._prices, price)
+        self._levels[price] = to_checksum_string(
+            price_string
+        ) + to_checksum_string(volume_string)
+
+    def truncate(self, depth: int) -> list[LevelValue]:
+        """
+        Keeps only the depth best levels and returns the removed prices.
+        """
+        if len(self._prices) <= depth:
+            return []
+
+        if self._is_descending:
+            removed_prices = self._prices[: len(self._prices) - depth]
+            del self._prices[: len(self._prices) - depth]
+        else:
+            removed_prices = self._prices[depth:]
+            del self._prices[depth:]
+
+        for price in removed_prices:
+            del self._levels[price]
+
+        return removed_prices
+
+    def top_checksum_strings(self, n: int) -> list[str]:
+        if self._is_descending:
+            prices = self._prices[: -n - 1 : -1]
+        else:
+            prices = self._prices[:n]
+
+        return [self._levels[price] for price in prices]
+
+
+class KrakenChecksumBook:
+    """
+    Mirror of a Kraken book of the subscribed depth used to verify the
+    CRC32 checksum sent with every book update.
+
+    The book of the processor is not verified instead: it is exchange
+    agnostic and downstream of the events queue, holds levels decoded
+    without the Kraken formatting the checksum is computed on, and may be
+    pruned by depth limits. The mirror costs a second copy of at most the
+    subscribed depth, and stays equal to the processor book within that
+    depth since it emits the deletes of the levels falling out of it.
+    """
+
+    def __init__(self, depth: int):
+        self._depth = depth
+        self._asks = KrakenChecksumBookSide()
+        self._bids = KrakenChecksumBookSide(is_descending=True)
+
+    def apply_snapshot(
+        self, asks: list[KrakenLevel], bids: list[KrakenLevel]
+    ) -> None:
+        self._asks.clear()
+        self._bids.clear()
+        self.apply_update(asks, bids)
+
+    def apply_update(
+        self, asks: list[KrakenLevel], bids: list[KrakenLevel]
+    ) -> tuple[list[LevelValue], list[LevelValue]]:
+        """
+        Applies the levels and returns the ask and bid prices which fell out
+        of the subscribed depth, since Kraken doesn't send deletes for them.
+        """
+        for level in asks:
+            self._asks.update(level)
+        for level in bids:
+            self._bids.update(level)
+
+        return self._asks.truncate(self._depth), self._bids.truncate(
+            self._depth
+        )
+
+    def checksum(self) -> str:
+        checksum_string = "".join(
+            self._asks.top_checksum_strings(KRAKEN_CHECKSUM_LEVELS)
+            + self._bids.top_checksum_strings(KRAKEN_CHECKSUM_LEVELS)
+        )
+
+        return str(zlib.crc32(checksum_string.encode()))
@@ -0,0 +1,57 @@
+from typing import Any
+
+from websockets import WebSocketClientProtocol
+
+from app.config import settings
+from app.infrastructure.clients.order_book_client.schemas.kraken import \
+    KrakenSnapshotPayload
+from app.infrastructure.clients.shared_websocket_connection import \
+    SharedWebsocketConnection
+
+
+class KrakenSharedConnection(SharedWebsocketConnection):
+    """
+    Single Kraken connection carrying the book channel of every pair
+    subscribed by Kraken collectors.
+    """
+
+    exchange_name = "KRAKEN"
+    host = "ws.kraken.com"
+
+    def __init__(self, uri: str = settings.KRAKEN_WEBSOCKET_URI) -> None:
+        super().__init__(uri=uri)
+        self._channel_pairs: dict[int, str] = {}
+
+    def _on_connect(self) -> None:
+        # Channel ids of a previous socket may be reassigned to other pairs
+        self._channel_pairs.clear()
+
+    async def _send_subscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        ws_payload = KrakenSnapshotPayload(pair=topics)
+
+        await websocket.send(ws_payload.model_dump_json())
+
+    async def _send_unsubscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        ws_payload = KrakenSnapshotPayload(pair=topics, event="unsubscribe")
+
+        await websocket.send(ws_payload.model_dump_json())
+
+    def _route(self, message: Any) -> tuple[str, Any] | None:
+        if isinstance(message, dict):
+            # Channel ids are assigned by subscription status messages
+            if (
+                message.get("event") == "subscriptionStatus"
+                and message.get("status") == "subscribed"
+            ):
+                self._channel_pairs[message["channelID"]] = message["pair"]
+            return None
+
+        # Book messages are [channel_id, payload(s)..., channel_name, pair]
+        if isinstance(message, list) and len(message) >= 4:
+            return self._channel_pairs.get(message[0], message[-1]), message
+
+        return None
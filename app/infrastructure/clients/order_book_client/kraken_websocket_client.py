@@ -1,75 +1,210 @@
-import json
 import logging
-from typing import AsyncGenerator, Union
+from typing import (Any, AsyncGenerator, AsyncIterable, AsyncIterator,
+                    Awaitable, Callable, NamedTuple, Union)
 
 import websockets
 
+from app.config import settings
 from app.infrastructure.clients.common import WebsocketClient
+from app.infrastructure.clients.frame_recorder import (FrameRecorder,
+                                                       record_frames)
+from app.infrastructure.clients.order_book_client.kraken_checksum_book import (
+    KrakenChecksumBook, KrakenLevel)
+from app.infrastructure.clients.order_book_client.kraken_shared_connection import \
+    KrakenSharedConnection
 from app.infrastructure.clients.order_book_client.schemas.common import (
     OrderBookEvent, OrderBookSnapshot, OrderBookUpdate)
 from app.infrastructure.clients.order_book_client.schemas.kraken import (
-    KrakenOrder, KrakenOrderBook, KrakenOrderBookDepthUpdate,
-    KrakenOrderBookSnapshot, KrakenOrdersDict, KrakenSnapshotPayload)
+    KrakenSnapshotPayload, KrakenSubscriptionStatus)
+from app.infrastructure.clients.shared_websocket_connection import get_message
+from app.utilities.fixed_point_utils import (DecimalScale, LevelScale,
+                                             RawLevelValue)
+from app.utilities.json_utils import json_loads
+from app.utilities.metrics_utils import (ORDER_BOOK_CHECKSUM_MISMATCHES,
+                                         ORDER_BOOK_RESYNCS)
+
+
+class KrakenBookMessage(NamedTuple):
+    is_snapshot: bool
+    asks: dict[RawLevelValue, RawLevelValue]
+    bids: dict[RawLevelValue, RawLevelValue]
+    ask_levels: list[KrakenLevel]
+    bid_levels: list[KrakenLevel]
+    checksum: str | None
 
 
 class KrakenWebsocketClient(WebsocketClient):
-    def __init__(self, symbol: str) -> None:
+    def __init__(
+        self,
+        symbol: str,
+        scale: LevelScale = DecimalScale(),
+        connection: KrakenSharedConnection | None = None,
+        recorder: FrameRecorder | None = None,
+        uri: str = settings.KRAKEN_WEBSOCKET_URI,
+    ) -> None:
         super().__init__(symbol=symbol, symbol_splitter="/")
-        self._uri = "wss://ws.kraken.com/"
+        self._scale = scale
+        self._uri = uri
+        # Pair is subscribed on a shared connection when it is set
+        self._connection = connection
+        self._recorder = recorder
 
     async def listen_depth_stream(
         self,
     ) -> AsyncGenerator[OrderBookEvent | None, None]:
+        if self._connection is not None:
+            async for event in self.__listen_shared_depth_stream(
+                self._connection
+            ):
+                yield event
+            return
+
         async with websockets.connect(self._uri) as websocket:
             ws_payload = KrakenSnapshotPayload(pair=[self.symbol])
 
             await websocket.send(ws_payload.model_dump_json())
 
-            async for message in websocket:
-                body = self.__deserialize_message(message=message)
-
-                match body:
-                    case KrakenOrderBookSnapshot():
-                        yield OrderBookSnapshot(
-                            a={
-                                order.price: order.volume
-                                for order in body.orders.a
-                            },
-                            b={
-                                order.price: order.volume
-                                for order in body.orders.b
-                            },
-                        )
-                    case KrakenOrderBookDepthUpdate():
-                        yield OrderBookUpdate(
-                            a={
-                                order.price: order.volume
-                                for order in body.orders.a
-                            },
-                            b={
-                                order.price: order.volume
-                                for order in body.orders.b
-                            },
+            async def resubscribe() -> None:
+                await websocket.send(
+                    ws_payload.model_copy(
+                        update={"event": "unsubscribe"}
+                    ).model_dump_json()
+                )
+                await websocket.send(ws_payload.model_dump_json())
+
+            async for event in self.__process_messages(
+                record_frames(websocket, self._recorder), resubscribe
+            ):
+                yield event
+
+    async def listen_frames(
+        self, frames: AsyncIterable[str | bytes]
+    ) -> AsyncGenerator[OrderBookEvent | None, None]:
+        """
+        Parses frames which were not received by the client, like recorded
+        ones. Books failing the checksum verification are skipped until the
+        next snapshot, as they can't be resubscribed.
+        """
+
+        async def resubscribe() -> None:
+            pass
+
+        async for event in self.__process_messages(frames, resubscribe):
+            yield event
+
+    async def __listen_shared_depth_stream(
+        self, connection: KrakenSharedConnection
+    ) -> AsyncGenerator[OrderBookEvent | None, None]:
+        queue = connection.subscribe(self.symbol, recorder=self._recorder)
+
+        async def read_messages() -> AsyncIterator[Any]:
+            while True:
+                yield await get_message(queue)
+
+        async def resubscribe() -> None:
+            await connection.resubscribe(self.symbol)
+
+        try:
+            async for event in self.__process_messages(
+                read_messages(), resubscribe
+            ):
+                yield event
+        finally:
+            connection.unsubscribe(self.symbol, queue)
+
+    async def __process_messages(
+        self,
+        messages: AsyncIterable[Any],
+        resubscribe: Callable[[], Awaitable[None]],
+    ) -> AsyncGenerator[OrderBookEvent | None, None]:
+        checksum_book = KrakenChecksumBook(
+            depth=KrakenSnapshotPayload().subscription["depth"]
+        )
+        # Updates are dropped until the snapshot of a resubscription
+        is_resubscribing = False
+
+        async for message in messages:
+            book_message = self.__deserialize_message(message=message)
+
+            match book_message:
+                case KrakenBookMessage(is_snapshot=True):
+                    checksum_book.apply_snapshot(
+                        book_message.ask_levels, book_message.bid_levels
+                    )
+                    is_resubscribing = False
+
+                    yield OrderBookSnapshot(
+                        a=book_message.asks, b=book_message.bids
+                    )
+                case KrakenBookMessage() if not is_resubscribing:
+                    (
+                        removed_ask_prices,
+                        removed_bid_prices,
+                    ) = checksum_book.apply_update(
+                        book_message.ask_levels, book_message.bid_levels
+                    )
+
+                    if checksum_book.checksum() != book_message.checksum:
+                        logging.warning(
+                            f"Kraken book checksum mismatch, resubscribing [symbol={self.symbol}]"
                         )
+                        ORDER_BOOK_CHECKSUM_MISMATCHES.labels(
+                            exchange="KRAKEN", symbol=self.symbol
+                        ).inc()
+                        ORDER_BOOK_RESYNCS.labels(
+                            exchange="KRAKEN", symbol=self.symbol
+                        ).inc()
 
-                yield None
+                        # Only the book subscription of the pair is
+                        # renewed, Kraken sends a new snapshot right after
+                        await resubscribe()
+                        is_resubscribing = True
+                        continue
+
+                    # Levels out of the subscribed depth are removed
+                    for price in removed_ask_prices:
+                        book_message.asks[price] = 0
+                    for price in removed_bid_prices:
+                        book_message.bids[price] = 0
+
+                    yield OrderBookUpdate(
+                        a=book_message.asks, b=book_message.bids
+                    )
+
+            yield None
 
     def __deserialize_message(
         self,
-        message: Union[str, bytes],
-    ) -> KrakenOrderBook | None:
+        message: Union[str, bytes, list, dict],
+    ) -> KrakenBookMessage | None:
         try:
             if message is None:
                 return None
 
-            body = json.loads(message)
+            # Messages of shared connections are already decoded
+            body = (
+                json_loads(message)
+                if isinstance(message, (str, bytes))
+                else message
+            )
 
-            if type(body) is list and len(body) == 4:
-                if "as" in body[1] or "bs" in body[1]:
-                    return self.__convert_to_order_book_snapshot(body=body)
+            if type(body) is list and len(body) in (4, 5):
+                # Updates of both sides come in two separate objects
+                payload = body[1] if len(body) == 4 else body[1] | body[2]
 
-                if "a" in body[1] or "b" in body[1]:
-                    return self.__convert_to_order_book_update(body=body)
+                if "as" in payload or "bs" in payload:
+                    return self.__convert_to_book_message(
+                        payload.get("as", []), payload.get("bs", []), None
+                    )
+
+                if "a" in payload or "b" in payload:
+                    return self.__convert_to_book_message(
+                        payload.get("a", []),
+                        payload.get("b", []),
+                        payload["c"],
+                    )
+            elif type(body) is dict:
+                self.__handle_control_message(body)
         except Exception as err:
             logging.exception(
                 exc_info=err, msg="Error occurred in Kraken collector"
@@ -77,62 +212,50 @@ class KrakenWebsocketClient(WebsocketClient):
 
         return None
 
-    def __convert_to_order_book_snapshot(
-        self, body: list
-    ) -> KrakenOrderBookSnapshot:
-        asks = [
-            KrakenOrder(price=price, volume=volume, timestamp=timestamp)
-            for price, volume, timestamp in body[1]["as"]
-        ]
-
-        bids = [
-            KrakenOrder(price=price, volume=volume, timestamp=timestamp)
-            for price, volume, timestamp in body[1]["bs"]
-        ]
-
-        return KrakenOrderBookSnapshot(
-            channel_id=body[0],
-            orders=KrakenOrdersDict(a=asks, b=bids),
-            channel_name=body[2],
-            pair=body[3],
-        )
+    def __convert_to_book_message(
+        self, raw_asks: list, raw_bids: list, checksum: str | None
+    ) -> KrakenBookMessage:
+        """
+        Parses the levels straight from the decoded message, in one pass
+        for both the book event and the checksum verification. Republished
+        levels (flagged "r") carry the current volume of a level and are
+        applied like the others, as checksums count them.
+        """
+        parse_price = self._scale.parse_price
+        parse_quantity = self._scale.parse_quantity
+        asks: dict[RawLevelValue, RawLevelValue] = {}
+        bids: dict[RawLevelValue, RawLevelValue] = {}
+        ask_levels: list[KrakenLevel] = []
+        bid_levels: list[KrakenLevel] = []
 
-    def __convert_to_order_book_update(
-        self, body: list
-    ) -> KrakenOrderBookDepthUpdate:
-        asks = []
-        bids = []
-
-        if "a" in body[1]:
-            for order in body[1]["a"]:
-                if len(order) == 4 and order[3] == "r":
-                    continue
-
-                asks.append(
-                    KrakenOrder(
-                        price=order[0],
-                        volume=order[1],
-                        timestamp=order[2],
-                    )
+        for raw_levels, levels, checksum_levels in (
+            (raw_asks, asks, ask_levels),
+            (raw_bids, bids, bid_levels),
+        ):
+            for raw_level in raw_levels:
+                price = parse_price(raw_level[0])
+                volume = parse_quantity(raw_level[1])
+                levels[price] = volume
+                checksum_levels.append(
+                    (price, volume, raw_level[0], raw_level[1])
                 )
 
-        if "b" in body[1]:
-            for order in body[1]["b"]:
-                if len(order) == 4 and order[3] == "r":
-                    continue
+        return KrakenBookMessage(
+            is_snapshot=checksum is None,
+            asks=asks,
+            bids=bids,
+            ask_levels=ask_levels,
+            bid_levels=bid_levels,
+            checksum=checksum,
+        )
 
-                bids.append(
-                    KrakenOrder(
-                        price=order[0],
-                        volume=order[1],
-                        timestamp=order[2],
-                    )
-                )
+    def __handle_control_message(self, body: dict) -> None:
+        if body.get("event") != "subscriptionStatus":
+            return
 
-        return KrakenOrderBookDepthUpdate(
-            channel_id=body[0],
-            orders=KrakenOrdersDict(a=asks, b=bids),
-            checksum=body[1]["c"],
-            channel_name=body[2],
-            pair=body[3],
-        )
+        subscription_status = KrakenSubscriptionStatus.model_validate(body)
+        if subscription_status.status == "error":
+            logging.error(
+                f"Kraken subscription error {subscription_status.error_message} "
+                f"[symbol={self.symbol}]"
+            )
@@ -1,13 +1,33 @@
 from app.infrastructure.clients.order_book_client.schemas.common import (
     OrderBookSnapshot, OrderBookUpdate)
+from app.utilities.fixed_point_utils import RawLevelValue
 
 
 class BinanceOrderBookSnapshot(OrderBookSnapshot):
-    last_update_id: int
+    __slots__ = ("last_update_id",)
+
+    def __init__(
+        self,
+        b: dict[RawLevelValue, RawLevelValue],
+        a: dict[RawLevelValue, RawLevelValue],
+        last_update_id: int,
+    ) -> None:
+        super().__init__(b=b, a=a)
+        self.last_update_id = last_update_id
 
 
 class BinanceOrderBookDepthUpdate(OrderBookUpdate):
-    event_time: int
-    first_update_id: int
-    final_update_id: int
+    __slots__ = ("event_time", "first_update_id", "final_update_id")
 
+    def __init__(
+        self,
+        b: dict[RawLevelValue, RawLevelValue],
+        a: dict[RawLevelValue, RawLevelValue],
+        event_time: int,
+        first_update_id: int,
+        final_update_id: int,
+    ) -> None:
+        super().__init__(b=b, a=a)
+        self.event_time = event_time
+        self.first_update_id = first_update_id
+        self.final_update_id = final_update_id
@@ -1,4 +1,3 @@
-from abc import ABC
 from enum import Enum
 
 from pydantic import BaseModel
@@ -14,25 +13,13 @@ class CoinbaseEventType(Enum):
     UPDATE = "l2update"
 
 
-class CoinbaseOrderBook(BaseModel, ABC):
-    pass
-
-
 class CoinbaseSnapshotPayload(BaseModel):
     product_ids: list[str] = []
     channels: list[str] = []
     type: str = "subscribe"
 
 
-class CoinbaseOrderBookSnapshot(CoinbaseOrderBook):
-    type: str
-    product_id: str
-    bids: list
-    asks: list
-
-
-class CoinbaseOrderBookDepthUpdate(CoinbaseOrderBook):
+class CoinbaseErrorMessage(BaseModel):
     type: str
-    product_id: str
-    time: str
-    changes: list
+    message: str
+    reason: str | None = None
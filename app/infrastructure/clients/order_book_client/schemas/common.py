@@ -1,25 +1,72 @@
 from abc import ABC
 from dataclasses import dataclass
+from typing import Any, ClassVar
 
-from _decimal import Decimal
-
-from app.infrastructure.clients.common import Event, EventTypeEnum
+from app.infrastructure.clients.common import EventTypeEnum
+from app.utilities.fixed_point_utils import RawLevelValue
+from app.utilities.order_book_utils import OrderBookSide
 
 
 @dataclass
 class OrderBook(ABC):
-    a: dict[Decimal, Decimal]
-    b: dict[Decimal, Decimal]
+    a: OrderBookSide
+    b: OrderBookSide
+
+    def __post_init__(self) -> None:
+        # Asks are kept from the lowest price, bids from the highest one
+        if not isinstance(self.a, OrderBookSide):
+            self.a = OrderBookSide(self.a)
+        if not isinstance(self.b, OrderBookSide):
+            self.b = OrderBookSide(self.b, is_descending=True)
+
+
+class OrderBookEvent:
+    """
+    Book event passed from collectors to the processor.
+
+    Events are plain slotted objects instead of pydantic models, as one is
+    created for every depth message and its levels are already parsed.
+    """
+
+    __slots__ = ("b", "a")
 
+    event_type: ClassVar[EventTypeEnum]
 
-class OrderBookEvent(Event):
-    b: dict[Decimal, Decimal]
-    a: dict[Decimal, Decimal]
+    def __init__(
+        self,
+        b: dict[RawLevelValue, RawLevelValue],
+        a: dict[RawLevelValue, RawLevelValue],
+    ) -> None:
+        self.b = b
+        self.a = a
+
+    def _fields(self) -> dict[str, Any]:
+        return {
+            name: getattr(self, name)
+            for cls in reversed(type(self).__mro__)
+            for name in getattr(cls, "__slots__", ())
+        }
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and (
+            self._fields() == other._fields()  # type: ignore[attr-defined]
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={value!r}" for name, value in self._fields().items()
+        )
+
+        return f"{type(self).__name__}({fields})"
 
 
 class OrderBookSnapshot(OrderBookEvent):
-    event_type: EventTypeEnum = EventTypeEnum.INIT
+    __slots__ = ()
+
+    event_type = EventTypeEnum.INIT
 
 
 class OrderBookUpdate(OrderBookEvent):
-    event_type: EventTypeEnum = EventTypeEnum.UPDATE
+    __slots__ = ()
+
+    event_type = EventTypeEnum.UPDATE
@@ -1,34 +1,7 @@
 from enum import Enum
 from typing import Dict
 
-from _decimal import Decimal
-from pydantic import BaseModel
-
-
-class KrakenOrder(BaseModel):
-    price: Decimal
-    volume: Decimal
-    timestamp: Decimal
-
-
-class KrakenOrdersDict(BaseModel):
-    a: list[KrakenOrder]
-    b: list[KrakenOrder]
-
-
-class KrakenOrderBook(BaseModel):
-    channel_id: int
-    orders: KrakenOrdersDict
-    channel_name: str
-    pair: str
-
-
-class KrakenOrderBookSnapshot(KrakenOrderBook):
-    pass
-
-
-class KrakenOrderBookDepthUpdate(KrakenOrderBook):
-    checksum: str
+from pydantic import BaseModel, Field
 
 
 class KrakenSnapshotPayload(BaseModel):
@@ -37,6 +10,13 @@ class KrakenSnapshotPayload(BaseModel):
     event: str = "subscribe"
 
 
+class KrakenSubscriptionStatus(BaseModel):
+    event: str
+    status: str
+    pair: str | None = None
+    error_message: str | None = Field(default=None, alias="errorMessage")
+
+
 class KrakenEventType(Enum):
     INIT = "init"
     UPDATE = "update"
@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+import websockets
+from websockets import WebSocketClientProtocol
+
+from app.infrastructure.clients.frame_recorder import FrameRecorder
+from app.utilities.json_utils import json_loads
+from app.utilities.metrics_utils import (COLLECTOR_CONNECT_LATENCY,
+                                         COLLECTOR_RECONNECTS)
+from app.utilities.reconnect_utils import ReconnectPolicy, get_circuit_breaker
+
+
+class SharedConnectionClosedError(Exception):
+    """
+    Delivered to every subscription when the shared socket is closed, as
+    the messages of the topics sent until the reconnection are lost.
+    """
+
+    pass
+
+
+async def get_message(queue: asyncio.Queue[Any]) -> Any:
+    """
+    Returns the next message of a subscription queue, raising if the
+    shared socket was closed before it.
+    """
+    message = await queue.get()
+
+    if isinstance(message, SharedConnectionClosedError):
+        raise message
+
+    return message
+
+
+class SharedWebsocketConnection(ABC):
+    """
+    Websocket connection shared by the subscriptions of many pairs.
+
+    Every message is routed to the queue of its topic (stream, product or
+    pair). The connection is opened with the first subscription, closed
+    after the last one and reopened with all current subscriptions after a
+    failure, with the backoff and circuit breaker of the exchange host, as
+    collectors are reconnected. Subscribers are notified when the socket is
+    closed, so that they resync their books. Subscription changes are sent
+    in batches, at most once per control message interval, to respect
+    exchange rate limits.
+    """
+
+    # Whether topics passed to _get_uri are subscribed by connecting
+    _are_uri_topics_subscribed = False
+    # Label of the connection metrics
+    exchange_name = "UNKNOWN"
+    # Host whose circuit breaker is shared with the collectors
+    host = "unknown"
+    reconnect_policy = ReconnectPolicy()
+
+    def __init__(
+        self,
+        uri: str,
+        control_message_interval: float = 0.25,
+    ):
+        self._uri = uri
+        # Kept across connection tasks, so that resubscribing after the
+        # last unsubscription doesn't reset the backoff
+        self._failed_attempts_count = 0
+        self._control_message_interval = control_message_interval
+        self._queues: dict[str, asyncio.Queue[Any]] = {}
+        self._recorders: dict[str, FrameRecorder] = {}
+        self._subscribed_topics: set[str] = set()
+        self._subscriptions_changed = asyncio.Event()
+        self._connection_task: asyncio.Task | None = None
+        self._websocket: WebSocketClientProtocol | None = None
+
+    def subscribe(
+        self, topic: str, recorder: FrameRecorder | None = None
+    ) -> asyncio.Queue[Any]:
+        queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._queues[topic] = queue
+        if recorder is not None:
+            self._recorders[topic] = recorder
+        self._subscriptions_changed.set()
+
+        if self._connection_task is None or self._connection_task.done():
+            self._connection_task = asyncio.create_task(self.__run())
+
+        return queue
+
+    def unsubscribe(self, topic: str, queue: asyncio.Queue[Any]) -> bool:
+        """
+        Removes the subscription of the queue, returns False when the topic
+        was subscribed again with another queue in the meantime, which is
+        then left in place.
+        """
+        if self._queues.get(topic) is not queue:
+            return False
+
+        del self._queues[topic]
+        self._recorders.pop(topic, None)
+
+        if not self._queues and self._connection_task is not None:
+            self._connection_task.cancel()
+            self._connection_task = None
+            return True
+
+        self._subscriptions_changed.set()
+
+        return True
+
+    async def resubscribe(self, topic: str) -> None:
+        """
+        Renews the subscription of the topic on the live connection, which
+        makes exchanges send a new snapshot for it.
+        """
+        websocket = self._websocket
+        if websocket is None or topic not in self._subscribed_topics:
+            return
+
+        await self._send_unsubscribe(websocket, [topic])
+        await self._send_subscribe(websocket, [topic])
+
+    @property
+    def subscriptions_count(self) -> int:
+        return len(self._queues)
+
+    async def __run(self) -> None:
+        circuit_breaker = get_circuit_breaker(self.host)
+
+        while self._queues:
+            topics = list(self._queues)
+            await circuit_breaker.wait()
+
+            started_at = time.monotonic()
+            is_connected = False
+
+            try:
+                async with websockets.connect(
+                    self._get_uri(topics)
+                ) as websocket:
+                    is_connected = True
+                    circuit_breaker.record_success()
+                    COLLECTOR_CONNECT_LATENCY.labels(
+                        exchange=self.exchange_name
+                    ).observe(time.monotonic() - started_at)
+
+                    self._websocket = websocket
+                    self._on_connect()
+                    self._subscribed_topics = (
+                        set(topics)
+                        if self._are_uri_topics_subscribed
+                        else set()
+                    )
+                    self._subscriptions_changed.set()
+                    subscriptions_task = asyncio.create_task(
+                        self.__sync_subscriptions(websocket)
+                    )
+
+                    try:
+                        async for message in websocket:
+                            self.__dispatch(message)
+                    finally:
+                        self._websocket = None
+                        subscriptions_task.cancel()
+                        self.__notify_closed()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                logging.exception(
+                    exc_info=err,
+                    msg=f"Shared connection to {self._uri} will be relaunched",
+                )
+
+            # A connection which was alive for a while is reopened right
+            # away, failed or short-lived ones are backed off
+            if (
+                is_connected
+                and time.monotonic() - started_at
+                >= self.reconnect_policy.stable_stream_time
+            ):
+                self._failed_attempts_count = 0
+                delay = 0.0
+            else:
+                if not is_connected:
+                    circuit_breaker.record_failure()
+                self._failed_attempts_count += 1
+                delay = self.reconnect_policy.get_delay(
+                    self._failed_attempts_count
+                )
+
+            for topic in self._queues:
+                COLLECTOR_RECONNECTS.labels(
+                    exchange=self.exchange_name, symbol=topic
+                ).inc()
+            await asyncio.sleep(delay)
+
+    async def __sync_subscriptions(
+        self, websocket: WebSocketClientProtocol
+    ) -> None:
+        while True:
+            await self._subscriptions_changed.wait()
+            self._subscriptions_changed.clear()
+
+            new_topics = [
+                topic
+                for topic in self._queues
+                if topic not in self._subscribed_topics
+            ]
+            removed_topics = [
+                topic
+                for topic in self._subscribed_topics
+                if topic not in self._queues
+            ]
+
+            if new_topics:
+                await self._send_subscribe(websocket, new_topics)
+                self._subscribed_topics.update(new_topics)
+            if removed_topics:
+                await self._send_unsubscribe(websocket, removed_topics)
+                self._subscribed_topics.difference_update(removed_topics)
+
+            await asyncio.sleep(self._control_message_interval)
+
+    def __notify_closed(self) -> None:
+        for queue in self._queues.values():
+            queue.put_nowait(
+                SharedConnectionClosedError(
+                    f"Shared connection to {self._uri} was closed"
+                )
+            )
+
+    def __dispatch(self, message: str | bytes) -> None:
+        received_at = time.time_ns()
+
+        try:
+            routed_message = self._route(json_loads(message))
+        except Exception as err:
+            logging.exception(
+                exc_info=err,
+                msg=f"Error occurred in shared connection to {self._uri}",
+            )
+            return
+
+        if routed_message is None:
+            return
+
+        topic, payload = routed_message
+        queue = self._queues.get(topic)
+        if queue is not None:
+            queue.put_nowait(payload)
+
+        # Frames are recorded as received, before decoding
+        recorder = self._recorders.get(topic)
+        if recorder is not None:
+            recorder.record(message, received_at=received_at)
+
+    def _get_uri(self, topics: list[str]) -> str:
+        return self._uri
+
+    def _on_connect(self) -> None:
+        """
+        Resets the state bound to the previous socket, as topics are
+        subscribed anew on every socket.
+        """
+        pass
+
+    @abstractmethod
+    async def _send_subscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def _send_unsubscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def _route(self, message: Any) -> tuple[str, Any] | None:
+        """
+        Returns the topic of the message and the payload to deliver, or
+        None for messages which are not delivered to any subscription.
+        """
+        pass
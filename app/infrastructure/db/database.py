@@ -2,6 +2,7 @@ import logging
 from collections.abc import AsyncIterator, Iterator
 from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
+from typing import Any, cast
 from uuid import UUID, uuid4
 
 from sqlalchemy import DateTime, create_engine, text
@@ -28,8 +29,79 @@ async_engine = create_async_engine(
 engine = create_engine(DB_CONNECTION_STRING)
 
 
+class DummyResult:
+    """
+    Result of every statement executed in the dummy persistence mode,
+    which finds nothing.
+    """
+
+    def scalars(self) -> "DummyResult":
+        return self
+
+    def all(self) -> list[Any]:
+        return []
+
+    def scalar_one_or_none(self) -> None:
+        return None
+
+    def where(self, *_: Any) -> "DummyResult":
+        return self
+
+    def order_by(self, *_: Any) -> "DummyResult":
+        return self
+
+    def limit(self, _: int) -> "DummyResult":
+        return self
+
+
+class DummyAsyncSession:
+    """
+    Session of the dummy persistence mode, which discards all writes so
+    that the collecting pipeline can be measured without a database.
+    """
+
+    def add(self, _: Any) -> None:
+        pass
+
+    def add_all(self, _: Any) -> None:
+        pass
+
+    async def execute(self, *_: Any) -> DummyResult:
+        return DummyResult()
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class DummySession:
+    def query(self, *_: Any) -> DummyResult:
+        return DummyResult()
+
+    def expunge_all(self) -> None:
+        pass
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
 @asynccontextmanager
 async def get_async_db() -> AsyncIterator[AsyncSession]:
+    if settings.DB_PERSISTENCE_MODE == "dummy":
+        yield cast(AsyncSession, DummyAsyncSession())
+        return
+
     session_class = async_sessionmaker(
         async_engine,
         expire_on_commit=False,
@@ -47,6 +119,10 @@ async def get_async_db() -> AsyncIterator[AsyncSession]:
 
 @contextmanager
 def get_sync_db() -> Iterator[Session]:
+    if settings.DB_PERSISTENCE_MODE == "dummy":
+        yield cast(Session, DummySession())
+        return
+
     session_class = sessionmaker(bind=engine)
     session = session_class()
     try:
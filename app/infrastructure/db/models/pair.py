@@ -1,12 +1,15 @@
+from typing import Literal
 from uuid import UUID
 
 from _decimal import Decimal
-from sqlalchemy import DECIMAL, ForeignKey, String
+from sqlalchemy import DECIMAL, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID as pg_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.db.database import BaseModel
 
+LiteralOrderBookBackend = Literal["DICT", "NUMPY"]
+
 
 class PairModel(BaseModel):
     __tablename__ = "pairs"
@@ -16,3 +19,19 @@ class PairModel(BaseModel):
     exchange_id: Mapped[UUID] = mapped_column(
         pg_UUID(as_uuid=True), ForeignKey("exchanges.id"), nullable=False
     )
+    # Enables fixed-point order book when both precisions are set
+    price_precision: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    quantity_precision: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
+    # In-memory order book depth limits, in levels and in % from mid price
+    max_depth_levels: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
+    max_depth_percentage: Mapped[Decimal | None] = mapped_column(
+        DECIMAL, nullable=True
+    )
+    # In-memory order book storage, dict backend when not set
+    order_book_backend: Mapped[LiteralOrderBookBackend | None] = mapped_column(
+        String, nullable=True
+    )
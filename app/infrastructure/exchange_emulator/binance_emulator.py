@@ -0,0 +1,165 @@
+import json
+import time
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from websockets.datastructures import Headers
+from websockets.legacy.server import HTTPResponse
+
+from app.infrastructure.exchange_emulator.emulated_book import (
+    BookChange, EmulatedBook, format_level_value)
+from app.infrastructure.exchange_emulator.exchange_emulator import (
+    EmulatorConnection, ExchangeEmulator, FaultInjection, create_json_response)
+
+DEPTH_STREAM_SUFFIX = "@depth"
+
+
+def get_depth_request_weight(limit: int) -> int:
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+
+    return 250
+
+
+class BinanceEmulator(ExchangeEmulator):
+    """
+    Emulates the Binance depth streams, raw (/ws/<symbol>@depth) and
+    combined (/stream?streams=...) with SUBSCRIBE and UNSUBSCRIBE requests,
+    along with the /api/v3/depth snapshots and their request weight.
+    """
+
+    def __init__(
+        self,
+        books: list[EmulatedBook],
+        faults: FaultInjection = FaultInjection(),
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = None,
+    ):
+        super().__init__(
+            books=books, faults=faults, host=host, port=port, seed=seed
+        )
+        # Request weight used in the current minute
+        self._weight_minute = 0
+        self._used_weight = 0
+
+    def _format_symbol(self, symbol: str) -> str:
+        return symbol.replace("/", "")
+
+    async def _process_request(
+        self, path: str, request_headers: Headers
+    ) -> HTTPResponse | None:
+        url = urlsplit(path)
+        if url.path != "/api/v3/depth":
+            return None
+
+        query = parse_qs(url.query)
+        limit = int(query.get("limit", ["100"])[0])
+        book = self._get_book(query.get("symbol", [""])[0])
+        headers = {"x-mbx-used-weight-1m": str(self.__use_weight(limit))}
+
+        if book is None:
+            return create_json_response(
+                HTTPStatus.BAD_REQUEST,
+                json.dumps({"code": -1121, "msg": "Invalid symbol."}).encode(),
+                headers,
+            )
+
+        snapshot = {
+            "lastUpdateId": book.update_id,
+            "bids": self.__encode_levels(book.top_bids(limit)),
+            "asks": self.__encode_levels(book.top_asks(limit)),
+        }
+
+        return create_json_response(
+            HTTPStatus.OK, json.dumps(snapshot).encode(), headers
+        )
+
+    def _on_connect(self, connection: EmulatorConnection) -> None:
+        url = urlsplit(connection.websocket.path)
+
+        if url.path.startswith("/ws/"):
+            self.__subscribe_stream(
+                connection, url.path[len("/ws/") :], is_combined=False
+            )
+        elif url.path == "/stream":
+            for stream in (
+                parse_qs(url.query).get("streams", [""])[0].split("/")
+            ):
+                self.__subscribe_stream(connection, stream, is_combined=True)
+
+    def _on_message(
+        self, connection: EmulatorConnection, message: Any
+    ) -> None:
+        streams = message.get("params", [])
+
+        match message.get("method"):
+            case "SUBSCRIBE":
+                for stream in streams:
+                    self.__subscribe_stream(
+                        connection, stream, is_combined=True
+                    )
+            case "UNSUBSCRIBE":
+                for stream in streams:
+                    self._unsubscribe(
+                        connection, self.__get_stream_symbol(stream)
+                    )
+
+        connection.send(json.dumps({"result": None, "id": message.get("id")}))
+
+    def _encode_change(self, book: EmulatedBook, change: BookChange) -> Any:
+        return json.dumps(
+            {
+                "e": "depthUpdate",
+                "E": int(change.changed_at * 1000),
+                "s": book.symbol.replace("/", ""),
+                "U": change.update_id,
+                "u": change.update_id,
+                "b": self.__encode_levels(change.bids.items()),
+                "a": self.__encode_levels(change.asks.items()),
+            }
+        )
+
+    def _frame_update(self, encoded_change: Any, topic: Any) -> str | None:
+        # Topics of combined streams are their stream names
+        if topic is None:
+            return str(encoded_change)
+
+        return f'{{"stream":"{topic}","data":{encoded_change}}}'
+
+    def __subscribe_stream(
+        self, connection: EmulatorConnection, stream: str, is_combined: bool
+    ) -> None:
+        if not stream.endswith(DEPTH_STREAM_SUFFIX):
+            return
+
+        self._subscribe(
+            connection,
+            self.__get_stream_symbol(stream),
+            stream if is_combined else None,
+        )
+
+    def __get_stream_symbol(self, stream: str) -> str:
+        return stream.removesuffix(DEPTH_STREAM_SUFFIX).upper()
+
+    def __use_weight(self, limit: int) -> int:
+        minute = int(time.time() // 60)
+        if self._weight_minute != minute:
+            self._weight_minute = minute
+            self._used_weight = 0
+
+        self._used_weight += get_depth_request_weight(limit)
+
+        return self._used_weight
+
+    @staticmethod
+    def __encode_levels(levels: Any) -> list[list[str]]:
+        return [
+            [format_level_value(price), format_level_value(quantity)]
+            for price, quantity in levels
+        ]
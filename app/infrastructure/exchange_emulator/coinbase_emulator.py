@@ -0,0 +1,143 @@
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from app.infrastructure.exchange_emulator.emulated_book import (
+    BookChange, EmulatedBook, format_level_value)
+from app.infrastructure.exchange_emulator.exchange_emulator import (
+    EmulatorConnection, ExchangeEmulator)
+
+
+class CoinbaseEmulator(ExchangeEmulator):
+    """
+    Emulates the Coinbase ws-feed level2 channels: a snapshot of the whole
+    book on subscribe followed by l2update messages.
+    """
+
+    def _format_symbol(self, symbol: str) -> str:
+        return symbol.replace("/", "-")
+
+    def _on_message(
+        self, connection: EmulatorConnection, message: Any
+    ) -> None:
+        product_ids = message.get("product_ids", [])
+
+        match message.get("type"):
+            case "subscribe":
+                unknown_product_ids = [
+                    product_id
+                    for product_id in product_ids
+                    if self._get_book(product_id) is None
+                ]
+                if unknown_product_ids:
+                    self.__send_error(
+                        connection,
+                        f"{', '.join(unknown_product_ids)} is not a valid product",
+                    )
+                    return
+
+                self.__send_subscriptions(
+                    connection,
+                    message.get("channels", []),
+                    list(connection.subscriptions) + product_ids,
+                )
+                for product_id in product_ids:
+                    self.__subscribe_product(connection, product_id)
+            case "unsubscribe":
+                for product_id in product_ids:
+                    self._unsubscribe(connection, product_id)
+
+                self.__send_subscriptions(
+                    connection,
+                    message.get("channels", []),
+                    list(connection.subscriptions),
+                )
+            case _:
+                self.__send_error(
+                    connection,
+                    "Type has to be either subscribe or unsubscribe",
+                )
+
+    def _encode_change(self, book: EmulatedBook, change: BookChange) -> Any:
+        changes = [
+            ["sell", format_level_value(price), format_level_value(size)]
+            for price, size in change.asks.items()
+        ] + [
+            ["buy", format_level_value(price), format_level_value(size)]
+            for price, size in change.bids.items()
+        ]
+
+        return json.dumps(
+            {
+                "type": "l2update",
+                "product_id": self._format_symbol(book.symbol),
+                "changes": changes,
+                "time": datetime.fromtimestamp(
+                    change.changed_at, tz=timezone.utc
+                ).isoformat(),
+            }
+        )
+
+    def _frame_update(self, encoded_change: Any, topic: Any) -> str | None:
+        return str(encoded_change)
+
+    def __subscribe_product(
+        self, connection: EmulatorConnection, product_id: str
+    ) -> None:
+        book = self._get_book(product_id)
+        if book is None:
+            return
+
+        # The snapshot is queued before any update of the subscription
+        self._subscribe(connection, product_id, None)
+        connection.send(
+            json.dumps(
+                {
+                    "type": "snapshot",
+                    "product_id": product_id,
+                    "asks": self.__encode_levels(
+                        book.top_asks(len(book.asks))
+                    ),
+                    "bids": self.__encode_levels(
+                        book.top_bids(len(book.bids))
+                    ),
+                }
+            )
+        )
+
+    @staticmethod
+    def __send_subscriptions(
+        connection: EmulatorConnection,
+        channels: list[str],
+        product_ids: list[str],
+    ) -> None:
+        connection.send(
+            json.dumps(
+                {
+                    "type": "subscriptions",
+                    "channels": [
+                        {"name": channel, "product_ids": product_ids}
+                        for channel in channels
+                    ],
+                }
+            )
+        )
+
+    @staticmethod
+    def __send_error(connection: EmulatorConnection, reason: str) -> None:
+        connection.send(
+            json.dumps(
+                {
+                    "type": "error",
+                    "message": "Failed to subscribe",
+                    "reason": reason,
+                }
+            )
+        )
+
+    @staticmethod
+    def __encode_levels(levels: Any) -> list[list[str]]:
+        return [
+            [format_level_value(price), format_level_value(size)]
+            for price, size in levels
+        ]
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from decimal import Decimal
+from typing import AsyncIterable, Callable, NamedTuple, cast
+
+from app.infrastructure.clients.order_book_client.schemas.common import (
+    OrderBookEvent, OrderBookSnapshot)
+
+
+class BookChange(NamedTuple):
+    update_id: int
+    # Changed levels as sent by exchanges, a zero quantity removes a level
+    asks: dict[Decimal, Decimal]
+    bids: dict[Decimal, Decimal]
+    changed_at: float
+
+
+def format_level_value(value: Decimal) -> str:
+    # Exchanges never send values in the scientific notation
+    return format(value, "f")
+
+
+class EmulatedBook:
+    """
+    Order book of an emulated pair, driven by order book events with
+    decimal levels, like the ones of synthetic or replay collectors.
+
+    Every change is numbered like Binance update ids and passed to the
+    listeners, which encode it for their subscribers. Snapshots of the
+    source after the first one are passed on as the changes they make.
+    """
+
+    def __init__(
+        self, symbol: str, events: AsyncIterable[OrderBookEvent | None]
+    ):
+        self.symbol = symbol
+        self._events = events
+        self.asks: dict[Decimal, Decimal] = {}
+        self.bids: dict[Decimal, Decimal] = {}
+        self.update_id = 0
+        self._listeners: set[Callable[[BookChange], None]] = set()
+        self._is_ready = asyncio.Event()
+
+    def add_listener(self, listener: Callable[[BookChange], None]) -> None:
+        self._listeners.add(listener)
+
+    def remove_listener(self, listener: Callable[[BookChange], None]) -> None:
+        self._listeners.discard(listener)
+
+    async def wait_ready(self) -> None:
+        await self._is_ready.wait()
+
+    def top_asks(self, limit: int) -> list[tuple[Decimal, Decimal]]:
+        return sorted(self.asks.items())[:limit]
+
+    def top_bids(self, limit: int) -> list[tuple[Decimal, Decimal]]:
+        return sorted(self.bids.items(), reverse=True)[:limit]
+
+    async def run(self) -> None:
+        async for event in self._events:
+            if event is None:
+                continue
+
+            if isinstance(event, OrderBookSnapshot):
+                asks = self.__get_snapshot_changes(self.asks, event.a)
+                bids = self.__get_snapshot_changes(self.bids, event.b)
+            else:
+                # Events of a decimal scale carry decimal levels
+                asks = cast(dict[Decimal, Decimal], dict(event.a))
+                bids = cast(dict[Decimal, Decimal], dict(event.b))
+
+            self.__apply(asks, bids)
+            self._is_ready.set()
+
+        logging.info(f"Emulated book feed finished [symbol={self.symbol}]")
+
+    def __apply(
+        self, asks: dict[Decimal, Decimal], bids: dict[Decimal, Decimal]
+    ) -> None:
+        for levels, changes in ((self.asks, asks), (self.bids, bids)):
+            for price, quantity in changes.items():
+                if quantity == 0:
+                    levels.pop(price, None)
+                else:
+                    levels[price] = quantity
+
+        self.update_id += 1
+        change = BookChange(
+            update_id=self.update_id,
+            asks=asks,
+            bids=bids,
+            changed_at=time.time(),
+        )
+
+        for listener in list(self._listeners):
+            listener(change)
+
+    @staticmethod
+    def __get_snapshot_changes(
+        levels: dict[Decimal, Decimal], snapshot_levels: dict
+    ) -> dict[Decimal, Decimal]:
+        changes = {
+            price: Decimal(0)
+            for price in levels
+            if price not in snapshot_levels
+        }
+        changes.update(
+            (price, quantity)
+            for price, quantity in snapshot_levels.items()
+            if levels.get(price) != quantity
+        )
+
+        return changes
@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any, Callable
+
+import websockets
+from websockets import WebSocketServerProtocol
+from websockets.datastructures import Headers
+from websockets.legacy.server import HTTPResponse
+
+from app.infrastructure.exchange_emulator.emulated_book import (BookChange,
+                                                                EmulatedBook)
+from app.utilities.json_utils import json_loads
+
+
+@dataclass(frozen=True)
+class FaultInjection:
+    """
+    Faults injected by exchange emulators into the streams they send.
+    """
+
+    # Probability of closing the connection before sending an update
+    disconnect_probability: float = 0.0
+    # Probability of dropping an update, which makes a sequence gap
+    gap_probability: float = 0.0
+    # Delay before sending every frame, which makes the stream lag
+    send_delay: float = 0.0
+    # Connections with more pending frames are closed as slow consumers,
+    # like exchanges do
+    max_pending_frames: int | None = None
+
+
+class EmulatorConnection:
+    """
+    Client connection of an exchange emulator, with the queue of frames
+    pending to be sent.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocketServerProtocol,
+        faults: FaultInjection,
+        random_generator: random.Random,
+    ):
+        self.websocket = websocket
+        self._faults = faults
+        self._random = random_generator
+        self._frames: asyncio.Queue[str | None] = asyncio.Queue()
+        self._is_closed = False
+        # Topics subscribed by the connection, by their symbol
+        self.subscriptions: dict[str, Any] = {}
+
+    def send(self, frame: str) -> None:
+        if self._is_closed:
+            return
+
+        if (
+            self._faults.max_pending_frames is not None
+            and self._frames.qsize() >= self._faults.max_pending_frames
+        ):
+            logging.info(
+                f"Emulator connection closed as a slow consumer "
+                f"[remote={self.websocket.remote_address}]"
+            )
+            self.close()
+            return
+
+        self._frames.put_nowait(frame)
+
+    def send_update(self, frame: str) -> None:
+        if self._random.random() < self._faults.disconnect_probability:
+            logging.info(
+                f"Emulator connection closed by fault injection "
+                f"[remote={self.websocket.remote_address}]"
+            )
+            self.close()
+            return
+
+        if self._random.random() < self._faults.gap_probability:
+            return
+
+        self.send(frame)
+
+    def close(self) -> None:
+        self._is_closed = True
+        # Pending frames are discarded, like on a broken connection
+        while not self._frames.empty():
+            self._frames.get_nowait()
+        self._frames.put_nowait(None)
+
+    async def run_sender(self) -> None:
+        try:
+            while (frame := await self._frames.get()) is not None:
+                if self._faults.send_delay > 0:
+                    await asyncio.sleep(self._faults.send_delay)
+
+                await self.websocket.send(frame)
+
+            await self.websocket.close()
+        except websockets.ConnectionClosed:
+            pass
+
+
+class ExchangeEmulator(ABC):
+    """
+    Local websocket (and REST) server speaking the protocol of an exchange,
+    which serves emulated books to the exchange clients pointed at it.
+
+    Every book change is encoded once and then framed for every connection
+    subscribed to the book, with faults injected per connection.
+    """
+
+    def __init__(
+        self,
+        books: list[EmulatedBook],
+        faults: FaultInjection = FaultInjection(),
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = None,
+    ):
+        # Books by the symbol formatted like the exchange does
+        self._books = {
+            self._format_symbol(book.symbol): book for book in books
+        }
+        self._faults = faults
+        self._host = host
+        self._port = port
+        self._random = random.Random(seed)
+        self._connections: dict[str, set[EmulatorConnection]] = {
+            symbol: set() for symbol in self._books
+        }
+        self._server: websockets.WebSocketServer | None = None
+        self._book_tasks: list[asyncio.Task] = []
+
+    @property
+    def port(self) -> int:
+        if self._server is None:
+            return self._port
+
+        return int(list(self._server.sockets)[0].getsockname()[1])
+
+    @property
+    def uri(self) -> str:
+        return f"ws://{self._host}:{self.port}"
+
+    @property
+    def http_uri(self) -> str:
+        return f"http://{self._host}:{self.port}"
+
+    async def start(self) -> None:
+        for symbol, book in self._books.items():
+            book.add_listener(self.__create_book_listener(symbol))
+            self._book_tasks.append(asyncio.create_task(book.run()))
+
+        # Books are served once their first snapshot is emulated
+        await asyncio.gather(
+            *(book.wait_ready() for book in self._books.values())
+        )
+
+        self._server = await websockets.serve(
+            self.__handle_connection,
+            self._host,
+            self._port,
+            process_request=self._process_request,
+        )
+        logging.info(f"{type(self).__name__} listening on {self.uri}")
+
+    async def close(self) -> None:
+        for task in self._book_tasks:
+            task.cancel()
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _subscribe(
+        self, connection: EmulatorConnection, symbol: str, topic: Any
+    ) -> bool:
+        """
+        Subscribes the connection to the changes of the book, returns False
+        for unknown symbols.
+        """
+        if symbol not in self._books:
+            return False
+
+        connection.subscriptions[symbol] = topic
+        self._connections[symbol].add(connection)
+
+        return True
+
+    def _unsubscribe(
+        self, connection: EmulatorConnection, symbol: str
+    ) -> None:
+        connection.subscriptions.pop(symbol, None)
+        self._connections.get(symbol, set()).discard(connection)
+
+    def _get_book(self, symbol: str) -> EmulatedBook | None:
+        return self._books.get(symbol)
+
+    async def _process_request(
+        self, path: str, request_headers: Headers
+    ) -> HTTPResponse | None:
+        """
+        Answers REST requests, websocket handshakes go on with None.
+        """
+        return None
+
+    async def __handle_connection(
+        self, websocket: WebSocketServerProtocol
+    ) -> None:
+        connection = EmulatorConnection(websocket, self._faults, self._random)
+        sender_task = asyncio.create_task(connection.run_sender())
+
+        try:
+            self._on_connect(connection)
+
+            async for message in websocket:
+                self._on_message(connection, json_loads(message))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for symbol in list(connection.subscriptions):
+                self._unsubscribe(connection, symbol)
+            connection.close()
+            await asyncio.wait([sender_task], timeout=1)
+            sender_task.cancel()
+
+    def __create_book_listener(
+        self, symbol: str
+    ) -> Callable[[BookChange], None]:
+        book = self._books[symbol]
+        connections = self._connections[symbol]
+
+        def listener(change: BookChange) -> None:
+            if not connections:
+                return
+
+            encoded_change = self._encode_change(book, change)
+            for connection in list(connections):
+                frame = self._frame_update(
+                    encoded_change, connection.subscriptions[symbol]
+                )
+                if frame is not None:
+                    connection.send_update(frame)
+
+        return listener
+
+    def _on_connect(self, connection: EmulatorConnection) -> None:
+        pass
+
+    @abstractmethod
+    def _format_symbol(self, symbol: str) -> str:
+        pass
+
+    @abstractmethod
+    def _on_message(
+        self, connection: EmulatorConnection, message: Any
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def _encode_change(self, book: EmulatedBook, change: BookChange) -> Any:
+        """
+        Encodes the change once for all the subscriptions of the book.
+        """
+        pass
+
+    @abstractmethod
+    def _frame_update(self, encoded_change: Any, topic: Any) -> str | None:
+        """
+        Returns the update frame of the encoded change for a subscription,
+        or None when nothing is sent to it.
+        """
+        pass
+
+
+def create_json_response(
+    status: HTTPStatus, body: bytes, headers: dict[str, str] | None = None
+) -> HTTPResponse:
+    return (
+        status,
+        {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            **(headers or {}),
+        },
+        body,
+    )
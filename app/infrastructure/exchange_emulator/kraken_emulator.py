@@ -0,0 +1,336 @@
+import heapq
+import itertools
+import json
+import time
+import zlib
+from decimal import Decimal
+from typing import Any, NamedTuple
+
+from app.infrastructure.clients.order_book_client.kraken_checksum_book import (
+    KRAKEN_CHECKSUM_LEVELS, to_checksum_string)
+from app.infrastructure.exchange_emulator.emulated_book import (
+    BookChange, EmulatedBook, format_level_value)
+from app.infrastructure.exchange_emulator.exchange_emulator import (
+    EmulatorConnection, ExchangeEmulator, FaultInjection)
+
+KRAKEN_BOOK_DEPTHS = (10, 25, 100, 500, 1000)
+KRAKEN_DELETED_VOLUME = "0.00000000"
+
+
+class KrakenSubscription(NamedTuple):
+    channel_id: int
+    depth: int
+
+
+class KrakenBookView:
+    """
+    Levels of a book within a subscribed depth, as Kraken clients hold
+    them. Kraken sends no deletes for levels pushed out of the depth, but
+    refills the depth when levels within it are deleted.
+    """
+
+    def __init__(self, book: EmulatedBook, depth: int):
+        self.depth = depth
+        self.subscriptions_count = 0
+        # Volume and checksum string of every level by price
+        self.asks: dict[Decimal, tuple[Decimal, str]] = {}
+        self.bids: dict[Decimal, tuple[Decimal, str]] = {}
+
+        for levels, top_levels in (
+            (self.asks, book.top_asks(depth)),
+            (self.bids, book.top_bids(depth)),
+        ):
+            for price, volume in top_levels:
+                levels[price] = (
+                    volume,
+                    self.__get_checksum_string(price, volume),
+                )
+
+    def apply(
+        self, book: EmulatedBook, timestamp: str
+    ) -> tuple[list[list[str]], list[list[str]]]:
+        """
+        Follows the book and returns the ask and bid levels to send.
+        """
+        return (
+            self.__apply_side(
+                self.asks,
+                book.asks,
+                heapq.nsmallest(self.depth, book.asks),
+                timestamp,
+            ),
+            self.__apply_side(
+                self.bids,
+                book.bids,
+                heapq.nlargest(self.depth, book.bids),
+                timestamp,
+            ),
+        )
+
+    def checksum(self) -> str:
+        checksum_string = "".join(
+            [
+                self.asks[price][1]
+                for price in heapq.nsmallest(KRAKEN_CHECKSUM_LEVELS, self.asks)
+            ]
+            + [
+                self.bids[price][1]
+                for price in heapq.nlargest(KRAKEN_CHECKSUM_LEVELS, self.bids)
+            ]
+        )
+
+        return str(zlib.crc32(checksum_string.encode()))
+
+    def __apply_side(
+        self,
+        levels: dict[Decimal, tuple[Decimal, str]],
+        book_levels: dict[Decimal, Decimal],
+        top_prices: list[Decimal],
+        timestamp: str,
+    ) -> list[list[str]]:
+        sent_levels: list[list[str]] = []
+        top_prices_set = set(top_prices)
+
+        for price in list(levels):
+            if price in top_prices_set:
+                continue
+
+            del levels[price]
+            # Levels pushed out of the depth are removed by the clients
+            if price not in book_levels:
+                sent_levels.append(
+                    [
+                        format_level_value(price),
+                        KRAKEN_DELETED_VOLUME,
+                        timestamp,
+                    ]
+                )
+
+        for price in top_prices:
+            volume = book_levels[price]
+            level = levels.get(price)
+            if level is not None and level[0] == volume:
+                continue
+
+            levels[price] = (volume, self.__get_checksum_string(price, volume))
+            sent_levels.append(
+                [
+                    format_level_value(price),
+                    format_level_value(volume),
+                    timestamp,
+                ]
+            )
+
+        return sent_levels
+
+    @staticmethod
+    def __get_checksum_string(price: Decimal, volume: Decimal) -> str:
+        return to_checksum_string(
+            format_level_value(price)
+        ) + to_checksum_string(format_level_value(volume))
+
+
+class KrakenEmulator(ExchangeEmulator):
+    """
+    Emulates the Kraken book channel: subscription statuses, snapshots of
+    the subscribed depth (as/bs) and updates (a/b) with their checksums.
+    """
+
+    def __init__(
+        self,
+        books: list[EmulatedBook],
+        faults: FaultInjection = FaultInjection(),
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = None,
+    ):
+        super().__init__(
+            books=books, faults=faults, host=host, port=port, seed=seed
+        )
+        self._channel_ids = itertools.count(1)
+        # Views shared by the subscriptions of the same pair and depth
+        self._views: dict[tuple[str, int], KrakenBookView] = {}
+
+    def _format_symbol(self, symbol: str) -> str:
+        return symbol
+
+    def _on_connect(self, connection: EmulatorConnection) -> None:
+        connection.send(
+            json.dumps(
+                {
+                    "connectionID": id(connection),
+                    "event": "systemStatus",
+                    "status": "online",
+                    "version": "1.9.0",
+                }
+            )
+        )
+
+    def _on_message(
+        self, connection: EmulatorConnection, message: Any
+    ) -> None:
+        subscription = message.get("subscription", {})
+
+        match message.get("event"):
+            case "subscribe":
+                for pair in message.get("pair", []):
+                    self.__subscribe_pair(connection, pair, subscription)
+            case "unsubscribe":
+                for pair in message.get("pair", []):
+                    topic = connection.subscriptions.get(pair)
+                    if topic is None:
+                        continue
+
+                    self._unsubscribe(connection, pair)
+                    connection.send(
+                        self.__encode_status(
+                            pair, subscription, "unsubscribed", topic
+                        )
+                    )
+            case "ping":
+                connection.send(
+                    json.dumps(
+                        {"event": "pong", "reqid": message.get("reqid")}
+                    )
+                )
+
+    def _unsubscribe(
+        self, connection: EmulatorConnection, symbol: str
+    ) -> None:
+        topic = connection.subscriptions.get(symbol)
+        super()._unsubscribe(connection, symbol)
+
+        if topic is None:
+            return
+
+        view = self._views[symbol, topic.depth]
+        view.subscriptions_count -= 1
+        if view.subscriptions_count == 0:
+            del self._views[symbol, topic.depth]
+
+    def _encode_change(self, book: EmulatedBook, change: BookChange) -> Any:
+        timestamp = f"{change.changed_at:.6f}"
+        payloads: dict[int, str | None] = {}
+
+        for depth in KRAKEN_BOOK_DEPTHS:
+            view = self._views.get((book.symbol, depth))
+            if view is None:
+                continue
+
+            asks, bids = view.apply(book, timestamp)
+            checksum = view.checksum()
+
+            # Updates of both sides come in two separate objects
+            if asks and bids:
+                payloads[depth] = (
+                    f"{json.dumps({'a': asks})},"
+                    f"{json.dumps({'b': bids, 'c': checksum})}"
+                )
+            elif asks:
+                payloads[depth] = json.dumps({"a": asks, "c": checksum})
+            elif bids:
+                payloads[depth] = json.dumps({"b": bids, "c": checksum})
+            else:
+                payloads[depth] = None
+
+        return book.symbol, payloads
+
+    def _frame_update(self, encoded_change: Any, topic: Any) -> str | None:
+        pair, payloads = encoded_change
+        payload = payloads.get(topic.depth)
+        if payload is None:
+            return None
+
+        return (
+            f'[{topic.channel_id},{payload},"book-{topic.depth}",'
+            f"{json.dumps(pair)}]"
+        )
+
+    def __subscribe_pair(
+        self,
+        connection: EmulatorConnection,
+        pair: str,
+        subscription: dict[str, Any],
+    ) -> None:
+        book = self._get_book(pair)
+        depth = subscription.get("depth", 10)
+
+        if book is None or depth not in KRAKEN_BOOK_DEPTHS:
+            connection.send(
+                self.__encode_status(
+                    pair,
+                    subscription,
+                    "error",
+                    error_message=(
+                        f"Currency pair not supported {pair}"
+                        if book is None
+                        else "Subscription depth not supported"
+                    ),
+                )
+            )
+            return
+
+        if pair in connection.subscriptions:
+            self._unsubscribe(connection, pair)
+
+        view = self._views.get((pair, depth))
+        if view is None:
+            view = self._views[pair, depth] = KrakenBookView(book, depth)
+        view.subscriptions_count += 1
+
+        topic = KrakenSubscription(
+            channel_id=next(self._channel_ids), depth=depth
+        )
+        self._subscribe(connection, pair, topic)
+        connection.send(
+            self.__encode_status(pair, subscription, "subscribed", topic)
+        )
+
+        # The snapshot is queued before any update of the subscription
+        timestamp = f"{time.time():.6f}"
+        snapshot = {
+            "as": [
+                [
+                    format_level_value(price),
+                    format_level_value(volume),
+                    timestamp,
+                ]
+                for price, (volume, _) in sorted(view.asks.items())
+            ],
+            "bs": [
+                [
+                    format_level_value(price),
+                    format_level_value(volume),
+                    timestamp,
+                ]
+                for price, (volume, _) in sorted(
+                    view.bids.items(), reverse=True
+                )
+            ],
+        }
+        connection.send(
+            f"[{topic.channel_id},{json.dumps(snapshot)},"
+            f'"book-{depth}",{json.dumps(pair)}]'
+        )
+
+    @staticmethod
+    def __encode_status(
+        pair: str,
+        subscription: dict[str, Any],
+        status: str,
+        topic: KrakenSubscription | None = None,
+        error_message: str | None = None,
+    ) -> str:
+        message: dict[str, Any] = {
+            "event": "subscriptionStatus",
+            "pair": pair,
+            "status": status,
+            "subscription": subscription,
+        }
+        if topic is not None:
+            message["channelID"] = topic.channel_id
+            message["channelName"] = f"book-{topic.depth}"
+        if error_message is not None:
+            message["errorMessage"] = error_message
+
+        return json.dumps(message)
@@ -0,0 +1,177 @@
+"""
+Runs the processors and the default workers of many pairs on synthetic
+order books, to find how many pairs one process sustains.
+
+Usage: python -m app.load_test --pairs 200 --duration 120
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+from _decimal import Decimal
+from prometheus_client import REGISTRY
+
+from app.application.collectors.synthetic_collector import SyntheticCollector
+from app.application.common.processor import Processor
+from app.application.workers.common import Worker
+from app.application.workers.db_worker import DbWorker
+from app.application.workers.orders_anomalies_summary_worker import \
+    OrdersAnomaliesSummaryWorker
+from app.application.workers.orders_worker import OrdersWorker
+from app.application.workers.volume_worker import VolumeWorker
+from app.config import settings
+from app.utilities.event_utils import EventHandler
+from app.utilities.fixed_point_utils import create_level_scale
+from app.utilities.logging_utils import get_logging_level
+from app.utilities.scheduling_utils import ScheduledJob, get_scheduler
+
+WORKER_NAMES = [
+    "DB worker",
+    "Volume worker",
+    "Orders worker",
+    "Orders anomalies summary worker",
+]
+
+logging.basicConfig(
+    level=get_logging_level(),
+    format="%(asctime)s [%(filename)s] %(levelname)s %(message)s",
+    handlers=[
+        logging.StreamHandler(),
+    ],
+)
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=100)
+    parser.add_argument(
+        "--duration", type=float, default=60.0, help="Seconds to run"
+    )
+    parser.add_argument(
+        "--depth", type=int, default=1000, help="Levels per side"
+    )
+    parser.add_argument(
+        "--update-rate",
+        type=float,
+        default=10.0,
+        help="Updates per second of every pair, 0 for as fast as possible",
+    )
+    parser.add_argument("--levels-per-update", type=int, default=20)
+    parser.add_argument(
+        "--price-drift",
+        type=float,
+        default=1.0,
+        help="Standard deviation of the mid price move per update in ticks",
+    )
+    parser.add_argument("--burst-probability", type=float, default=0.0)
+    parser.add_argument("--burst-multiplier", type=float, default=10.0)
+    parser.add_argument("--burst-duration", type=float, default=1.0)
+    parser.add_argument(
+        "--fixed-point",
+        action="store_true",
+        help="Use fixed-point levels instead of decimals",
+    )
+    parser.add_argument(
+        "--persistence",
+        choices=["dummy", "postgres"],
+        default="dummy",
+        help="Discard the worker writes or store them in the database",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+
+    return parser.parse_args()
+
+
+def _get_overruns_count(worker_name: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "worker_interval_overruns_total", {"worker": worker_name}
+        )
+        or 0.0
+    )
+
+
+async def main(arguments: argparse.Namespace) -> None:
+    launch_id = uuid.uuid4()
+    scale = create_level_scale(
+        price_precision=2 if arguments.fixed_point else None,
+        quantity_precision=4 if arguments.fixed_point else None,
+    )
+    collectors: list[SyntheticCollector] = []
+    tasks: list[asyncio.Task] = []
+    jobs: list[ScheduledJob] = []
+
+    for index in range(arguments.pairs):
+        pair_id = uuid.uuid4()
+        symbol = f"SYN{index}/USDT"
+        event_handler = EventHandler()
+
+        collector = SyntheticCollector(
+            launch_id=launch_id,
+            pair_id=pair_id,
+            symbol=symbol,
+            delimiter=Decimal("0.1"),
+            scale=scale,
+            depth=arguments.depth,
+            update_rate=arguments.update_rate,
+            levels_per_update=arguments.levels_per_update,
+            price_drift=arguments.price_drift,
+            burst_probability=arguments.burst_probability,
+            burst_multiplier=arguments.burst_multiplier,
+            burst_duration=arguments.burst_duration,
+            seed=None if arguments.seed is None else arguments.seed + index,
+        )
+        processor = Processor(
+            launch_id=launch_id,
+            event_handler=event_handler,
+            collector=collector,
+            symbol=symbol,
+            delimiter=Decimal("0.1"),
+            pair_id=pair_id,
+            scale=scale,
+            max_depth_levels=settings.ORDER_BOOK_MAX_DEPTH_LEVELS,
+        )
+        collectors.append(collector)
+        tasks.append(asyncio.create_task(processor.run()))
+
+        # Workers run without messengers, which would send notifications
+        workers: list[Worker] = [
+            DbWorker(processor=processor),
+            VolumeWorker(processor=processor, event_handler=event_handler),
+            OrdersWorker(processor=processor),
+            OrdersAnomaliesSummaryWorker(processor=processor),
+        ]
+        jobs.extend(worker.schedule() for worker in workers)
+
+    started_at = time.monotonic()
+    await asyncio.sleep(arguments.duration)
+    elapsed_time = time.monotonic() - started_at
+
+    for task in tasks:
+        task.cancel()
+    for job in jobs:
+        get_scheduler().remove_job(job)
+
+    updates_count = sum(collector.updates_count for collector in collectors)
+    print(
+        f"{arguments.pairs} pairs, {elapsed_time:.1f} s: "
+        f"{updates_count} updates ({updates_count / elapsed_time:.1f}/s)"
+    )
+    for worker_name in WORKER_NAMES:
+        print(
+            f"  {worker_name:<32} "
+            f"{_get_overruns_count(worker_name):.0f} interval overruns"
+        )
+
+
+if __name__ == "__main__":
+    arguments = _parse_arguments()
+    # Settings are read by the workers on every database access
+    settings.DB_PERSISTENCE_MODE = arguments.persistence
+
+    try:
+        asyncio.run(main(arguments))
+    except KeyboardInterrupt:
+        logging.info("\nInterrupted. Closing load test...")
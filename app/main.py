@@ -5,6 +5,7 @@ import uuid
 from prometheus_client import start_http_server
 
 from app.application.common.maestro import Maestro
+from app.infrastructure.clients.http_client_pool import close_http_client
 from app.utilities.logging_utils import get_logging_level
 
 logging.basicConfig(
@@ -25,7 +26,11 @@ def _start_metrics_server() -> None:
 async def main() -> None:
     launch_id = uuid.uuid4()
     maestro = Maestro(launch_id)
-    await maestro.run()
+
+    try:
+        await maestro.run()
+    finally:
+        await close_http_client()
 
 
 if __name__ == "__main__":
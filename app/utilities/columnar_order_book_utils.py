@@ -0,0 +1,339 @@
+import math
+from operator import mul
+from typing import Iterator, Mapping, overload
+
+import numpy as np
+import numpy.typing as npt
+from _decimal import Decimal
+
+from app.utilities.fixed_point_utils import LevelValue
+from app.utilities.order_book_utils import OrderBookSide
+
+LevelArray = npt.NDArray[np.int64]
+
+
+class ColumnarOrderBookSide(OrderBookSide):
+    """
+    Order book side stored as two aligned NumPy arrays of fixed-point prices
+    (always ascending) and quantities.
+
+    Point updates cost an array copy, so updates are meant to be applied in
+    batches with update_levels, while grouping, liquidity and top levels
+    ranking run as vectorized operations. Only integer (fixed-point) levels
+    are supported.
+    """
+
+    __slots__ = ("_price_array", "_quantity_array")
+
+    def __init__(
+        self,
+        levels: Mapping[LevelValue, LevelValue] | None = None,
+        is_descending: bool = False,
+    ):
+        prices = sorted(levels) if levels else []
+
+        self._price_array: LevelArray = np.array(prices, dtype=np.int64)
+        self._quantity_array: LevelArray = np.array(
+            [levels[price] for price in prices] if levels else [],
+            dtype=np.int64,
+        )
+        self._is_descending = is_descending
+        self._is_shared = False
+
+    @classmethod
+    def from_arrays(
+        cls,
+        price_array: LevelArray,
+        quantity_array: LevelArray,
+        is_descending: bool = False,
+    ) -> "ColumnarOrderBookSide":
+        side = cls(is_descending=is_descending)
+        side._price_array = price_array
+        side._quantity_array = quantity_array
+
+        return side
+
+    def __find(self, price: LevelValue) -> int | None:
+        index = int(np.searchsorted(self._price_array, int(price)))
+
+        if (
+            index < len(self._price_array)
+            and self._price_array[index] == price
+        ):
+            return index
+        return None
+
+    def __getitem__(self, price: LevelValue) -> LevelValue:
+        index = self.__find(price)
+        if index is None:
+            raise KeyError(price)
+
+        return int(self._quantity_array[index])
+
+    def __setitem__(self, price: LevelValue, quantity: LevelValue) -> None:
+        self.update_levels({price: quantity})
+
+    def __delitem__(self, price: LevelValue) -> None:
+        index = self.__find(price)
+        if index is None:
+            raise KeyError(price)
+
+        self._price_array = np.delete(self._price_array, index)
+        self._quantity_array = np.delete(self._quantity_array, index)
+        self._is_shared = False
+
+    def __contains__(self, price: object) -> bool:
+        if not isinstance(price, (int, Decimal)):
+            return False
+
+        return self.__find(price) is not None
+
+    def __iter__(self) -> Iterator[LevelValue]:
+        prices: list[LevelValue] = self._price_array.tolist()
+        if self._is_descending:
+            return reversed(prices)
+        return iter(prices)
+
+    def __len__(self) -> int:
+        return len(self._price_array)
+
+    @overload  # type: ignore[override]
+    def get(self, price: LevelValue) -> LevelValue | None:
+        ...
+
+    @overload
+    def get(self, price: LevelValue, default: LevelValue) -> LevelValue:
+        ...
+
+    def get(
+        self, price: LevelValue, default: LevelValue | None = None
+    ) -> LevelValue | None:
+        index = self.__find(price)
+        if index is None:
+            return default
+
+        return int(self._quantity_array[index])
+
+    @overload  # type: ignore[override]
+    def pop(self, price: LevelValue) -> LevelValue | None:
+        ...
+
+    @overload
+    def pop(self, price: LevelValue, default: LevelValue) -> LevelValue:
+        ...
+
+    def pop(
+        self, price: LevelValue, default: LevelValue | None = None
+    ) -> LevelValue | None:
+        quantity = self.get(price)
+        if quantity is None:
+            return default
+
+        del self[price]
+
+        return quantity
+
+    def clear(self) -> None:
+        self._price_array = np.array([], dtype=np.int64)
+        self._quantity_array = np.array([], dtype=np.int64)
+        self._is_shared = False
+
+    def copy(self) -> "ColumnarOrderBookSide":
+        return ColumnarOrderBookSide.from_arrays(
+            self._price_array.copy(),
+            self._quantity_array.copy(),
+            is_descending=self._is_descending,
+        )
+
+    def snapshot(self) -> "ColumnarOrderBookSide":
+        side = ColumnarOrderBookSide.from_arrays(
+            self._price_array,
+            self._quantity_array,
+            is_descending=self._is_descending,
+        )
+        side._is_shared = self._is_shared = True
+
+        return side
+
+    def truncate(self, n: int) -> list[tuple[LevelValue, LevelValue]]:
+        if len(self._price_array) <= n:
+            return []
+
+        if self._is_descending:
+            return self.__remove_slice(0, len(self._price_array) - n)
+
+        return self.__remove_slice(n, len(self._price_array))
+
+    def truncate_beyond_price(
+        self, price: LevelValue | Decimal
+    ) -> list[tuple[LevelValue, LevelValue]]:
+        # Prices are integers, so the limit is rounded towards the book
+        if self._is_descending:
+            end = np.searchsorted(self._price_array, math.ceil(price), "left")
+            return self.__remove_slice(0, int(end))
+
+        start = np.searchsorted(self._price_array, math.floor(price), "right")
+        return self.__remove_slice(int(start), len(self._price_array))
+
+    def __remove_slice(
+        self, start: int, end: int
+    ) -> list[tuple[LevelValue, LevelValue]]:
+        if start >= end:
+            return []
+
+        removed_levels = list(
+            zip(
+                self._price_array[start:end].tolist(),
+                self._quantity_array[start:end].tolist(),
+            )
+        )
+
+        # Slicing creates new arrays, so snapshots are never affected
+        self._price_array = np.concatenate(
+            (self._price_array[:start], self._price_array[end:])
+        )
+        self._quantity_array = np.concatenate(
+            (self._quantity_array[:start], self._quantity_array[end:])
+        )
+        self._is_shared = False
+
+        return removed_levels
+
+    def update_levels(
+        self, levels: Mapping[LevelValue, LevelValue]
+    ) -> list[tuple[LevelValue, LevelValue]]:
+        if not levels:
+            return []
+
+        prices = np.fromiter(levels.keys(), dtype=np.int64, count=len(levels))
+        quantities = np.fromiter(
+            levels.values(), dtype=np.int64, count=len(levels)
+        )
+        order = np.argsort(prices)
+        prices, quantities = prices[order], quantities[order]
+        # A zero price or quantity removes the level
+        quantities[(prices == 0) | (quantities == 0)] = 0
+
+        price_array, quantity_array = self._price_array, self._quantity_array
+        indexes = np.searchsorted(price_array, prices)
+        clipped_indexes = np.minimum(indexes, max(len(price_array) - 1, 0))
+        exists = (indexes < len(price_array)) & (
+            price_array[clipped_indexes] == prices
+            if len(price_array)
+            else np.zeros(len(prices), dtype=bool)
+        )
+        previous_quantities = np.where(
+            exists,
+            quantity_array[clipped_indexes] if len(price_array) else 0,
+            0,
+        )
+        is_removed = quantities == 0
+
+        # Every step below builds new arrays, so snapshots sharing the
+        # previous ones are left untouched
+        quantity_array = quantity_array.copy()
+        updated = exists & ~is_removed
+        quantity_array[indexes[updated]] = quantities[updated]
+
+        removed = exists & is_removed
+        if removed.any():
+            is_kept = np.ones(len(price_array), dtype=bool)
+            is_kept[indexes[removed]] = False
+            price_array = price_array[is_kept]
+            quantity_array = quantity_array[is_kept]
+
+        inserted = ~exists & ~is_removed
+        if inserted.any():
+            positions = np.searchsorted(price_array, prices[inserted])
+            price_array = np.insert(price_array, positions, prices[inserted])
+            quantity_array = np.insert(
+                quantity_array, positions, quantities[inserted]
+            )
+
+        self._price_array, self._quantity_array = price_array, quantity_array
+        self._is_shared = False
+
+        quantity_deltas = quantities - previous_quantities
+        changed = quantity_deltas != 0
+
+        return list(
+            zip(prices[changed].tolist(), quantity_deltas[changed].tolist())
+        )
+
+    def liquidity(self) -> LevelValue:
+        # Summed as Python integers, since liquidity of a whole book in
+        # fixed-point units may overflow int64
+        return sum(
+            map(mul, self._price_array.tolist(), self._quantity_array.tolist())
+        )
+
+    def group(self, delimiter: LevelValue) -> "ColumnarOrderBookSide":
+        bucketed_prices = (
+            np.floor_divide(self._price_array, int(delimiter)) * delimiter
+        )
+        # Prices are sorted, so every bucket is a contiguous run of levels
+        bucket_prices, bucket_starts = np.unique(
+            bucketed_prices, return_index=True
+        )
+        bucket_quantities = (
+            np.add.reduceat(self._quantity_array, bucket_starts)
+            if len(bucket_starts)
+            else np.array([], dtype=np.int64)
+        )
+
+        return ColumnarOrderBookSide.from_arrays(
+            bucket_prices.astype(np.int64),
+            bucket_quantities.astype(np.int64),
+            is_descending=self._is_descending,
+        )
+
+    def rank_by_liquidity(
+        self, n: int
+    ) -> list[tuple[int, LevelValue, LevelValue, LevelValue]]:
+        if n <= 0:
+            return []
+
+        prices, quantities = self.__top_arrays(n)
+        # Float liquidity is only used for ordering, the returned
+        # liquidity stays exact
+        order = np.argsort(
+            -(prices.astype(np.float64) * quantities), kind="stable"
+        )
+        price_list = prices.tolist()
+        quantity_list = quantities.tolist()
+
+        return [
+            (
+                position,
+                price_list[position],
+                quantity_list[position],
+                price_list[position] * quantity_list[position],
+            )
+            for position in order.tolist()
+        ]
+
+    def top(self, n: int) -> list[tuple[LevelValue, LevelValue]]:
+        if n <= 0:
+            return []
+
+        prices, quantities = self.__top_arrays(n)
+
+        return list(zip(prices.tolist(), quantities.tolist()))
+
+    def __top_arrays(self, n: int) -> tuple[LevelArray, LevelArray]:
+        if self._is_descending:
+            return (
+                self._price_array[::-1][:n],
+                self._quantity_array[::-1][:n],
+            )
+
+        return self._price_array[:n], self._quantity_array[:n]
+
+    @property
+    def best_price(self) -> LevelValue | None:
+        if not len(self._price_array):
+            return None
+
+        index = -1 if self._is_descending else 0
+
+        return int(self._price_array[index])
@@ -0,0 +1,200 @@
+from abc import ABC, abstractmethod
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Mapping
+
+# Value of a price level or a quantity inside an in-memory order book: either
+# a Decimal or an integer scaled by the pair precision (fixed-point mode)
+LevelValue = Decimal | int
+# Level value of a book event, which RawScale leaves as the string received
+# from the exchange until the processor decodes it with a LevelDecoder
+RawLevelValue = LevelValue | str
+
+
+def to_fixed_point(value: str | Decimal, precision: int) -> int:
+    if isinstance(value, str):
+        integer_part, _, fractional_part = value.partition(".")
+
+        # Fast path without Decimal for values that fit into the precision
+        if len(fractional_part) <= precision or not fractional_part[
+            precision:
+        ].strip("0"):
+            return int(
+                integer_part
+                + fractional_part[:precision].ljust(precision, "0")
+            )
+
+        value = Decimal(value)
+
+    return int(value.scaleb(precision).to_integral_value(ROUND_HALF_UP))
+
+
+def from_fixed_point(value: int, precision: int) -> Decimal:
+    return Decimal(value).scaleb(-precision)
+
+
+class LevelScale(ABC):
+    """
+    Converts exchange price/quantity values into the representation used by
+    the in-memory order book and back to Decimal at persistence and
+    notification edges.
+    """
+
+    @abstractmethod
+    def parse_price(self, value: str | Decimal) -> LevelValue:
+        pass
+
+    @abstractmethod
+    def parse_quantity(self, value: str | Decimal) -> LevelValue:
+        pass
+
+    @abstractmethod
+    def parse_liquidity(self, value: Decimal) -> LevelValue:
+        pass
+
+    @abstractmethod
+    def to_decimal_price(self, value: LevelValue) -> Decimal:
+        pass
+
+    @abstractmethod
+    def to_decimal_quantity(self, value: LevelValue) -> Decimal:
+        pass
+
+    @abstractmethod
+    def to_decimal_liquidity(self, value: LevelValue) -> Decimal:
+        pass
+
+
+class DecimalScale(LevelScale):
+    def parse_price(self, value: str | Decimal) -> Decimal:
+        return value if isinstance(value, Decimal) else Decimal(value)
+
+    def parse_quantity(self, value: str | Decimal) -> Decimal:
+        return value if isinstance(value, Decimal) else Decimal(value)
+
+    def parse_liquidity(self, value: Decimal) -> Decimal:
+        return value
+
+    def to_decimal_price(self, value: LevelValue) -> Decimal:
+        return value if isinstance(value, Decimal) else Decimal(value)
+
+    def to_decimal_quantity(self, value: LevelValue) -> Decimal:
+        return value if isinstance(value, Decimal) else Decimal(value)
+
+    def to_decimal_liquidity(self, value: LevelValue) -> Decimal:
+        return value if isinstance(value, Decimal) else Decimal(value)
+
+
+class FixedPointScale(LevelScale):
+    """
+    Represents prices and quantities as integers scaled by the pair tick
+    (price) and lot (quantity) precision, so that the liquidity of a level
+    is scaled by the sum of both precisions.
+    """
+
+    def __init__(self, price_precision: int, quantity_precision: int):
+        self.price_precision = price_precision
+        self.quantity_precision = quantity_precision
+        self.liquidity_precision = price_precision + quantity_precision
+
+    def parse_price(self, value: str | Decimal) -> int:
+        return to_fixed_point(value, self.price_precision)
+
+    def parse_quantity(self, value: str | Decimal) -> int:
+        return to_fixed_point(value, self.quantity_precision)
+
+    def parse_liquidity(self, value: Decimal) -> int:
+        return to_fixed_point(value, self.liquidity_precision)
+
+    def to_decimal_price(self, value: LevelValue) -> Decimal:
+        return from_fixed_point(int(value), self.price_precision)
+
+    def to_decimal_quantity(self, value: LevelValue) -> Decimal:
+        return from_fixed_point(int(value), self.quantity_precision)
+
+    def to_decimal_liquidity(self, value: LevelValue) -> Decimal:
+        return from_fixed_point(int(value), self.liquidity_precision)
+
+
+class RawScale:
+    """
+    Keeps prices and quantities as the strings received from the exchange,
+    so that they are decoded by the processor with a LevelDecoder and only
+    for the levels it actually applies. The scale of the pair is kept for
+    the clients which need decoded levels anyway.
+    """
+
+    def __init__(self, scale: LevelScale):
+        self.scale = scale
+
+    def parse_price(self, value: str | Decimal) -> RawLevelValue:
+        return value
+
+    def parse_quantity(self, value: str | Decimal) -> RawLevelValue:
+        return value
+
+
+# Parses the levels of exchange messages into book events
+LevelParser = LevelScale | RawScale
+
+
+def get_level_scale(parser: LevelParser) -> LevelScale:
+    return parser.scale if isinstance(parser, RawScale) else parser
+
+
+class LevelDecoder:
+    """
+    Decodes levels kept as raw strings by RawScale. Decoded values are
+    interned by their string, since depth streams keep repeating the same
+    prices and quantities, and the caches are reset once they grow beyond
+    max_cache_size entries.
+    """
+
+    def __init__(self, scale: LevelScale, max_cache_size: int = 100_000):
+        self._scale = scale
+        self._max_cache_size = max_cache_size
+        self._prices: dict[RawLevelValue, LevelValue] = {}
+        self._quantities: dict[RawLevelValue, LevelValue] = {}
+
+    def decode(
+        self, levels: Mapping[RawLevelValue, RawLevelValue]
+    ) -> dict[LevelValue, LevelValue]:
+        prices, quantities = self._prices, self._quantities
+        if len(prices) > self._max_cache_size:
+            prices.clear()
+        if len(quantities) > self._max_cache_size:
+            quantities.clear()
+
+        decoded_levels: dict[LevelValue, LevelValue] = {}
+
+        for raw_price, raw_quantity in levels.items():
+            price = prices.get(raw_price)
+            if price is None:
+                price = prices[raw_price] = (
+                    raw_price
+                    if isinstance(raw_price, int)
+                    else self._scale.parse_price(raw_price)
+                )
+
+            quantity = quantities.get(raw_quantity)
+            if quantity is None:
+                quantity = quantities[raw_quantity] = (
+                    raw_quantity
+                    if isinstance(raw_quantity, int)
+                    else self._scale.parse_quantity(raw_quantity)
+                )
+
+            decoded_levels[price] = quantity
+
+        return decoded_levels
+
+
+def create_level_scale(
+    price_precision: int | None, quantity_precision: int | None
+) -> LevelScale:
+    if price_precision is None or quantity_precision is None:
+        return DecimalScale()
+
+    return FixedPointScale(
+        price_precision=price_precision,
+        quantity_precision=quantity_precision,
+    )
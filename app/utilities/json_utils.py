@@ -0,0 +1,31 @@
+import json
+import logging
+from typing import Any, Callable, Literal
+
+from app.config import settings
+
+JsonDecoder = Callable[[str | bytes], Any]
+LiteralJsonDecoderName = Literal["auto", "orjson", "json"]
+
+
+def get_json_decoder(name: LiteralJsonDecoderName = "auto") -> JsonDecoder:
+    """
+    Returns the JSON decoder to use for exchange messages. Both decoders
+    accept bytes, so frames and HTTP bodies are decoded without a
+    conversion to str.
+    """
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+
+            return orjson.loads
+        except ImportError:
+            if name == "orjson":
+                logging.warning(
+                    "orjson is not installed, falling back to json decoder"
+                )
+
+    return json.loads
+
+
+json_loads = get_json_decoder(settings.JSON_DECODER)
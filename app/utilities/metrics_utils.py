@@ -0,0 +1,74 @@
+from prometheus_client import Counter, Histogram
+
+ORDER_BOOK_PRUNED_LEVELS = Counter(
+    "order_book_pruned_levels",
+    "Number of price levels pruned from in-memory order books",
+    ["symbol", "side"],
+)
+
+ORDER_BOOK_SEQUENCE_GAPS = Counter(
+    "order_book_sequence_gaps",
+    "Number of gaps detected in order book update sequences",
+    ["exchange", "symbol"],
+)
+
+ORDER_BOOK_RESYNCS = Counter(
+    "order_book_resyncs",
+    "Number of order books resynchronized without reconnecting",
+    ["exchange", "symbol"],
+)
+
+ORDER_BOOK_CHECKSUM_MISMATCHES = Counter(
+    "order_book_checksum_mismatches",
+    "Number of order book checksum verification failures",
+    ["exchange", "symbol"],
+)
+
+COLLECTOR_RECONNECTS = Counter(
+    "collector_reconnects",
+    "Number of collector stream reconnections",
+    ["exchange", "symbol"],
+)
+
+COLLECTOR_CONNECT_LATENCY = Histogram(
+    "collector_connect_latency_seconds",
+    "Time from opening a collector stream to its first event",
+    ["exchange"],
+)
+
+CIRCUIT_BREAKER_OPENINGS = Counter(
+    "circuit_breaker_openings",
+    "Number of times the circuit breaker of an exchange host opened",
+    ["host"],
+)
+
+RECORDER_DROPPED_FRAMES = Counter(
+    "recorder_dropped_frames",
+    "Number of frames dropped because the recorder buffer was full",
+    ["exchange", "symbol"],
+)
+
+WORKER_INTERVAL_OVERRUNS = Counter(
+    "worker_interval_overruns",
+    "Number of worker cycles which took longer than their interval",
+    ["worker"],
+)
+
+WORKER_MISSED_TICKS = Counter(
+    "worker_missed_ticks",
+    "Number of worker ticks which could not start a run on time",
+    ["worker"],
+)
+
+SCHEDULER_JOB_LATENESS = Histogram(
+    "scheduler_job_lateness_seconds",
+    "Delay of the scheduler dispatching a job after its tick",
+    ["job"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+SCHEDULER_DISPATCHED_JOBS = Histogram(
+    "scheduler_dispatched_jobs",
+    "Number of jobs dispatched together by a tick of the scheduler",
+    buckets=(1, 5, 10, 50, 100, 500, 1000),
+)
@@ -0,0 +1,286 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Iterator, Mapping, MutableMapping, overload
+
+from _decimal import Decimal
+
+from app.utilities.fixed_point_utils import LevelValue
+
+
+class OrderBookSide(MutableMapping[LevelValue, LevelValue]):
+    """
+    Price level to quantity mapping which keeps its prices sorted.
+
+    Iteration always starts from the best price: ascending prices for asks,
+    descending prices for bids. Lookups are served by a plain dict, while a
+    sorted list of prices is maintained with bisect on every insert/delete.
+
+    Snapshots share the underlying storage with the side they were taken
+    from. Whichever of them is modified first copies the storage
+    (copy-on-write), so taking a snapshot costs O(1).
+    """
+
+    __slots__ = ("_levels", "_prices", "_is_descending", "_is_shared")
+
+    def __init__(
+        self,
+        levels: Mapping[LevelValue, LevelValue] | None = None,
+        is_descending: bool = False,
+    ):
+        self._levels: dict[LevelValue, LevelValue] = (
+            dict(levels) if levels else {}
+        )
+        self._prices: list[LevelValue] = sorted(self._levels)
+        self._is_descending = is_descending
+        self._is_shared = False
+
+    def __getitem__(self, price: LevelValue) -> LevelValue:
+        return self._levels[price]
+
+    def __setitem__(self, price: LevelValue, quantity: LevelValue) -> None:
+        if self._is_shared:
+            self.__detach()
+
+        if price not in self._levels:
+            insort(self._prices, price)
+        self._levels[price] = quantity
+
+    def __delitem__(self, price: LevelValue) -> None:
+        if self._is_shared:
+            self.__detach()
+
+        del self._levels[price]
+        del self._prices[bisect_left(self._prices, price)]
+
+    def __contains__(self, price: object) -> bool:
+        return price in self._levels
+
+    def __iter__(self) -> Iterator[LevelValue]:
+        if self._is_descending:
+            return reversed(self._prices)
+        return iter(self._prices)
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    @overload  # type: ignore[override]
+    def get(self, price: LevelValue) -> LevelValue | None:
+        ...
+
+    @overload
+    def get(self, price: LevelValue, default: LevelValue) -> LevelValue:
+        ...
+
+    def get(
+        self, price: LevelValue, default: LevelValue | None = None
+    ) -> LevelValue | None:
+        return self._levels.get(price, default)
+
+    @overload  # type: ignore[override]
+    def pop(self, price: LevelValue) -> LevelValue | None:
+        ...
+
+    @overload
+    def pop(self, price: LevelValue, default: LevelValue) -> LevelValue:
+        ...
+
+    def pop(
+        self, price: LevelValue, default: LevelValue | None = None
+    ) -> LevelValue | None:
+        if price not in self._levels:
+            return default
+
+        quantity = self._levels[price]
+        del self[price]
+
+        return quantity
+
+    def clear(self) -> None:
+        self._levels = {}
+        self._prices = []
+        self._is_shared = False
+
+    def copy(self) -> "OrderBookSide":
+        side = OrderBookSide(is_descending=self._is_descending)
+        side._levels = self._levels.copy()
+        side._prices = self._prices.copy()
+
+        return side
+
+    def snapshot(self) -> "OrderBookSide":
+        side = OrderBookSide(is_descending=self._is_descending)
+        side._levels = self._levels
+        side._prices = self._prices
+        side._is_shared = self._is_shared = True
+
+        return side
+
+    def __detach(self) -> None:
+        self._levels = self._levels.copy()
+        self._prices = self._prices.copy()
+        self._is_shared = False
+
+    def truncate(self, n: int) -> list[tuple[LevelValue, LevelValue]]:
+        """
+        Keeps only the n best levels and returns the removed ones.
+        """
+        if len(self._prices) <= n:
+            return []
+
+        if self._is_descending:
+            return self.__remove_prices(0, len(self._prices) - n)
+
+        return self.__remove_prices(n, len(self._prices))
+
+    def truncate_beyond_price(
+        self, price: LevelValue | Decimal
+    ) -> list[tuple[LevelValue, LevelValue]]:
+        """
+        Removes the levels that are worse than the price and returns them.
+        """
+        if self._is_descending:
+            return self.__remove_prices(0, bisect_left(self._prices, price))
+
+        return self.__remove_prices(
+            bisect_right(self._prices, price), len(self._prices)
+        )
+
+    def __remove_prices(
+        self, start: int, end: int
+    ) -> list[tuple[LevelValue, LevelValue]]:
+        if start >= end:
+            return []
+
+        if self._is_shared:
+            self.__detach()
+
+        removed_prices = self._prices[start:end]
+        del self._prices[start:end]
+
+        return [(price, self._levels.pop(price)) for price in removed_prices]
+
+    def update_levels(
+        self, levels: Mapping[LevelValue, LevelValue]
+    ) -> list[tuple[LevelValue, LevelValue]]:
+        """
+        Sets absolute quantities of the levels, removing the ones with zero
+        quantity, and returns the price and quantity change of every level
+        that actually changed.
+        """
+        changes: list[tuple[LevelValue, LevelValue]] = []
+
+        for price, quantity in levels.items():
+            if price * quantity == 0:
+                previous_quantity = self.pop(price, 0)
+                quantity = 0
+            else:
+                previous_quantity = self.get(price, 0)
+                self[price] = quantity
+
+            if quantity != previous_quantity:
+                changes.append((price, quantity - previous_quantity))
+
+        return changes
+
+    def liquidity(self) -> LevelValue:
+        return sum(
+            price * quantity for price, quantity in self._levels.items()
+        )
+
+    def group(self, delimiter: LevelValue) -> "OrderBookSide":
+        grouped_order_book: dict[LevelValue, LevelValue] = {}
+        for price in self._prices:
+            bucketed_price = get_bucket_price(price, delimiter)
+
+            # Accumulate quantity in the bucket, keeping integer quantities
+            # of fixed-point books as integers
+            grouped_order_book[bucketed_price] = (
+                grouped_order_book.get(bucketed_price, 0) + self._levels[price]
+            )
+
+        return OrderBookSide(
+            grouped_order_book, is_descending=self._is_descending
+        )
+
+    def rank_by_liquidity(
+        self, n: int
+    ) -> list[tuple[int, LevelValue, LevelValue, LevelValue]]:
+        """
+        Returns position, price, quantity and liquidity of the n best levels
+        ordered by liquidity, the most liquid first.
+        """
+        ranked_levels = [
+            (position, price, quantity, price * quantity)
+            for position, (price, quantity) in enumerate(self.top(n))
+        ]
+        ranked_levels.sort(key=lambda level: level[3], reverse=True)
+
+        return ranked_levels
+
+    def top(self, n: int) -> list[tuple[LevelValue, LevelValue]]:
+        if n <= 0:
+            return []
+
+        if self._is_descending:
+            prices: Iterable[LevelValue] = reversed(self._prices[-n:])
+        else:
+            prices = self._prices[:n]
+
+        return [(price, self._levels[price]) for price in prices]
+
+    @property
+    def best_price(self) -> LevelValue | None:
+        if not self._prices:
+            return None
+
+        return self._prices[-1] if self._is_descending else self._prices[0]
+
+    @property
+    def is_descending(self) -> bool:
+        return self._is_descending
+
+
+def get_bucket_price(price: LevelValue, delimiter: LevelValue) -> LevelValue:
+    return price - (price % delimiter)
+
+
+def group_order_book_side(
+    order_book: Mapping[LevelValue, LevelValue], delimiter: LevelValue
+) -> OrderBookSide:
+    # Buckets of a sorted side come out already sorted, so the result
+    # keeps the backend and the direction of the source side
+    if not isinstance(order_book, OrderBookSide):
+        order_book = OrderBookSide(order_book)
+
+    return order_book.group(delimiter)
+
+
+def update_grouped_order_book_side(
+    grouped_order_book: OrderBookSide,
+    quantity_deltas: Iterable[tuple[LevelValue, LevelValue]],
+    delimiter: LevelValue,
+) -> None:
+    """
+    Adds the quantity changes of the levels to their buckets, which are
+    then updated in one batch.
+    """
+    bucket_deltas: dict[LevelValue, LevelValue] = {}
+
+    for price, quantity_delta in quantity_deltas:
+        bucketed_price = get_bucket_price(price, delimiter)
+        bucket_deltas[bucketed_price] = (
+            bucket_deltas.get(bucketed_price, 0) + quantity_delta
+        )
+
+    # Quantities are positive, so an empty bucket is the only zero bucket
+    grouped_order_book.update_levels(
+        {
+            bucketed_price: max(
+                grouped_order_book.get(bucketed_price, 0) + quantity_delta, 0
+            )
+            for bucketed_price, quantity_delta in bucket_deltas.items()
+            if quantity_delta != 0
+        }
+    )
@@ -0,0 +1,96 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+from app.utilities.metrics_utils import CIRCUIT_BREAKER_OPENINGS
+
+
+@dataclass(frozen=True)
+class ReconnectPolicy:
+    """
+    Exponential backoff between consecutive failed connection attempts,
+    randomly shortened by up to the jitter ratio so that the collectors of
+    an exchange don't reconnect in lockstep.
+    """
+
+    initial_delay: float = 1.0
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    # Collecting is stopped after this many failed attempts in a row
+    max_attempts: int | None = None
+    # Streams alive for this long are reopened without any delay
+    stable_stream_time: float = 10.0
+
+    def get_delay(self, attempt: int) -> float:
+        delay = min(
+            self.max_delay,
+            self.initial_delay * self.multiplier ** max(attempt - 1, 0),
+        )
+
+        return random.uniform(delay * (1 - self.jitter), delay)
+
+    def is_exhausted(self, attempt: int) -> bool:
+        return self.max_attempts is not None and attempt >= self.max_attempts
+
+
+class CircuitBreaker:
+    """
+    Shared by all collectors of an exchange host. It opens after
+    failure_threshold failed connection attempts in a row and then lets a
+    single collector probe the host every reset_timeout seconds, while the
+    others wait for the probe to succeed.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.host = host
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures_count = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def record_success(self) -> None:
+        self._failures_count = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures_count += 1
+
+        if self._failures_count >= self._failure_threshold:
+            if self._opened_at is None:
+                CIRCUIT_BREAKER_OPENINGS.labels(host=self.host).inc()
+            self._opened_at = time.monotonic()
+
+    async def wait(self) -> None:
+        while self._opened_at is not None:
+            remaining_time = (
+                self._opened_at + self._reset_timeout - time.monotonic()
+            )
+
+            if remaining_time <= 0:
+                # Half-open, the caller probes the host and the timeout
+                # starts over for everyone else
+                self._opened_at = time.monotonic()
+                return
+
+            await asyncio.sleep(remaining_time)
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    if host not in _circuit_breakers:
+        _circuit_breakers[host] = CircuitBreaker(host)
+
+    return _circuit_breakers[host]
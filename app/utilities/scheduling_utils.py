@@ -1,47 +1,342 @@
 import asyncio
+import functools
+import heapq
+import itertools
 import logging
-from typing import Any, Callable, Coroutine
+import math
+import random
+from enum import Enum
+from typing import Any, Callable, Coroutine, cast
 
-from app.utilities.time_utils import get_current_time
+from app.utilities.metrics_utils import (SCHEDULER_DISPATCHED_JOBS,
+                                         SCHEDULER_JOB_LATENESS,
+                                         WORKER_INTERVAL_OVERRUNS,
+                                         WORKER_MISSED_TICKS)
+from app.utilities.time_utils import Clock, TimerHandle, get_clock
+
+JobFunction = Callable[[], Coroutine[Any, Any, None]]
+
+SET_INTERVAL_ATTRIBUTE = "__set_interval__"
+
+
+class OverrunPolicy(Enum):
+    # Ticks missed while all runs were busy are dropped
+    SKIP = "skip"
+    # Ticks missed while all runs were busy make a single run
+    COALESCE = "coalesce"
+    # Every missed tick makes a run, started back to back to catch up
+    CATCH_UP = "catch_up"
+
+
+def get_first_deadline(
+    current_time: float, interval_time: float, phase: float
+) -> float:
+    """
+    Returns the first tick at least an interval time after the current
+    time, so that jobs never run before their data of one interval is
+    collected. Ticks are every interval time from the phase.
+    """
+    ticks_count = math.ceil(
+        (current_time + interval_time - phase) / interval_time
+    )
+
+    return phase + ticks_count * interval_time
+
+
+class ScheduledJob:
+    """
+    Periodic job of the scheduler, run at a fixed rate on ticks aligned to
+    absolute deadlines of the event loop time, so intervals neither drift
+    with the run times nor follow wall clock adjustments. A tick finding
+    max_concurrent_runs runs busy, or missed while the loop was late, is
+    handled by the overrun policy.
+    """
+
+    def __init__(
+        self,
+        func: JobFunction,
+        interval_time: float,
+        name: str,
+        overrun_policy: OverrunPolicy,
+        max_concurrent_runs: int,
+        deadline: float,
+    ):
+        self.func = func
+        self.interval_time = interval_time
+        self.name = name
+        self.overrun_policy = overrun_policy
+        self.max_concurrent_runs = max_concurrent_runs
+        self.deadline = deadline
+        # Delay of the last dispatch of the job after its tick
+        self.lateness = 0.0
+        self.runs: set[asyncio.Task] = set()
+        self.pending_runs_count = 0
+        self.is_removed = False
+        self._removed: asyncio.Future[None] | None = None
+
+    def get_due_runs_count(
+        self, due_ticks_count: int, free_runs_count: int
+    ) -> int:
+        """
+        Returns the number of runs to start for the ticks which are due,
+        including the ones missed, according to the overrun policy.
+        """
+        match self.overrun_policy:
+            case OverrunPolicy.SKIP:
+                return min(due_ticks_count, 1, free_runs_count)
+            case OverrunPolicy.COALESCE:
+                return max(self.pending_runs_count, 1)
+            case OverrunPolicy.CATCH_UP:
+                return self.pending_runs_count + due_ticks_count
+
+    async def wait_removed(self) -> None:
+        if self.is_removed:
+            return
+
+        if self._removed is None:
+            self._removed = asyncio.get_running_loop().create_future()
+
+        await asyncio.shield(self._removed)
+
+    def set_removed(self) -> None:
+        self.is_removed = True
+
+        for run in self.runs:
+            run.cancel()
+
+        if self._removed is not None and not self._removed.done():
+            self._removed.set_result(None)
+
+
+class Scheduler:
+    """
+    Process-wide scheduler of periodic jobs. Jobs are kept in a heap by
+    their next deadline, and a single timer set to the earliest deadline
+    dispatches all the due jobs at once. Only the runs of the jobs are
+    tasks, the scheduled jobs hold no coroutines, events or timers.
+    """
+
+    def __init__(self) -> None:
+        # Jobs as (deadline, order, job), removed jobs are dropped on pop
+        self._jobs: list[tuple[float, int, ScheduledJob]] = []
+        self._jobs_order = itertools.count()
+        self._timer: TimerHandle | None = None
+        self._timer_deadline = math.inf
+        self._timer_loop: asyncio.AbstractEventLoop | None = None
+        self._timer_clock: Clock | None = None
+
+    @property
+    def jobs_count(self) -> int:
+        return sum(1 for _, _, job in self._jobs if not job.is_removed)
+
+    def add_job(
+        self,
+        func: JobFunction,
+        interval_time: float,
+        name: str | None = None,
+        overrun_policy: OverrunPolicy = OverrunPolicy.COALESCE,
+        max_concurrent_runs: int = 1,
+        phase: float | None = None,
+    ) -> ScheduledJob:
+        """
+        Adds a job run every interval time. Ticks of the job are offset by
+        the phase, a random one by default, so that the jobs of many pairs
+        are spread over the interval.
+        """
+        if phase is None:
+            phase = random.uniform(0, interval_time)
+
+        job = ScheduledJob(
+            func=func,
+            interval_time=interval_time,
+            name=name or "unknown",
+            overrun_policy=overrun_policy,
+            max_concurrent_runs=max_concurrent_runs,
+            deadline=get_first_deadline(
+                get_clock().monotonic(), interval_time, phase
+            ),
+        )
+        self.__push(job)
+        self.__set_timer()
+
+        return job
+
+    def remove_job(self, job: ScheduledJob) -> None:
+        """
+        Removes the job and cancels its runs. The job leaves the heap when
+        its deadline comes.
+        """
+        job.set_removed()
+
+    def __push(self, job: ScheduledJob) -> None:
+        heapq.heappush(self._jobs, (job.deadline, next(self._jobs_order), job))
+
+    def __set_timer(self) -> None:
+        while self._jobs and self._jobs[0][2].is_removed:
+            heapq.heappop(self._jobs)
+
+        deadline = self._jobs[0][0] if self._jobs else math.inf
+        loop = asyncio.get_running_loop()
+        clock = get_clock()
+
+        # Timers of a previous event loop or clock never fire
+        if (
+            deadline >= self._timer_deadline
+            and loop is self._timer_loop
+            and clock is self._timer_clock
+        ):
+            return
+
+        # Timers of a closed loop cannot be cancelled anymore
+        if self._timer is not None and loop is self._timer_loop:
+            self._timer.cancel()
+        self._timer = None
+
+        self._timer_deadline = deadline
+        self._timer_loop = loop
+        self._timer_clock = clock
+        if deadline < math.inf:
+            self._timer = clock.call_at(deadline, self.__dispatch)
+
+    def __dispatch(self) -> None:
+        self._timer = None
+        self._timer_deadline = math.inf
+        current_time = get_clock().monotonic()
+        due_jobs: list[ScheduledJob] = []
+
+        while self._jobs and self._jobs[0][0] <= current_time:
+            _, _, job = heapq.heappop(self._jobs)
+            if not job.is_removed:
+                due_jobs.append(job)
+
+        SCHEDULER_DISPATCHED_JOBS.observe(len(due_jobs))
+
+        for job in due_jobs:
+            self.__dispatch_job(job, current_time)
+            self.__push(job)
+
+        self.__set_timer()
+
+    def __dispatch_job(self, job: ScheduledJob, current_time: float) -> None:
+        job.lateness = current_time - job.deadline
+        SCHEDULER_JOB_LATENESS.labels(job=job.name).observe(job.lateness)
+
+        due_ticks_count = math.floor(job.lateness / job.interval_time) + 1
+        job.deadline += due_ticks_count * job.interval_time
+
+        free_runs_count = job.max_concurrent_runs - len(job.runs)
+        if due_ticks_count > free_runs_count:
+            WORKER_MISSED_TICKS.labels(worker=job.name).inc(
+                due_ticks_count - max(free_runs_count, 0)
+            )
+
+        job.pending_runs_count = job.get_due_runs_count(
+            due_ticks_count, free_runs_count
+        )
+        self.__start_pending_runs(job)
+
+    def __start_pending_runs(self, job: ScheduledJob) -> None:
+        while (
+            job.pending_runs_count > 0
+            and len(job.runs) < job.max_concurrent_runs
+        ):
+            job.pending_runs_count -= 1
+            run = asyncio.create_task(self.__run(job))
+            job.runs.add(run)
+            run.add_done_callback(functools.partial(self.__on_run_done, job))
+
+    def __on_run_done(self, job: ScheduledJob, run: asyncio.Task) -> None:
+        job.runs.discard(run)
+
+        # Runs of missed ticks start as soon as a run frees its slot
+        if not job.is_removed:
+            self.__start_pending_runs(job)
+
+    async def __run(self, job: ScheduledJob) -> None:
+        clock = get_clock()
+        start_time = clock.monotonic()
+
+        try:
+            logging.debug("Worker function cycle started")
+            await job.func()
+        except Exception as err:
+            logging.exception(exc_info=err, msg="Error occurred")
+
+        time_spent = clock.monotonic() - start_time
+        if time_spent >= job.interval_time:
+            WORKER_INTERVAL_OVERRUNS.labels(worker=job.name).inc()
+            logging.warning(
+                f"Active work took longer than the interval time: {time_spent} seconds"
+                f" (interval time: {job.interval_time} seconds)"
+                f" (name: {job.name})"
+            )
+
+
+_scheduler = Scheduler()
+
+
+def get_scheduler() -> Scheduler:
+    return _scheduler
 
 
 class SetInterval:
-    def __init__(self, interval_time: float, name: str | None = None):
+    """
+    Decorates a job run periodically by the process scheduler. Awaiting the
+    decorated function runs the job until the awaiting task is cancelled,
+    while schedule adds the job to the scheduler without any waiting task.
+    """
+
+    def __init__(
+        self,
+        interval_time: float,
+        name: str | None = None,
+        overrun_policy: OverrunPolicy = OverrunPolicy.COALESCE,
+        max_concurrent_runs: int = 1,
+        phase: float | None = None,
+    ):
         self._interval_time = interval_time
-        self._is_interrupted = False
         self._name = name
+        self._overrun_policy = overrun_policy
+        self._max_concurrent_runs = max_concurrent_runs
+        self._phase = phase
+        self._func: Callable[..., Coroutine[Any, Any, None]] | None = None
 
     def __call__(
         self, func: Callable[..., Coroutine[Any, Any, None]]
     ) -> Callable[..., Coroutine[Any, Any, None]]:
+        self._func = func
+
         async def wrapper(*args: str, **kwargs: int) -> None:
-            await asyncio.sleep(self._interval_time)
-            while not self.get_is_interrupted():
-                try:
-                    logging.debug("Worker function cycle started")
-
-                    callback_event = asyncio.Event()
-                    start_time = get_current_time()
-
-                    asyncio.create_task(
-                        func(*args, callback_event=callback_event, **kwargs)
-                    )
-                    await callback_event.wait()
-                    callback_event.clear()
-
-                    time_spent = get_current_time() - start_time
-                    if time_spent < self._interval_time:
-                        await asyncio.sleep(self._interval_time - time_spent)
-                    else:
-                        logging.warning(
-                            f"Active work took longer than the interval time: {time_spent} seconds"
-                            f" (interval time: {self._interval_time} seconds)"
-                            f" (name: {self._name})"
-                        )
-                except Exception as err:
-                    logging.exception(exc_info=err, msg="Error occurred")
+            job = self.schedule(*args, **kwargs)
+
+            try:
+                await job.wait_removed()
+            finally:
+                get_scheduler().remove_job(job)
+
+        setattr(wrapper, SET_INTERVAL_ATTRIBUTE, self)
 
         return wrapper
 
-    def get_is_interrupted(self) -> bool:
-        return self._is_interrupted
+    def schedule(self, *args: Any, **kwargs: Any) -> ScheduledJob:
+        assert self._func is not None
+
+        return get_scheduler().add_job(
+            functools.partial(
+                self._func, *args, callback_event=None, **kwargs
+            ),
+            interval_time=self._interval_time,
+            name=self._name,
+            overrun_policy=self._overrun_policy,
+            max_concurrent_runs=self._max_concurrent_runs,
+            phase=self._phase,
+        )
+
+
+def get_set_interval(
+    func: Callable[..., Coroutine[Any, Any, None]]
+) -> SetInterval:
+    """
+    Returns the schedule the function is decorated with by SetInterval.
+    """
+    return cast(SetInterval, getattr(func, SET_INTERVAL_ATTRIBUTE))
@@ -1,5 +1,9 @@
+import asyncio
+import heapq
+import itertools
 import time as t
-from datetime import datetime, time
+from datetime import datetime, time, timezone
+from typing import Any, Callable, Protocol
 
 
 class TradingSession:
@@ -27,7 +31,7 @@ NEW_YORK_TRADING_SESSION = TradingSession(
 def is_current_time_inside_trading_sessions(
     trading_sessions: list[TradingSession],
 ) -> bool:
-    current_time = datetime.utcnow()
+    current_time = datetime.fromtimestamp(get_current_time(), tz=timezone.utc)
 
     # Ignore weekends
     if current_time.weekday() >= 5:  # 5 is Saturday, 6 is Sunday
@@ -40,5 +44,116 @@ def is_current_time_inside_trading_sessions(
     return False
 
 
+class TimerHandle(Protocol):
+    def cancel(self) -> Any:
+        pass
+
+
+class Clock:
+    def time(self) -> float:
+        return t.time()
+
+    def monotonic(self) -> float:
+        """
+        Time of the event loop, which NTP adjustments of the wall clock
+        don't affect. Used for deadlines of the scheduled jobs.
+        """
+        return asyncio.get_running_loop().time()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    def call_at(self, when: float, callback: Callable[[], Any]) -> TimerHandle:
+        return asyncio.get_running_loop().call_at(when, callback)
+
+
+class ReplayClock(Clock):
+    """
+    Clock following the time of a replayed feed, which is advanced by the
+    replay collectors with every frame. Sleeps end once the replayed time
+    reaches them, however fast the feed is replayed.
+    """
+
+    def __init__(self, start_time: float = 0.0):
+        self.start_time = start_time
+        self._time = start_time
+        # Monotonic time at which the replay of the start time began
+        self._replay_started_at: float | None = None
+        # Sleeping callers as (wake up time, order, future)
+        self._sleepers: list[tuple[float, int, asyncio.Future[None]]] = []
+        self._sleepers_order = itertools.count()
+
+    def time(self) -> float:
+        return self._time
+
+    def monotonic(self) -> float:
+        return self._time
+
+    def get_replay_deadline(self, replayed_time: float, speed: float) -> float:
+        """
+        Returns the monotonic time at which the replayed time is due at the
+        speed. All pairs are paced from the start time, which is replayed
+        when the first pair asks for a deadline.
+        """
+        if self._replay_started_at is None:
+            self._replay_started_at = t.monotonic()
+
+        return (
+            self._replay_started_at + (replayed_time - self.start_time) / speed
+        )
+
+    def advance_to(self, current_time: float) -> None:
+        self._time = max(self._time, current_time)
+
+        while self._sleepers and self._sleepers[0][0] <= self._time:
+            _, _, future = heapq.heappop(self._sleepers)
+            if not future.done():
+                future.set_result(None)
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+
+        future: asyncio.Future[
+            None
+        ] = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._sleepers,
+            (self._time + seconds, next(self._sleepers_order), future),
+        )
+
+        await future
+
+    def call_at(self, when: float, callback: Callable[[], Any]) -> TimerHandle:
+        future: asyncio.Future[
+            None
+        ] = asyncio.get_running_loop().create_future()
+        future.add_done_callback(
+            lambda done_future: done_future.cancelled() or callback()
+        )
+
+        if when <= self._time:
+            future.set_result(None)
+        else:
+            heapq.heappush(
+                self._sleepers, (when, next(self._sleepers_order), future)
+            )
+
+        return future
+
+
+_clock = Clock()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(clock: Clock) -> None:
+    global _clock
+    _clock = clock
+
+
 def get_current_time() -> float:
-    return t.time()
+    return _clock.time()
@@ -0,0 +1,74 @@
+"""
+Compares JSON decoders on exchange frames, read from files with one raw
+frame per line or from FrameRecorder files (.jsonl.gz).
+
+The bundled sample frames are synthetic, generated in the shape of the
+exchange messages. Recorded frames give the figures of real traffic.
+
+Usage: python -m benchmarks.json_decoder_benchmark [FRAMES_FILE ...]
+"""
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+from app.infrastructure.clients.frame_recorder import read_frames
+
+FRAMES_DIRECTORY = Path(__file__).parent / "frames"
+
+
+def get_decoders() -> dict[str, Callable[[bytes], Any]]:
+    decoders: dict[str, Callable[[bytes], Any]] = {
+        "json": json.loads,
+        "json (str)": lambda frame: json.loads(frame.decode()),
+    }
+
+    try:
+        import orjson
+
+        decoders["orjson"] = orjson.loads
+    except ImportError:
+        pass
+
+    return decoders
+
+
+def read_benchmark_frames(frames_path: Path) -> list[bytes]:
+    # Recorded frames are benchmarked as received, without the envelope
+    if frames_path.name.endswith(".jsonl.gz"):
+        return [frame.frame.encode() for frame in read_frames(frames_path)]
+
+    return frames_path.read_bytes().splitlines()
+
+
+def benchmark(frames_path: Path, repeat: int = 5, number: int = 20) -> None:
+    frames = read_benchmark_frames(frames_path)
+    frames_size = sum(len(frame) for frame in frames)
+
+    print(f"{frames_path.name}: {len(frames)} frames, {frames_size} bytes")
+
+    for name, decode in get_decoders().items():
+        best_time = min(
+            timeit.repeat(
+                lambda: [decode(frame) for frame in frames],
+                repeat=repeat,
+                number=number,
+            )
+        )
+        frame_time = best_time / number / len(frames)
+        throughput = frames_size * number / best_time / 1024 / 1024
+
+        print(
+            f"  {name:<12} {frame_time * 1e6:10.2f} us/frame "
+            f"{throughput:10.2f} MiB/s"
+        )
+
+
+if __name__ == "__main__":
+    paths = [Path(path) for path in sys.argv[1:]] or sorted(
+        FRAMES_DIRECTORY.glob("*.jsonl")
+    )
+
+    for path in paths:
+        benchmark(path)
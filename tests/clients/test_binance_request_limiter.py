@@ -0,0 +1,71 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.infrastructure.clients.order_book_client.binance_request_limiter import \
+    BinanceRequestWeightLimiter
+
+LIMITER_MODULE = (
+    "app.infrastructure.clients.order_book_client.binance_request_limiter"
+)
+
+
+async def test_requests_over_budget_wait_for_next_minute_by_priority() -> None:
+    now = [120.0]
+    sleep = asyncio.sleep
+
+    async def skip_sleep(_: float) -> None:
+        await sleep(0)
+
+    with patch(
+        f"{LIMITER_MODULE}.time.time", side_effect=lambda: now[0]
+    ), patch(f"{LIMITER_MODULE}.asyncio.sleep", side_effect=skip_sleep):
+        limiter = BinanceRequestWeightLimiter(weight_per_minute=100)
+        await limiter.acquire(50)
+        await limiter.acquire(50)
+
+        released: list[str] = []
+
+        async def acquire(name: str, priority: int) -> None:
+            await limiter.acquire(50, priority=priority)
+            released.append(name)
+
+        tasks = [
+            asyncio.create_task(acquire("initial", priority=1)),
+            asyncio.create_task(acquire("resync", priority=0)),
+            asyncio.create_task(acquire("next_initial", priority=1)),
+        ]
+        await asyncio.sleep(0)
+        assert released == []
+
+        now[0] = 180.0
+        await asyncio.wait(tasks, timeout=0.1)
+
+        assert released == ["resync", "initial"]
+
+        now[0] = 240.0
+        await asyncio.wait(tasks, timeout=0.1)
+
+        assert released == ["resync", "initial", "next_initial"]
+
+
+async def test_used_weight_is_synced_with_exchange() -> None:
+    limiter = BinanceRequestWeightLimiter(weight_per_minute=100)
+    limiter.update_used_weight(80)
+
+    acquire_task = asyncio.create_task(limiter.acquire(50))
+    await asyncio.sleep(0)
+
+    assert not acquire_task.done()
+    acquire_task.cancel()
+
+
+async def test_request_heavier_than_budget_is_rejected() -> None:
+    limiter = BinanceRequestWeightLimiter(weight_per_minute=100)
+
+    with pytest.raises(ValueError, match="exceeds the budget"):
+        await limiter.acquire(101)
+
+    # Requests within the budget are not held back by the rejected one
+    await asyncio.wait_for(limiter.acquire(100), timeout=1)
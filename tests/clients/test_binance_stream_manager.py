@@ -0,0 +1,50 @@
+from app.infrastructure.clients.order_book_client.binance_stream_manager import (
+    BinanceCombinedStreamConnection, BinanceStreamManager)
+
+
+def test_combined_stream_frames_are_routed_by_stream_name() -> None:
+    connection = BinanceCombinedStreamConnection()
+
+    assert connection._get_uri(["btcusdt@depth", "ethusdt@depth"]) == (
+        "wss://stream.binance.com:9443/stream"
+        "?streams=btcusdt@depth/ethusdt@depth"
+    )
+    assert connection._route(
+        {"stream": "btcusdt@depth", "data": {"u": 1}}
+    ) == ("btcusdt@depth", {"u": 1})
+    assert connection._route({"result": None, "id": 1}) is None
+
+
+async def test_streams_are_sharded_across_connections() -> None:
+    stream_manager = BinanceStreamManager(max_streams_per_connection=2)
+    streams = [f"pair{i}@depth" for i in range(5)]
+
+    # Connections are closed before they get a chance to connect
+    queues = [stream_manager.subscribe(stream) for stream in streams]
+
+    assert stream_manager.connections_count == 3
+
+    stream_manager.unsubscribe(streams[0], queues[0])
+    stream_manager.unsubscribe(streams[1], queues[1])
+
+    assert stream_manager.connections_count == 2
+
+    for stream, queue in zip(streams[2:], queues[2:]):
+        stream_manager.unsubscribe(stream, queue)
+
+    assert stream_manager.connections_count == 0
+
+
+async def test_stale_unsubscription_keeps_new_subscription() -> None:
+    stream_manager = BinanceStreamManager(max_streams_per_connection=1)
+
+    # A restarted collector subscribes before the previous one unsubscribed
+    old_queue = stream_manager.subscribe("btcusdt@depth")
+    new_queue = stream_manager.subscribe("btcusdt@depth")
+    stream_manager.unsubscribe("btcusdt@depth", old_queue)
+
+    assert stream_manager.connections_count == 1
+
+    stream_manager.unsubscribe("btcusdt@depth", new_queue)
+
+    assert stream_manager.connections_count == 0
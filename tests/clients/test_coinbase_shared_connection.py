@@ -0,0 +1,68 @@
+import asyncio
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from app.application.collectors.synthetic_collector import SyntheticCollector
+from app.infrastructure.clients.order_book_client.coinbase_shared_connection import \
+    CoinbaseSharedConnection
+from app.infrastructure.clients.order_book_client.coinbase_websocket_client import \
+    CoinbaseWebsocketClient
+from app.infrastructure.clients.order_book_client.schemas.common import \
+    OrderBookSnapshot
+from app.infrastructure.clients.shared_websocket_connection import \
+    SharedConnectionClosedError
+from app.infrastructure.exchange_emulator.coinbase_emulator import \
+    CoinbaseEmulator
+from app.infrastructure.exchange_emulator.emulated_book import EmulatedBook
+from app.infrastructure.exchange_emulator.exchange_emulator import \
+    FaultInjection
+
+
+def test_messages_are_routed_by_product_id() -> None:
+    connection = CoinbaseSharedConnection()
+    update = {
+        "type": "l2update",
+        "product_id": "ETH-USD",
+        "time": "2023-10-10T10:00:00.000000Z",
+        "changes": [["buy", "1500.00", "1.0"]],
+    }
+
+    assert connection._route(update) == ("ETH-USD", update)
+    assert connection._route({"type": "subscriptions", "channels": []}) is None
+    assert connection._route({"type": "heartbeat"}) is None
+
+
+async def test_subscribers_are_notified_when_connection_is_closed() -> None:
+    source = SyntheticCollector(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        symbol="BTC/USD",
+        delimiter=Decimal("0.1"),
+        seed=1,
+    )
+    # The connection is closed before the first update after the snapshot
+    emulator = CoinbaseEmulator(
+        [EmulatedBook("BTC/USD", source.listen_stream())],
+        faults=FaultInjection(disconnect_probability=1.0),
+    )
+    await emulator.start()
+
+    connection = CoinbaseSharedConnection(uri=emulator.uri)
+    events = CoinbaseWebsocketClient(
+        "BTC/USD", connection=connection
+    ).listen_depth_stream()
+
+    try:
+        async with asyncio.timeout(5):
+            assert isinstance(await anext(events), OrderBookSnapshot)
+
+            # The collector is restarted and resyncs with a new snapshot
+            with pytest.raises(SharedConnectionClosedError):
+                await anext(events)
+    finally:
+        await events.aclose()
+        await emulator.close()
+
+    assert connection.subscriptions_count == 0
@@ -0,0 +1,35 @@
+import json
+from decimal import Decimal
+from typing import AsyncIterator
+
+from app.infrastructure.clients.order_book_client.coinbase_websocket_client import \
+    CoinbaseWebsocketClient
+from app.infrastructure.clients.order_book_client.schemas.common import \
+    OrderBookUpdate
+
+
+async def test_changes_of_unknown_sides_are_skipped() -> None:
+    async def read_frames() -> AsyncIterator[str]:
+        yield json.dumps(
+            {
+                "type": "l2update",
+                "product_id": "BTC-USD",
+                "time": "2023-10-10T10:00:00.000000Z",
+                "changes": [
+                    ["buy", "26999.99", "1.5"],
+                    ["sell", "27000.01", "0.5"],
+                    ["unknown", "27000.02", "2.0"],
+                ],
+            }
+        )
+
+    client = CoinbaseWebsocketClient("BTC/USD")
+
+    events = [event async for event in client.listen_frames(read_frames())]
+
+    assert events == [
+        OrderBookUpdate(
+            a={Decimal("27000.01"): Decimal("0.5")},
+            b={Decimal("26999.99"): Decimal("1.5")},
+        )
+    ]
@@ -0,0 +1,193 @@
+import asyncio
+from decimal import Decimal
+from typing import AsyncIterator
+from uuid import UUID
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.application.collectors.synthetic_collector import SyntheticCollector
+from app.infrastructure.clients.http_client_pool import close_http_client
+from app.infrastructure.clients.order_book_client.binance_http_client import \
+    BinanceHttpClient
+from app.infrastructure.clients.order_book_client.binance_websocket_client import \
+    BinanceWebsocketClient
+from app.infrastructure.clients.order_book_client.coinbase_websocket_client import \
+    CoinbaseWebsocketClient
+from app.infrastructure.clients.order_book_client.kraken_websocket_client import \
+    KrakenWebsocketClient
+from app.infrastructure.clients.order_book_client.schemas.binance import \
+    BinanceOrderBookDepthUpdate
+from app.infrastructure.clients.order_book_client.schemas.common import (
+    OrderBookEvent, OrderBookSnapshot)
+from app.infrastructure.exchange_emulator.binance_emulator import \
+    BinanceEmulator
+from app.infrastructure.exchange_emulator.coinbase_emulator import \
+    CoinbaseEmulator
+from app.infrastructure.exchange_emulator.emulated_book import EmulatedBook
+from app.infrastructure.exchange_emulator.exchange_emulator import \
+    FaultInjection
+from app.infrastructure.exchange_emulator.kraken_emulator import KrakenEmulator
+from app.utilities.fixed_point_utils import (DecimalScale, LevelDecoder,
+                                             LevelValue)
+
+Book = dict[str, dict[LevelValue, LevelValue]]
+
+
+def create_source(symbol: str) -> SyntheticCollector:
+    return SyntheticCollector(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        symbol=symbol,
+        delimiter=Decimal("0.1"),
+        depth=150,
+        update_rate=500,
+        price_drift=2.0,
+        seed=1,
+        max_updates=200,
+    )
+
+
+def apply_event(book: Book, event: OrderBookEvent) -> None:
+    decoder = LevelDecoder(DecimalScale())
+    if isinstance(event, OrderBookSnapshot):
+        book["a"], book["b"] = {}, {}
+
+    for side, levels in (("a", event.a), ("b", event.b)):
+        for price, quantity in decoder.decode(levels).items():
+            if quantity == 0:
+                book[side].pop(price, None)
+            else:
+                book[side][price] = quantity
+
+
+async def follow_book(
+    events: AsyncIterator[OrderBookEvent | None],
+    source: SyntheticCollector,
+    emulated_book: EmulatedBook,
+    depth: int | None = None,
+) -> Book:
+    """
+    Applies the events until the source is over and the book matches the
+    emulated one within the depth.
+    """
+    book: Book = {"a": {}, "b": {}}
+
+    async def follow() -> None:
+        async for event in events:
+            if event is not None:
+                apply_event(book, event)
+
+            if source.is_interrupted and book == {
+                "a": dict(emulated_book.top_asks(depth or 10**6)),
+                "b": dict(emulated_book.top_bids(depth or 10**6)),
+            }:
+                return
+
+    await asyncio.wait_for(follow(), timeout=10)
+
+    return book
+
+
+def get_checksum_mismatches_count() -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "order_book_checksum_mismatches_total",
+            {"exchange": "KRAKEN", "symbol": "XBT/USD"},
+        )
+        or 0.0
+    )
+
+
+async def test_binance_clients_follow_emulated_book() -> None:
+    source = create_source("BTC/USDT")
+    emulated_book = EmulatedBook("BTC/USDT", source.listen_stream())
+    emulator = BinanceEmulator([emulated_book])
+    await emulator.start()
+
+    ws_client = BinanceWebsocketClient("BTC/USDT", uri=emulator.uri)
+    http_client = BinanceHttpClient("BTC/USDT", api_uri=emulator.http_uri)
+
+    async def listen_synced_stream() -> AsyncIterator[OrderBookEvent | None]:
+        updates = ws_client.listen_depth_stream()
+        first_update = await updates.__anext__()
+        assert isinstance(first_update, BinanceOrderBookDepthUpdate)
+        snapshot = await http_client.fetch_order_book_snapshot()
+        assert snapshot is not None
+        assert first_update.first_update_id <= snapshot.last_update_id + 1
+        yield snapshot
+
+        last_update_id = snapshot.last_update_id
+        async for update in updates:
+            if update.final_update_id <= last_update_id:
+                continue
+
+            # Update ids of the emulated stream have no gaps
+            assert update.first_update_id == last_update_id + 1
+            last_update_id = update.final_update_id
+            yield update
+
+    try:
+        await follow_book(listen_synced_stream(), source, emulated_book)
+    finally:
+        await emulator.close()
+        await close_http_client()
+
+
+async def test_binance_emulator_rejects_unknown_symbols() -> None:
+    source = create_source("BTC/USDT")
+    emulator = BinanceEmulator(
+        [EmulatedBook("BTC/USDT", source.listen_stream())]
+    )
+    await emulator.start()
+
+    try:
+        http_client = BinanceHttpClient("ETH/USDT", api_uri=emulator.http_uri)
+
+        assert await http_client.fetch_order_book_snapshot() is None
+    finally:
+        await emulator.close()
+        await close_http_client()
+
+
+async def test_coinbase_client_follows_emulated_book() -> None:
+    source = create_source("BTC/USD")
+    emulated_book = EmulatedBook("BTC/USD", source.listen_stream())
+    emulator = CoinbaseEmulator([emulated_book])
+    await emulator.start()
+
+    client = CoinbaseWebsocketClient("BTC/USD", uri=emulator.uri)
+
+    try:
+        await follow_book(client.listen_depth_stream(), source, emulated_book)
+    finally:
+        await emulator.close()
+
+
+@pytest.mark.parametrize("gap_probability", [0.0, 0.1])
+async def test_kraken_client_follows_emulated_book(
+    gap_probability: float,
+) -> None:
+    source = create_source("XBT/USD")
+    emulated_book = EmulatedBook("XBT/USD", source.listen_stream())
+    # Gaps fail the checksums, which makes the client resubscribe
+    emulator = KrakenEmulator(
+        [emulated_book],
+        faults=FaultInjection(gap_probability=gap_probability),
+        seed=1,
+    )
+    await emulator.start()
+
+    client = KrakenWebsocketClient("XBT/USD", uri=emulator.uri)
+    mismatches_count = get_checksum_mismatches_count()
+
+    try:
+        await follow_book(
+            client.listen_depth_stream(), source, emulated_book, depth=100
+        )
+    finally:
+        await emulator.close()
+
+    assert (get_checksum_mismatches_count() > mismatches_count) == (
+        gap_probability > 0
+    )
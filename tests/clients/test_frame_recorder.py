@@ -0,0 +1,54 @@
+import asyncio
+from pathlib import Path
+
+from app.infrastructure.clients.frame_recorder import (FrameRecorder,
+                                                       RecordedFrame,
+                                                       read_frames)
+
+
+async def test_frames_are_recorded_into_rotated_files(tmp_path: Path) -> None:
+    recorder = FrameRecorder(
+        directory=tmp_path,
+        exchange_name="BINANCE",
+        symbol="BTC/USDT",
+        rotation_interval=60,
+    )
+
+    recorder.record(
+        b'{"lastUpdateId": 1}', kind="snapshot", received_at=10**9
+    )
+    recorder.record('{"u": 2}', received_at=59 * 10**9)
+    recorder.record('{"u": 3}', received_at=61 * 10**9)
+    await recorder.close()
+
+    paths = sorted((tmp_path / "binance" / "BTCUSDT").iterdir())
+
+    assert [path.name for path in paths] == [
+        "19700101T000000.jsonl.gz",
+        "19700101T000100.jsonl.gz",
+    ]
+    assert list(read_frames(paths[0])) == [
+        RecordedFrame(10**9, "snapshot", '{"lastUpdateId": 1}'),
+        RecordedFrame(59 * 10**9, "ws", '{"u": 2}'),
+    ]
+    assert list(read_frames(paths[1])) == [
+        RecordedFrame(61 * 10**9, "ws", '{"u": 3}')
+    ]
+
+
+async def test_frames_over_buffer_size_are_dropped(tmp_path: Path) -> None:
+    recorder = FrameRecorder(
+        directory=tmp_path,
+        exchange_name="KRAKEN",
+        symbol="XBT/USD",
+        buffer_size=2,
+    )
+
+    for update_id in range(5):
+        recorder.record(f"[{update_id}]")
+    await asyncio.sleep(0)
+    await recorder.close()
+
+    (path,) = (tmp_path / "kraken" / "XBTUSD").iterdir()
+
+    assert [frame.frame for frame in read_frames(path)] == ["[0]", "[1]"]
@@ -0,0 +1,48 @@
+import zlib
+from decimal import Decimal
+
+from app.infrastructure.clients.order_book_client.kraken_checksum_book import (
+    KrakenChecksumBook, KrakenLevel, to_checksum_string)
+
+
+def create_levels(levels: list[tuple[str, str]]) -> list[KrakenLevel]:
+    return [
+        (Decimal(price), Decimal(volume), price, volume)
+        for price, volume in levels
+    ]
+
+
+def test_checksum_string_strips_point_and_leading_zeros() -> None:
+    assert to_checksum_string("0.05005") == "5005"
+    assert to_checksum_string("0.00000500") == "500"
+
+
+def test_checksum_follows_book_updates() -> None:
+    book = KrakenChecksumBook(depth=3)
+    book.apply_snapshot(
+        asks=create_levels(
+            [("0.05005", "0.00000500"), ("0.05010", "0.00000500")]
+        ),
+        bids=create_levels(
+            [("0.05000", "0.00000500"), ("0.04995", "0.00000500")]
+        ),
+    )
+
+    assert book.checksum() == str(
+        zlib.crc32(b"50055005010500" + b"50005004995500")
+    )
+
+    removed_asks, removed_bids = book.apply_update(
+        asks=create_levels(
+            [("0.05005", "0.00000000"), ("0.05020", "0.00000100")]
+        ),
+        bids=create_levels(
+            [("0.04990", "0.00000100"), ("0.04985", "0.00000100")]
+        ),
+    )
+
+    assert removed_asks == []
+    assert [str(price) for price in removed_bids] == ["0.04985"]
+    assert book.checksum() == str(
+        zlib.crc32(b"50105005020100" + b"50005004995500" + b"4990100")
+    )
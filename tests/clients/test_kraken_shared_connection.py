@@ -0,0 +1,94 @@
+import asyncio
+import itertools
+import json
+
+import pytest
+import websockets
+from websockets import WebSocketServerProtocol
+
+from app.infrastructure.clients.order_book_client.kraken_shared_connection import \
+    KrakenSharedConnection
+from app.infrastructure.clients.shared_websocket_connection import (
+    SharedConnectionClosedError, get_message)
+from app.utilities.reconnect_utils import ReconnectPolicy
+
+
+class FastReconnectingKrakenConnection(KrakenSharedConnection):
+    reconnect_policy = ReconnectPolicy(initial_delay=0.01, jitter=0)
+
+
+def test_messages_are_routed_by_channel_id_and_pair() -> None:
+    connection = KrakenSharedConnection()
+    update = [
+        42,
+        {"a": [["5541.30000", "2.50700000", "1534614248.456738"]]},
+        {"b": [["5541.20000", "1.52900000", "1534614248.765567"]]},
+        "book-100",
+        "XBT/USD",
+    ]
+
+    assert connection._route(update) == ("XBT/USD", update)
+
+    connection._route(
+        {
+            "channelID": 42,
+            "channelName": "book-100",
+            "event": "subscriptionStatus",
+            "pair": "ETH/USD",
+            "status": "subscribed",
+        }
+    )
+
+    assert connection._route(update) == ("ETH/USD", update)
+    assert connection._route({"event": "heartbeat"}) is None
+
+
+async def test_channel_ids_are_forgotten_on_reconnect() -> None:
+    update = [
+        1,
+        {"a": [["1500.10000", "2.50700000", "1534614248.456738"]]},
+        "book-100",
+        "ETH/USD",
+    ]
+    connections_count = itertools.count()
+
+    async def handle_connection(websocket: WebSocketServerProtocol) -> None:
+        await websocket.recv()
+
+        # The channel id of the first socket is reused by the second one
+        if next(connections_count) == 0:
+            await websocket.send(
+                json.dumps(
+                    {
+                        "channelID": 1,
+                        "channelName": "book-100",
+                        "event": "subscriptionStatus",
+                        "pair": "XBT/USD",
+                        "status": "subscribed",
+                    }
+                )
+            )
+        else:
+            await websocket.send(json.dumps(update))
+            await websocket.wait_closed()
+
+    async with websockets.serve(handle_connection, "127.0.0.1", 0) as server:
+        port = list(server.sockets)[0].getsockname()[1]
+        connection = FastReconnectingKrakenConnection(
+            uri=f"ws://127.0.0.1:{port}"
+        )
+        xbt_queue = connection.subscribe("XBT/USD")
+        eth_queue = connection.subscribe("ETH/USD")
+
+        try:
+            async with asyncio.timeout(5):
+                with pytest.raises(SharedConnectionClosedError):
+                    await get_message(eth_queue)
+
+                assert await get_message(eth_queue) == update
+        finally:
+            connection.unsubscribe("XBT/USD", xbt_queue)
+            connection.unsubscribe("ETH/USD", eth_queue)
+
+    assert isinstance(xbt_queue.get_nowait(), SharedConnectionClosedError)
+    assert xbt_queue.empty()
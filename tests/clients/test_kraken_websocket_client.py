@@ -0,0 +1,145 @@
+import asyncio
+import zlib
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+from app.infrastructure.clients.frame_recorder import FrameRecorder
+from app.infrastructure.clients.order_book_client.kraken_shared_connection import \
+    KrakenSharedConnection
+from app.infrastructure.clients.order_book_client.kraken_websocket_client import \
+    KrakenWebsocketClient
+from app.infrastructure.clients.order_book_client.schemas.common import (
+    OrderBookSnapshot, OrderBookUpdate)
+
+
+class MockKrakenSharedConnection(KrakenSharedConnection):
+    def __init__(self, messages: list) -> None:
+        super().__init__()
+        self._messages = messages
+
+    def subscribe(
+        self, topic: str, recorder: FrameRecorder | None = None
+    ) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        for message in self._messages:
+            queue.put_nowait(message)
+        return queue
+
+    def unsubscribe(self, topic: str, queue: asyncio.Queue) -> bool:
+        return True
+
+
+async def test_book_messages_are_parsed_into_events() -> None:
+    update_checksum = zlib.crc32(b"5010500" + b"5000600")
+    next_update_checksum = zlib.crc32(b"50105005020100" + b"5000600")
+    connection = MockKrakenSharedConnection(
+        [
+            {"event": "subscriptionStatus", "status": "subscribed"},
+            [
+                42,
+                {
+                    "as": [["0.05005", "0.00000500", "1"]],
+                    "bs": [["0.05000", "0.00000500", "1"]],
+                },
+                "book-100",
+                "XBT/USD",
+            ],
+            [
+                42,
+                {
+                    "a": [
+                        ["0.05005", "0.00000000", "2"],
+                        ["0.05010", "0.00000500", "2"],
+                    ]
+                },
+                {
+                    "b": [["0.05000", "0.00000600", "2"]],
+                    "c": str(update_checksum),
+                },
+                "book-100",
+                "XBT/USD",
+            ],
+            [
+                42,
+                {
+                    "a": [["0.05020", "0.00000100", "3"]],
+                    "c": str(next_update_checksum),
+                },
+                "book-100",
+                "XBT/USD",
+            ],
+        ]
+    )
+    client = KrakenWebsocketClient(symbol="XBT/USD", connection=connection)
+
+    events = []
+
+    async def read_events() -> None:
+        async for event in client.listen_depth_stream():
+            if event is not None:
+                events.append(event)
+            if len(events) == 3:
+                return
+
+    await asyncio.wait_for(read_events(), timeout=1)
+
+    assert events[0] == OrderBookSnapshot(
+        a={Decimal("0.05005"): Decimal("0.00000500")},
+        b={Decimal("0.05000"): Decimal("0.00000500")},
+    )
+    assert events[1] == OrderBookUpdate(
+        a={
+            Decimal("0.05005"): Decimal("0"),
+            Decimal("0.05010"): Decimal("0.00000500"),
+        },
+        b={Decimal("0.05000"): Decimal("0.00000600")},
+    )
+    assert events[2] == OrderBookUpdate(
+        a={Decimal("0.05020"): Decimal("0.00000100")}, b={}
+    )
+
+
+async def test_republished_levels_are_applied() -> None:
+    # The checksum only matches with the republished volume
+    update_checksum = zlib.crc32(b"5005700" + b"5000500")
+    connection = MockKrakenSharedConnection(
+        [
+            [
+                42,
+                {
+                    "as": [["0.05005", "0.00000500", "1"]],
+                    "bs": [["0.05000", "0.00000500", "1"]],
+                },
+                "book-100",
+                "XBT/USD",
+            ],
+            [
+                42,
+                {
+                    "a": [["0.05005", "0.00000700", "2", "r"]],
+                    "c": str(update_checksum),
+                },
+                "book-100",
+                "XBT/USD",
+            ],
+        ]
+    )
+    client = KrakenWebsocketClient(symbol="XBT/USD", connection=connection)
+    events = []
+
+    async def read_events() -> None:
+        async for event in client.listen_depth_stream():
+            if event is not None:
+                events.append(event)
+            if len(events) == 2:
+                return
+
+    with patch.object(
+        connection, "resubscribe", new_callable=AsyncMock
+    ) as resubscribe_mock:
+        await asyncio.wait_for(read_events(), timeout=1)
+
+    assert events[1] == OrderBookUpdate(
+        a={Decimal("0.05005"): Decimal("0.00000700")}, b={}
+    )
+    resubscribe_mock.assert_not_awaited()
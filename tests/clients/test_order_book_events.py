@@ -0,0 +1,32 @@
+import pytest
+
+from app.infrastructure.clients.common import EventTypeEnum
+from app.infrastructure.clients.order_book_client.schemas.binance import \
+    BinanceOrderBookDepthUpdate
+from app.infrastructure.clients.order_book_client.schemas.common import (
+    OrderBookSnapshot, OrderBookUpdate)
+
+
+def test_events_compare_by_type_and_fields() -> None:
+    update = BinanceOrderBookDepthUpdate(
+        b={1: 2}, a={}, event_time=1, first_update_id=2, final_update_id=3
+    )
+
+    assert update.event_type == EventTypeEnum.UPDATE
+    assert OrderBookSnapshot(a={}, b={}).event_type == EventTypeEnum.INIT
+    assert OrderBookUpdate(a={1: 2}, b={}) == OrderBookUpdate(a={1: 2}, b={})
+    assert OrderBookUpdate(a={}, b={}) != OrderBookSnapshot(a={}, b={})
+    assert update != BinanceOrderBookDepthUpdate(
+        b={1: 2}, a={}, event_time=1, first_update_id=2, final_update_id=4
+    )
+    assert repr(update) == (
+        "BinanceOrderBookDepthUpdate(b={1: 2}, a={}, event_time=1, "
+        "first_update_id=2, final_update_id=3)"
+    )
+
+
+def test_events_have_no_instance_dict() -> None:
+    update = OrderBookUpdate(a={}, b={})
+
+    with pytest.raises(AttributeError):
+        update.extra = 1  # type: ignore[attr-defined]
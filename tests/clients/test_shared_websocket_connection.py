@@ -0,0 +1,57 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+import pytest
+from websockets import WebSocketClientProtocol
+
+from app.infrastructure.clients.shared_websocket_connection import \
+    SharedWebsocketConnection
+from app.utilities.reconnect_utils import ReconnectPolicy, get_circuit_breaker
+
+
+@dataclass(frozen=True)
+class RecordingReconnectPolicy(ReconnectPolicy):
+    delays: list[float] = field(default_factory=list)
+
+    def get_delay(self, attempt: int) -> float:
+        delay = super().get_delay(attempt)
+        self.delays.append(delay)
+
+        return delay
+
+
+class EchoSharedConnection(SharedWebsocketConnection):
+    async def _send_subscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        pass
+
+    async def _send_unsubscribe(
+        self, websocket: WebSocketClientProtocol, topics: list[str]
+    ) -> None:
+        pass
+
+    def _route(self, message: Any) -> tuple[str, Any] | None:
+        return message["topic"], message
+
+
+async def test_failed_connections_are_backed_off_until_breaker_opens() -> None:
+    # Nothing listens on the port, so every connection attempt is refused
+    connection = EchoSharedConnection(uri="ws://127.0.0.1:9")
+    connection.host = "refused.example.com"
+    reconnect_policy = RecordingReconnectPolicy(initial_delay=0.01, jitter=0)
+    connection.reconnect_policy = reconnect_policy
+    circuit_breaker = get_circuit_breaker(connection.host)
+
+    queue = connection.subscribe("BTC/USDT")
+    try:
+        async with asyncio.timeout(5):
+            while not circuit_breaker.is_open:
+                await asyncio.sleep(0.01)
+    finally:
+        connection.unsubscribe("BTC/USDT", queue)
+
+    assert reconnect_policy.delays == pytest.approx(
+        [0.01, 0.02, 0.04, 0.08, 0.16]
+    )
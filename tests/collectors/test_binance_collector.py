@@ -0,0 +1,95 @@
+import asyncio
+from decimal import Decimal
+from typing import AsyncGenerator
+from uuid import UUID
+
+from app.application.collectors.binance_collector import BinanceCollector
+from app.infrastructure.clients.order_book_client.schemas.binance import (
+    BinanceOrderBookDepthUpdate, BinanceOrderBookSnapshot)
+from app.infrastructure.clients.order_book_client.schemas.common import \
+    OrderBookEvent
+
+
+class MockBinanceHttpClient:
+    def __init__(self, snapshots: list[BinanceOrderBookSnapshot]):
+        self.snapshots = snapshots
+        self.priorities: list[int] = []
+
+    async def fetch_order_book_snapshot(
+        self, priority: int = 0
+    ) -> BinanceOrderBookSnapshot:
+        self.priorities.append(priority)
+        return self.snapshots.pop(0)
+
+
+class MockBinanceWebsocketClient:
+    def __init__(self, updates: list[BinanceOrderBookDepthUpdate]):
+        self.updates = updates
+        self.connections_count = 0
+
+    async def listen_depth_stream(
+        self,
+    ) -> AsyncGenerator[BinanceOrderBookDepthUpdate, None]:
+        self.connections_count += 1
+        for update in self.updates:
+            await asyncio.sleep(0)
+            yield update
+
+
+def create_update(
+    first_update_id: int, final_update_id: int
+) -> BinanceOrderBookDepthUpdate:
+    return BinanceOrderBookDepthUpdate(
+        a={Decimal(final_update_id): Decimal("1")},
+        b={},
+        event_time=0,
+        first_update_id=first_update_id,
+        final_update_id=final_update_id,
+    )
+
+
+async def test_gap_is_resynchronized_without_reconnecting() -> None:
+    collector = BinanceCollector(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        symbol="BTC/USDT",
+        delimiter=Decimal("1"),
+    )
+    ws_client = MockBinanceWebsocketClient(
+        [
+            create_update(5, 10),
+            create_update(11, 12),
+            # Updates 13-14 are lost
+            create_update(15, 16),
+            create_update(17, 18),
+            create_update(19, 20),
+        ]
+    )
+    http_client = MockBinanceHttpClient(
+        [
+            BinanceOrderBookSnapshot(a={}, b={}, last_update_id=8),
+            BinanceOrderBookSnapshot(a={}, b={}, last_update_id=18),
+        ]
+    )
+    collector._http_client = http_client  # type: ignore
+    collector._ws_client = ws_client  # type: ignore
+
+    events: list[OrderBookEvent] = [
+        event async for event in collector._broadcast_stream()
+    ]
+
+    assert [type(event) for event in events] == [
+        BinanceOrderBookSnapshot,
+        BinanceOrderBookDepthUpdate,
+        BinanceOrderBookDepthUpdate,
+        BinanceOrderBookSnapshot,
+        BinanceOrderBookDepthUpdate,
+    ]
+    assert [
+        event.final_update_id
+        for event in events
+        if isinstance(event, BinanceOrderBookDepthUpdate)
+    ] == [10, 12, 20]
+    assert ws_client.connections_count == 1
+    # The resync snapshot is fetched ahead of initial ones
+    assert http_client.priorities == [1, 0]
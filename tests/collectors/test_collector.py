@@ -0,0 +1,61 @@
+from decimal import Decimal
+from typing import AsyncGenerator
+from unittest.mock import AsyncMock, patch
+from uuid import UUID
+
+from app.application.common.collector import Collector
+from app.infrastructure.clients.order_book_client.schemas.common import (
+    OrderBookEvent, OrderBookSnapshot)
+from app.utilities.reconnect_utils import ReconnectPolicy
+
+
+class FailingCollector(Collector):
+    host = "failing.example.com"
+    reconnect_policy = ReconnectPolicy(
+        initial_delay=1.0, jitter=0, max_attempts=3
+    )
+
+    def __init__(self, failures_count: int) -> None:
+        super().__init__(
+            launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+            pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+            symbol="BTC/USDT",
+            delimiter=Decimal("0.1"),
+        )
+        self._failures_count = failures_count
+
+    async def _broadcast_stream(self) -> AsyncGenerator[OrderBookEvent, None]:
+        if self._failures_count:
+            self._failures_count -= 1
+            raise ConnectionError("Connection refused")
+
+        yield OrderBookSnapshot(a={}, b={})
+        self.is_interrupted = True
+
+
+@patch(
+    "app.application.common.collector.asyncio.sleep", new_callable=AsyncMock
+)
+async def test_failed_connections_are_backed_off(
+    sleep_mock: AsyncMock,
+) -> None:
+    collector = FailingCollector(failures_count=2)
+
+    events = [event async for event in collector.listen_stream()]
+
+    assert events == [OrderBookSnapshot(a={}, b={})]
+    assert [call.args[0] for call in sleep_mock.call_args_list] == [1.0, 2.0]
+
+
+@patch(
+    "app.application.common.collector.asyncio.sleep", new_callable=AsyncMock
+)
+async def test_collecting_stops_after_max_attempts(
+    sleep_mock: AsyncMock,
+) -> None:
+    collector = FailingCollector(failures_count=5)
+
+    events = [event async for event in collector.listen_stream()]
+
+    assert events == []
+    assert sleep_mock.await_count == 2
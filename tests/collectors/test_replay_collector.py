@@ -0,0 +1,175 @@
+import asyncio
+import json
+import time
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID
+
+from app.application.collectors.replay_collector import ReplayCollector
+from app.infrastructure.clients.frame_recorder import (FrameRecorder,
+                                                       find_first_received_at)
+from app.infrastructure.clients.order_book_client.schemas.binance import (
+    BinanceOrderBookDepthUpdate, BinanceOrderBookSnapshot)
+from app.utilities.scheduling_utils import Scheduler
+from app.utilities.time_utils import Clock, ReplayClock, set_clock
+
+
+def create_update_frame(first_update_id: int, final_update_id: int) -> str:
+    update = {
+        "e": "depthUpdate",
+        "E": final_update_id,
+        "s": "BTCUSDT",
+        "U": first_update_id,
+        "u": final_update_id,
+        "b": [["100.0", str(final_update_id)]],
+        "a": [],
+    }
+
+    # Frames of combined-stream connections are wrapped
+    return json.dumps({"stream": "btcusdt@depth", "data": update})
+
+
+async def test_recorded_binance_frames_are_replayed(tmp_path: Path) -> None:
+    recorder = FrameRecorder(
+        directory=tmp_path, exchange_name="BINANCE", symbol="BTC/USDT"
+    )
+    recorder.record(create_update_frame(1, 5), received_at=1 * 10**9)
+    recorder.record(
+        json.dumps({"lastUpdateId": 6, "bids": [["99.0", "1"]], "asks": []}),
+        kind="snapshot",
+        received_at=2 * 10**9,
+    )
+    recorder.record(create_update_frame(6, 8), received_at=3 * 10**9)
+    recorder.record(create_update_frame(9, 10), received_at=4 * 10**9)
+    await recorder.close()
+
+    clock = ReplayClock()
+    collector = ReplayCollector(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        symbol="BTC/USDT",
+        delimiter=Decimal("0.1"),
+        exchange_name="BINANCE",
+        directory=tmp_path,
+        speed=0,
+        clock=clock,
+    )
+
+    events = [event async for event in collector.listen_stream()]
+
+    assert events == [
+        BinanceOrderBookSnapshot(
+            b={Decimal("99.0"): Decimal("1")}, a={}, last_update_id=6
+        ),
+        BinanceOrderBookDepthUpdate(
+            b={Decimal("100.0"): Decimal("8")},
+            a={},
+            event_time=8,
+            first_update_id=6,
+            final_update_id=8,
+        ),
+        BinanceOrderBookDepthUpdate(
+            b={Decimal("100.0"): Decimal("10")},
+            a={},
+            event_time=10,
+            first_update_id=9,
+            final_update_id=10,
+        ),
+    ]
+    assert clock.time() == 4.0
+
+
+async def test_jobs_scheduled_before_first_frame_follow_replayed_time(
+    tmp_path: Path,
+) -> None:
+    recorder = FrameRecorder(
+        directory=tmp_path, exchange_name="BINANCE", symbol="BTC/USDT"
+    )
+    recorder.record(
+        json.dumps({"lastUpdateId": 0, "bids": [["99.0", "1"]], "asks": []}),
+        kind="snapshot",
+        received_at=1_700_000_000 * 10**9,
+    )
+    for update_id in range(1, 36):
+        recorder.record(
+            create_update_frame(update_id, update_id),
+            received_at=(1_700_000_000 + update_id) * 10**9,
+        )
+    await recorder.close()
+
+    first_received_at = find_first_received_at(tmp_path)
+    assert first_received_at == 1_700_000_000 * 10**9
+
+    clock = ReplayClock(start_time=first_received_at / 1e9)
+    set_clock(clock)
+    scheduler = Scheduler()
+    start_times: list[float] = []
+
+    async def job() -> None:
+        start_times.append(clock.time())
+
+    # Jobs are scheduled before the processors replay the first frame
+    scheduled_job = scheduler.add_job(job, 10, phase=0)
+    collector = ReplayCollector(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        symbol="BTC/USDT",
+        delimiter=Decimal("0.1"),
+        exchange_name="BINANCE",
+        directory=tmp_path,
+        speed=0,
+        clock=clock,
+    )
+
+    try:
+        async for _ in collector.listen_stream():
+            await asyncio.sleep(0)
+    finally:
+        scheduler.remove_job(scheduled_job)
+        set_clock(Clock())
+
+    # Ticks start one interval after the first frame, none is missed
+    assert start_times == [1_700_000_010, 1_700_000_020, 1_700_000_030]
+    assert scheduled_job.lateness == 0
+
+
+def test_first_received_at_of_empty_directory_is_none(tmp_path: Path) -> None:
+    assert find_first_received_at(tmp_path) is None
+
+
+async def test_pairs_are_paced_from_earliest_recorded_frame(
+    tmp_path: Path,
+) -> None:
+    for symbol, received_at in (("BTC/USDT", 100), ("ETH/USDT", 103)):
+        recorder = FrameRecorder(
+            directory=tmp_path, exchange_name="BINANCE", symbol=symbol
+        )
+        recorder.record(
+            json.dumps({"lastUpdateId": 0, "bids": [], "asks": []}),
+            kind="snapshot",
+            received_at=received_at * 10**9,
+        )
+        await recorder.close()
+
+    first_received_at = find_first_received_at(tmp_path)
+    assert first_received_at == 100 * 10**9
+
+    clock = ReplayClock(start_time=first_received_at / 1e9)
+    collector = ReplayCollector(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        symbol="ETH/USDT",
+        delimiter=Decimal("0.1"),
+        exchange_name="BINANCE",
+        directory=tmp_path,
+        speed=10,
+        clock=clock,
+    )
+    started_at = time.monotonic()
+
+    events = [event async for event in collector.listen_stream()]
+
+    # The first frame of the pair is replayed 3 recorded seconds late
+    assert len(events) == 1
+    assert time.monotonic() - started_at >= 0.3
+    assert clock.time() == 103.0
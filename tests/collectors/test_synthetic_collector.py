@@ -0,0 +1,63 @@
+from decimal import Decimal
+from uuid import UUID
+
+from app.application.collectors.synthetic_collector import SyntheticCollector
+from app.infrastructure.clients.order_book_client.schemas.common import (
+    OrderBookEvent, OrderBookSnapshot, OrderBookUpdate)
+from app.utilities.fixed_point_utils import DecimalScale, LevelDecoder
+
+
+def create_collector(seed: int) -> SyntheticCollector:
+    return SyntheticCollector(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        symbol="SYN/USDT",
+        delimiter=Decimal("0.1"),
+        depth=50,
+        update_rate=0,
+        levels_per_update=10,
+        price_drift=3.0,
+        seed=seed,
+        max_updates=500,
+    )
+
+
+async def collect_events(
+    collector: SyntheticCollector,
+) -> list[OrderBookEvent]:
+    return [
+        event async for event in collector.listen_stream() if event is not None
+    ]
+
+
+async def test_synthetic_book_stays_consistent() -> None:
+    collector = create_collector(seed=1)
+
+    events = await collect_events(collector)
+
+    snapshot, *updates = events
+    assert isinstance(snapshot, OrderBookSnapshot)
+    assert len(snapshot.a) == len(snapshot.b) == 50
+    assert len(updates) == collector.updates_count == 500
+    assert collector.is_interrupted
+
+    decoder = LevelDecoder(DecimalScale())
+    asks, bids = decoder.decode(snapshot.a), decoder.decode(snapshot.b)
+    for update in updates:
+        assert isinstance(update, OrderBookUpdate)
+        for levels, changes in ((asks, update.a), (bids, update.b)):
+            for price, quantity in decoder.decode(changes).items():
+                if quantity == 0:
+                    levels.pop(price, None)
+                else:
+                    levels[price] = quantity
+
+        # The book never crosses and keeps within the depth around the mid
+        assert max(bids) < min(asks)
+        assert max(asks) - min(bids) <= Decimal("0.01") * 101
+
+
+async def test_synthetic_feed_is_reproducible() -> None:
+    assert await collect_events(create_collector(seed=7)) == (
+        await collect_events(create_collector(seed=7))
+    )
@@ -1 +1,408 @@
-# TODO: write tests for processor.py
+import asyncio
+from decimal import Decimal
+from typing import AsyncGenerator
+from uuid import UUID
+
+import pytest
+
+from app.application.common.collector import Collector
+from app.application.common.processor import Processor
+from app.infrastructure.clients.order_book_client.schemas.common import (
+    OrderBookEvent, OrderBookSnapshot, OrderBookUpdate)
+from app.utilities.event_utils import EventHandler
+from app.utilities.fixed_point_utils import (DecimalScale, FixedPointScale,
+                                             LevelDecoder)
+
+
+class MockCollector(Collector):
+    def __init__(
+        self,
+        launch_id: UUID,
+        pair_id: UUID,
+        symbol: str,
+        delimiter: Decimal,
+    ):
+        super().__init__(
+            launch_id=launch_id,
+            pair_id=pair_id,
+            symbol=symbol,
+            delimiter=delimiter,
+        )
+
+    async def _broadcast_stream(self) -> AsyncGenerator[OrderBookEvent, None]:
+        # Tests apply the events to the processor directly
+        return
+        yield
+
+
+@pytest.fixture
+def processor(collector: Collector) -> Processor:
+    return Processor(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        event_handler=EventHandler(),
+        symbol="BTC/USDT",
+        delimiter=Decimal("0.1"),
+        collector=collector,
+    )
+
+
+@pytest.fixture
+def collector() -> Collector:
+    return MockCollector(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        symbol="BTC/USDT",
+        delimiter=Decimal("0.1"),
+    )
+
+
+def test_order_book_update(processor: Processor) -> None:
+    processor._init_order_book(
+        OrderBookSnapshot(
+            a={Decimal("101"): Decimal("1"), Decimal("102"): Decimal("2")},
+            b={Decimal("99"): Decimal("1"), Decimal("98"): Decimal("2")},
+        )
+    )
+    processor._update_order_book(
+        OrderBookUpdate(
+            a={Decimal("101"): Decimal("0"), Decimal("103"): Decimal("3")},
+            b={Decimal("100"): Decimal("5")},
+        )
+    )
+
+    assert list(processor.order_book.a.items()) == [
+        (Decimal("102"), Decimal("2")),
+        (Decimal("103"), Decimal("3")),
+    ]
+    assert list(processor.order_book.b.items()) == [
+        (Decimal("100"), Decimal("5")),
+        (Decimal("99"), Decimal("1")),
+        (Decimal("98"), Decimal("2")),
+    ]
+
+
+def test_order_book_update_with_raw_levels(collector: Collector) -> None:
+    processor = Processor(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        event_handler=EventHandler(),
+        symbol="BTC/USDT",
+        delimiter=Decimal("0.1"),
+        collector=collector,
+        level_decoder=LevelDecoder(DecimalScale()),
+    )
+
+    processor._init_order_book(
+        OrderBookSnapshot(
+            a={"101.0": "1.0", "102.0": "2.0"},
+            b={"99.0": "1.0"},
+        )
+    )
+    processor._update_order_book(
+        OrderBookUpdate(
+            a={"101.0": "0.0", "103.0": "3.0"},
+            b={},
+        )
+    )
+
+    assert list(processor.order_book.a.items()) == [
+        (Decimal("102"), Decimal("2")),
+        (Decimal("103"), Decimal("3")),
+    ]
+    assert list(processor.order_book.b.items()) == [
+        (Decimal("99"), Decimal("1"))
+    ]
+
+
+def test_order_book_snapshot_is_not_affected_by_updates(
+    processor: Processor,
+) -> None:
+    processor._init_order_book(
+        OrderBookSnapshot(
+            a={Decimal("101"): Decimal("1")},
+            b={Decimal("99"): Decimal("1")},
+        )
+    )
+
+    snapshot = processor.get_order_book_snapshot()
+
+    assert processor.get_order_book_snapshot() is snapshot
+
+    processor._update_order_book(
+        OrderBookUpdate(
+            a={Decimal("101"): Decimal("0")},
+            b={Decimal("99"): Decimal("2")},
+        )
+    )
+
+    assert snapshot.a == {Decimal("101"): Decimal("1")}
+    assert snapshot.b == {Decimal("99"): Decimal("1")}
+    assert processor.get_order_book_snapshot() is not snapshot
+    assert processor.get_order_book_snapshot().b == {
+        Decimal("99"): Decimal("2")
+    }
+
+
+def test_grouped_order_book_is_updated_incrementally(
+    processor: Processor,
+) -> None:
+    processor._init_order_book(
+        OrderBookSnapshot(
+            a={
+                Decimal("101.05"): Decimal("1"),
+                Decimal("101.1"): Decimal("2"),
+            },
+            b={Decimal("99.97"): Decimal("1"), Decimal("99.91"): Decimal("2")},
+        )
+    )
+
+    grouped_order_book = processor.get_grouped_order_book_snapshot()
+
+    assert grouped_order_book.a == {
+        Decimal("101.0"): Decimal("1"),
+        Decimal("101.1"): Decimal("2"),
+    }
+    assert grouped_order_book.b == {Decimal("99.9"): Decimal("3")}
+
+    processor._update_order_book(
+        OrderBookUpdate(
+            a={
+                Decimal("101.05"): Decimal("0"),
+                Decimal("101.12"): Decimal("3"),
+            },
+            b={Decimal("99.91"): Decimal("0.5"), Decimal("100"): Decimal("4")},
+        )
+    )
+
+    grouped_order_book = processor.get_grouped_order_book_snapshot()
+
+    assert list(grouped_order_book.a.items()) == [
+        (Decimal("101.1"), Decimal("5")),
+    ]
+    assert list(grouped_order_book.b.items()) == [
+        (Decimal("100.0"), Decimal("4")),
+        (Decimal("99.9"), Decimal("1.5")),
+    ]
+
+
+def test_liquidity_totals_follow_order_book_changes(
+    processor: Processor,
+) -> None:
+    processor._init_order_book(
+        OrderBookSnapshot(
+            a={Decimal("101"): Decimal("1"), Decimal("102"): Decimal("2")},
+            b={Decimal("99"): Decimal("1")},
+        )
+    )
+
+    assert processor.asks_liquidity == Decimal("305")
+    assert processor.bids_liquidity == Decimal("99")
+
+    processor._update_order_book(
+        OrderBookUpdate(
+            a={Decimal("101"): Decimal("0"), Decimal("102"): Decimal("0.5")},
+            b={Decimal("99"): Decimal("3"), Decimal("98"): Decimal("1")},
+        )
+    )
+
+    assert processor.asks_liquidity == Decimal("51")
+    assert processor.bids_liquidity == Decimal("395")
+    assert processor.asks_liquidity == sum(
+        price * quantity for price, quantity in processor.order_book.a.items()
+    )
+
+
+def test_order_book_is_pruned_to_depth_limits(collector: Collector) -> None:
+    processor = Processor(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        event_handler=EventHandler(),
+        symbol="BTC/USDT",
+        delimiter=Decimal("1"),
+        collector=collector,
+        max_depth_levels=3,
+        max_depth_percentage=Decimal("5"),
+    )
+    processor._init_order_book(
+        OrderBookSnapshot(
+            a={Decimal(price): Decimal("1") for price in range(101, 106)},
+            b={Decimal(price): Decimal("1") for price in range(90, 100)},
+        )
+    )
+
+    assert list(processor.order_book.a) == [101, 102, 103]
+    # 95 is the lowest bid within 5% of the 100 middle price
+    assert list(processor.order_book.b) == [99, 98, 97]
+    assert processor.pruned_levels_count == 9
+
+    processor.get_grouped_order_book_snapshot()
+    processor._update_order_book(
+        OrderBookUpdate(
+            a={Decimal("100.5"): Decimal("1")},
+            b={Decimal("94"): Decimal("1")},
+        )
+    )
+
+    assert list(processor.order_book.a) == [Decimal("100.5"), 101, 102]
+    assert list(processor.order_book.b) == [99, 98, 97]
+    assert processor.pruned_levels_count == 11
+    assert processor.asks_liquidity == Decimal("303.5")
+    assert processor.bids_liquidity == Decimal("294")
+    assert processor.get_grouped_order_book_snapshot().a == {
+        Decimal("100"): Decimal("1"),
+        Decimal("101"): Decimal("1"),
+        Decimal("102"): Decimal("1"),
+    }
+
+
+@pytest.mark.parametrize("delimiter", ["0.001", "0.015", "0"])
+def test_delimiter_finer_than_price_precision_is_rejected(
+    collector: Collector, delimiter: str
+) -> None:
+    with pytest.raises(ValueError, match="not a positive multiple"):
+        Processor(
+            launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+            pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+            event_handler=EventHandler(),
+            symbol="BTC/USDT",
+            delimiter=Decimal(delimiter),
+            collector=collector,
+            scale=FixedPointScale(price_precision=2, quantity_precision=8),
+        )
+
+
+class ReplayingCollector(MockCollector):
+    def __init__(self, events: list[OrderBookEvent]):
+        super().__init__(
+            launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+            pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+            symbol="BTC/USDT",
+            delimiter=Decimal("0.1"),
+        )
+        self._events = events
+
+    async def _broadcast_stream(self) -> AsyncGenerator[OrderBookEvent, None]:
+        for event in self._events:
+            yield event
+
+        self.is_interrupted = True
+
+
+@pytest.mark.parametrize("batch_updates", [False, True])
+async def test_batched_updates_lead_to_the_same_order_book(
+    batch_updates: bool,
+) -> None:
+    events: list[OrderBookEvent] = [
+        OrderBookSnapshot(
+            a={Decimal("101"): Decimal("1")}, b={Decimal("99"): Decimal("1")}
+        ),
+        OrderBookUpdate(a={Decimal("102"): Decimal("2")}, b={}),
+        OrderBookUpdate(
+            a={Decimal("102"): Decimal("0")}, b={Decimal("98"): Decimal("3")}
+        ),
+        OrderBookUpdate(a={Decimal("101"): Decimal("4")}, b={}),
+    ]
+    event_handler = EventHandler()
+    emitted_events: list[str] = []
+    event_handler.on("init", lambda: emitted_events.append("init"))
+    event_handler.on("update", lambda: emitted_events.append("update"))
+    processor = Processor(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        event_handler=event_handler,
+        symbol="BTC/USDT",
+        delimiter=Decimal("0.1"),
+        collector=ReplayingCollector(events),
+        batch_updates=batch_updates,
+    )
+
+    await processor.run()
+
+    assert processor.order_book.a == {Decimal("101"): Decimal("4")}
+    assert processor.order_book.b == {
+        Decimal("99"): Decimal("1"),
+        Decimal("98"): Decimal("3"),
+    }
+    assert processor.asks_liquidity == Decimal("404")
+    if batch_updates:
+        assert emitted_events == ["init", "update"]
+    else:
+        assert emitted_events == ["init", "update", "update", "update"]
+
+
+@pytest.mark.parametrize("batch_updates", [False, True])
+async def test_collector_failure_is_raised(batch_updates: bool) -> None:
+    class FailingCollector(MockCollector):
+        async def listen_stream(
+            self,
+        ) -> AsyncGenerator[OrderBookEvent | None, None]:
+            yield OrderBookSnapshot(
+                a={Decimal("101"): Decimal("1")},
+                b={Decimal("99"): Decimal("1")},
+            )
+            raise ConnectionError("Stream failed")
+
+    processor = Processor(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        event_handler=EventHandler(),
+        symbol="BTC/USDT",
+        delimiter=Decimal("0.1"),
+        collector=FailingCollector(
+            launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+            pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+            symbol="BTC/USDT",
+            delimiter=Decimal("0.1"),
+        ),
+        batch_updates=batch_updates,
+    )
+
+    with pytest.raises(ConnectionError, match="Stream failed"):
+        await processor.run()
+
+    # Events read before the failure are applied
+    assert processor.order_book.a == {Decimal("101"): Decimal("1")}
+
+
+async def test_processor_stopped_while_events_queue_is_full() -> None:
+    events: list[OrderBookEvent] = [
+        OrderBookSnapshot(
+            a={Decimal("101"): Decimal("1")}, b={Decimal("99"): Decimal("1")}
+        )
+    ] + [
+        OrderBookUpdate(a={Decimal("102"): Decimal(quantity)}, b={})
+        for quantity in range(1, 10)
+    ]
+    processor_task: asyncio.Task | None = None
+
+    class StoppingCollector(ReplayingCollector):
+        async def _broadcast_stream(
+            self,
+        ) -> AsyncGenerator[OrderBookEvent, None]:
+            for index, event in enumerate(self._events):
+                # The queue of 2 events is full when the third is read
+                if index == 2 and processor_task is not None:
+                    processor_task.cancel()
+
+                yield event
+
+    processor = Processor(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        event_handler=EventHandler(),
+        symbol="BTC/USDT",
+        delimiter=Decimal("0.1"),
+        collector=StoppingCollector(events),
+        batch_updates=True,
+        events_queue_size=2,
+    )
+    processor_task = asyncio.create_task(processor.run())
+
+    with pytest.raises(asyncio.CancelledError):
+        await processor_task
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    # The reader of the stream is not left waiting for room in the queue
+    assert asyncio.all_tasks() == {asyncio.current_task()}
@@ -16,6 +16,8 @@ from app.infrastructure.clients.order_book_client.schemas.common import (
 from app.infrastructure.db.models.order_book_anomaly import \
     OrderBookAnomalyModel
 from app.utilities.event_utils import EventHandler
+from app.utilities.fixed_point_utils import FixedPointScale, LevelValue
+from app.utilities.order_book_utils import OrderBookSide
 
 
 class MockCollector(Collector):
@@ -37,6 +39,14 @@ class MockCollector(Collector):
         pass
 
 
+def create_order_book(
+    b: dict[LevelValue, LevelValue], a: dict[LevelValue, LevelValue]
+) -> OrderBook:
+    return OrderBook(
+        b=OrderBookSide(b, is_descending=True), a=OrderBookSide(a)
+    )
+
+
 @pytest.fixture
 def processor(collector: Collector) -> Processor:
     return Processor(
@@ -78,7 +88,7 @@ async def test_valid_anomaly_detection_first_positions_not_match_liquidity(
 ) -> None:
     current_time = 1.0
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("9.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -239,7 +249,7 @@ async def test_valid_anomaly_detection_and_put_for_observe_non_first_positions(
 ) -> None:
     current_time = 1.0
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -337,7 +347,7 @@ async def test_non_first_already_observing_anomalies_for_notification_after_expi
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -431,7 +441,7 @@ async def test_real_orders_valid_processing_when_new_one_appears(
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -506,7 +516,7 @@ async def test_real_orders_observing_does_not_exist(
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("33000.0"): Decimal("1.0"),
             Decimal("37100.0"): Decimal("1.0"),
@@ -574,7 +584,7 @@ async def test_real_orders_valid_processing_changed_more_than_ratio(
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -644,7 +654,7 @@ async def test_real_orders_nothing_match_order_anomaly_multiplier(
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -690,7 +700,7 @@ async def test_skipping_the_first_position_anomaly_that_has_non_expired_key_in_c
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("30.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -748,7 +758,7 @@ async def test_skipping_non_first_position_anomaly_that_has_non_expired_key_in_c
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("2.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -820,7 +830,7 @@ async def test_passing_first_position_anomaly_and_adding_to_cache_if_anomaly_key
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("30.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -884,7 +894,7 @@ async def test_passing_first_position_anomaly_and_adding_to_cache_if_anomaly_key
 ) -> None:
     current_time = 5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("30.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -962,7 +972,7 @@ async def test_passing_first_position_anomaly_and_adding_to_cache_if_input_anoma
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("60.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1036,7 +1046,7 @@ async def test_passing_non_first_position_anomaly_and_adding_to_cache_if_anomaly
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1100,7 +1110,7 @@ async def test_passing_non_first_position_anomaly_and_adding_to_cache_if_anomaly
 ) -> None:
     current_time = 5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1175,7 +1185,7 @@ async def test_passing_non_first_position_anomaly_and_adding_to_cache_if_input_a
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1252,7 +1262,7 @@ async def test_deleting_expired_keys_from_cache_that_doesnt_exist_in_order_book(
 ) -> None:
     current_time = 10
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1311,7 +1321,7 @@ async def test_valid_anomaly_detection_first_positions_not_match_minimum_liquidi
 ) -> None:
     current_time = 1.0
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("9.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1358,7 +1368,7 @@ async def test_valid_anomaly_detection_valid_match_maximum_anomalies_per_overboo
 ) -> None:
     current_time = 1.0
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27300.0"): Decimal("1.5"),
             Decimal("27400.0"): Decimal("1.5"),
@@ -1411,7 +1421,7 @@ async def test_valid_anomaly_detection_valid_match_maximum_anomalies_per_order_b
 ) -> None:
     current_time = 1.0
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27300.0"): Decimal("1.5"),
             Decimal("27400.0"): Decimal("1.5"),
@@ -1492,7 +1502,7 @@ async def test_non_first_already_observing_anomalies_for_db_saving_after_expirat
             is_cancelled=None,
         ),
     ]
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1679,7 +1689,7 @@ async def test_non_first_placed_in_observing_saved_limit_anomalies_ratio(
             is_cancelled=None,
         ),
     ]
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1767,7 +1777,7 @@ async def test_non_first_anomaly_did_not_canceled(
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1853,7 +1863,7 @@ async def test_non_first_anomaly_canceled(
     mock_get_current_time.return_value = current_time
     mock_send_anomaly_cancellations.return_value = []
 
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -1963,7 +1973,7 @@ async def test_valid_anomaly_canceled(
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -2079,7 +2089,7 @@ async def test_valid_anomaly_canceled_ask_by_unexpected_changing(
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("30000.0"): Decimal("1.0"),
         },
@@ -2195,7 +2205,7 @@ async def test_valid_anomaly_canceled_bid_by_unexpected_changing(
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("20000.0"): Decimal("1.0"),
         },
@@ -2311,7 +2321,7 @@ async def test_valid_anomaly_first_position_realized(
 ) -> None:
     current_time = 2.5
     mock_get_current_time.return_value = current_time
-    processor._order_book = OrderBook(
+    processor._order_book = create_order_book(
         b={
             Decimal("27200.0"): Decimal("1.0"),
             Decimal("27100.0"): Decimal("2.0"),
@@ -2387,3 +2397,82 @@ async def test_valid_anomaly_first_position_realized(
     assert mock_send_anomalies_realizations.call_count == 1
     assert mock_confirm_anomalies.call_count == 1
     assert order_anomaly_realization == expected_order_anomaly_realization
+
+
+@patch(
+    "app.application.workers.orders_worker.create_order_book_anomalies",
+    new_callable=AsyncMock,
+)
+@patch(
+    "app.application.workers.orders_worker.OrdersWorker._send_anomalies",
+    new_callable=AsyncMock,
+)
+@patch(
+    "app.application.workers.orders_worker.get_current_time",
+)
+async def test_valid_anomaly_detection_for_fixed_point_order_book(
+    mock_get_current_time: Mock,
+    mock_send_anomalies: AsyncMock,
+    mock_create_order_book_anomalies: AsyncMock,
+    collector: Collector,
+) -> None:
+    mock_get_current_time.return_value = 1.0
+    processor = Processor(
+        launch_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        pair_id=UUID("d8f4b7c5-5d9c-4b9c-8b3b-9c0c5d9f4b7c"),
+        event_handler=EventHandler(),
+        symbol="BTC/USDT",
+        delimiter=Decimal("0.1"),
+        collector=collector,
+        scale=FixedPointScale(price_precision=1, quantity_precision=1),
+    )
+    processor._order_book = create_order_book(
+        b={
+            272000: 90,
+            271000: 20,
+            270000: 30,
+            269000: 10,
+            268000: 200,
+        },
+        a={
+            273000: 90,
+            274000: 10,
+            275000: 10,
+            276000: 10,
+            278000: 200,
+        },
+    )
+    worker = OrdersWorker(
+        processor=processor,
+        order_anomaly_multiplier=1.5,
+        anomalies_detection_ttl=1,
+        anomalies_observing_ttl=1,
+        anomalies_observing_ratio=0.5,
+        top_n_orders=4,
+    )
+
+    await worker._run_worker()
+
+    assert mock_send_anomalies.call_count == 1
+    assert mock_create_order_book_anomalies.call_count == 1
+
+    order_anomaly_notifications = mock_send_anomalies.call_args_list[0][0][0]
+
+    assert order_anomaly_notifications == [
+        OrderAnomaly(
+            price=Decimal("27300.0"),
+            quantity=Decimal("9.0"),
+            order_liquidity=Decimal("245700.00"),
+            average_liquidity=Decimal("27500.00"),
+            position=0,
+            type="ask",
+        ),
+        OrderAnomaly(
+            price=Decimal("27200.0"),
+            quantity=Decimal("9.0"),
+            order_liquidity=Decimal("244800.00"),
+            average_liquidity=Decimal("54033.33333333333333333333333"),
+            position=0,
+            type="bid",
+        ),
+    ]
@@ -0,0 +1,94 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from app.utilities.fixed_point_utils import LevelValue
+from app.utilities.order_book_utils import (OrderBookSide,
+                                            update_grouped_order_book_side)
+
+pytest.importorskip("numpy")
+
+from app.utilities.columnar_order_book_utils import \
+    ColumnarOrderBookSide  # noqa: E402
+
+
+@pytest.mark.parametrize("is_descending", [False, True])
+def test_columnar_side_matches_dict_side(is_descending: bool) -> None:
+    random.seed(42)
+    levels: dict[LevelValue, LevelValue] = {
+        random.randint(1, 1000): random.randint(1, 100) for _ in range(200)
+    }
+    side = OrderBookSide(levels, is_descending=is_descending)
+    columnar_side = ColumnarOrderBookSide(levels, is_descending=is_descending)
+
+    for _ in range(20):
+        update: dict[LevelValue, LevelValue] = {
+            random.randint(1, 1000): random.choice([0, random.randint(1, 100)])
+            for _ in range(30)
+        }
+
+        assert sorted(columnar_side.update_levels(update)) == sorted(
+            side.update_levels(update)
+        )
+        assert list(columnar_side.items()) == list(side.items())
+
+    assert columnar_side.best_price == side.best_price
+    assert columnar_side.liquidity() == side.liquidity()
+    assert columnar_side.top(10) == side.top(10)
+    assert columnar_side.rank_by_liquidity(10) == side.rank_by_liquidity(10)
+    assert list(columnar_side.group(50).items()) == list(
+        side.group(50).items()
+    )
+    assert columnar_side.truncate(50) == side.truncate(50)
+    assert columnar_side.truncate_beyond_price(500) == (
+        side.truncate_beyond_price(500)
+    )
+    assert list(columnar_side.items()) == list(side.items())
+
+
+def test_columnar_side_mapping_operations() -> None:
+    side = ColumnarOrderBookSide({3: 1, 1: 2})
+
+    side[2] = 5
+    side[3] = 4
+
+    assert list(side) == [1, 2, 3]
+    assert side[3] == 4
+    assert side.get(10) is None
+    assert side.pop(1) == 2
+    assert side.pop(1, 0) == 0
+    assert 1 not in side
+
+    with pytest.raises(KeyError):
+        del side[1]
+
+
+def test_columnar_side_snapshot_is_not_affected_by_updates() -> None:
+    side = ColumnarOrderBookSide({1: 1, 2: 2})
+
+    snapshot = side.snapshot()
+    side.update_levels({1: 0, 2: 5, 3: 3})
+    side.truncate(1)
+
+    assert snapshot == {1: 1, 2: 2}
+    assert side == {2: 5}
+
+
+def test_grouped_columnar_side_is_updated_in_one_batch() -> None:
+    grouped_side = ColumnarOrderBookSide({100: 3, 110: 1, 120: 2})
+
+    with patch.object(
+        ColumnarOrderBookSide,
+        "update_levels",
+        autospec=True,
+        side_effect=ColumnarOrderBookSide.update_levels,
+    ) as update_levels_mock:
+        update_grouped_order_book_side(
+            grouped_side,
+            [(101, 2), (105, -1), (112, -1), (125, 0), (131, 4)],
+            10,
+        )
+
+    assert update_levels_mock.call_count == 1
+    assert list(grouped_side.items()) == [(100, 4), (120, 2), (130, 4)]
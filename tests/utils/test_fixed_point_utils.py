@@ -0,0 +1,59 @@
+from decimal import Decimal
+
+from app.utilities.fixed_point_utils import (DecimalScale, FixedPointScale,
+                                             LevelDecoder, RawScale,
+                                             create_level_scale,
+                                             from_fixed_point, to_fixed_point)
+
+
+def test_to_fixed_point() -> None:
+    assert to_fixed_point("27000.01000000", 2) == 2700001
+    assert to_fixed_point("0.00000000", 8) == 0
+    assert to_fixed_point("12", 3) == 12000
+    assert to_fixed_point("1.5", 0) == 2
+    assert to_fixed_point("0.125", 2) == 13
+    assert to_fixed_point(Decimal("1.23"), 2) == 123
+
+
+def test_from_fixed_point() -> None:
+    assert from_fixed_point(2700001, 2) == Decimal("27000.01")
+    assert from_fixed_point(0, 8) == Decimal(0)
+
+
+def test_fixed_point_scale() -> None:
+    scale = FixedPointScale(price_precision=2, quantity_precision=3)
+
+    price = scale.parse_price("100.25")
+    quantity = scale.parse_quantity("0.5")
+
+    assert price == 10025
+    assert quantity == 500
+    assert scale.to_decimal_price(price) == Decimal("100.25")
+    assert scale.to_decimal_quantity(quantity) == Decimal("0.5")
+    assert scale.to_decimal_liquidity(price * quantity) == Decimal("50.125")
+    assert scale.parse_liquidity(Decimal("50.125")) == price * quantity
+
+
+def test_create_level_scale() -> None:
+    assert isinstance(create_level_scale(None, None), DecimalScale)
+    assert isinstance(create_level_scale(2, None), DecimalScale)
+    assert isinstance(create_level_scale(2, 8), FixedPointScale)
+
+
+def test_level_decoder_decodes_raw_levels() -> None:
+    scale = FixedPointScale(price_precision=2, quantity_precision=3)
+    raw_scale = RawScale(scale)
+    decoder = LevelDecoder(scale, max_cache_size=2)
+
+    raw_levels = {
+        raw_scale.parse_price("100.25"): raw_scale.parse_quantity("0.5"),
+        raw_scale.parse_price("100.50"): raw_scale.parse_quantity("0.000"),
+    }
+
+    assert raw_levels == {"100.25": "0.5", "100.50": "0.000"}
+    assert decoder.decode(raw_levels) == {10025: 500, 10050: 0}
+    assert decoder.decode({"100.25": "1", "101.00": "0.5"}) == {
+        10025: 1000,
+        10100: 500,
+    }
+    assert raw_scale.scale.to_decimal_price(10025) == Decimal("100.25")
@@ -0,0 +1,17 @@
+import json
+
+import pytest
+
+from app.utilities.json_utils import get_json_decoder
+
+
+def test_stdlib_decoder_is_used_when_forced() -> None:
+    assert get_json_decoder("json") is json.loads
+
+
+@pytest.mark.parametrize("name", ["auto", "orjson", "json"])
+def test_decoders_accept_bytes(name: str) -> None:
+    decode = get_json_decoder(name)  # type: ignore[arg-type]
+
+    assert decode(b'{"b":[["0.1","1.5"]]}') == {"b": [["0.1", "1.5"]]}
+    assert decode('{"u": 1}') == {"u": 1}
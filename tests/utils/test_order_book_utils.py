@@ -0,0 +1,119 @@
+import copy
+from decimal import Decimal
+
+from app.utilities.order_book_utils import OrderBookSide
+
+
+def test_order_book_side_keeps_asks_sorted_ascending() -> None:
+    side = OrderBookSide(
+        {Decimal("3"): Decimal("1"), Decimal("1"): Decimal("2")}
+    )
+
+    side[Decimal("2")] = Decimal("5")
+    side[Decimal("0.5")] = Decimal("7")
+
+    assert list(side) == [
+        Decimal("0.5"),
+        Decimal("1"),
+        Decimal("2"),
+        Decimal("3"),
+    ]
+    assert side.best_price == Decimal("0.5")
+
+
+def test_order_book_side_keeps_bids_sorted_descending() -> None:
+    side = OrderBookSide(
+        {Decimal("1"): Decimal("1"), Decimal("3"): Decimal("2")},
+        is_descending=True,
+    )
+
+    side[Decimal("2")] = Decimal("5")
+
+    assert list(side) == [Decimal("3"), Decimal("2"), Decimal("1")]
+    assert side.best_price == Decimal("3")
+
+
+def test_order_book_side_update_and_delete() -> None:
+    side = OrderBookSide(
+        {Decimal("1"): Decimal("1"), Decimal("2"): Decimal("2")}
+    )
+
+    side[Decimal("1")] = Decimal("10")
+    assert side[Decimal("1")] == Decimal("10")
+    assert len(side) == 2
+
+    assert side.pop(Decimal("1")) == Decimal("10")
+    assert side.pop(Decimal("1")) is None
+    assert Decimal("1") not in side
+    assert list(side) == [Decimal("2")]
+
+    del side[Decimal("2")]
+    assert len(side) == 0
+    assert side.best_price is None
+
+
+def test_order_book_side_top() -> None:
+    asks = OrderBookSide({Decimal(price): Decimal(1) for price in range(10)})
+    bids = OrderBookSide(
+        {Decimal(price): Decimal(1) for price in range(10)}, is_descending=True
+    )
+
+    assert [price for price, _ in asks.top(3)] == [0, 1, 2]
+    assert [price for price, _ in bids.top(3)] == [9, 8, 7]
+    assert bids.top(0) == []
+    assert len(asks.top(100)) == 10
+
+
+def test_order_book_side_copies_are_independent() -> None:
+    side = OrderBookSide({Decimal("1"): Decimal("1")}, is_descending=True)
+
+    for copied_side in [side.copy(), copy.deepcopy(side)]:
+        copied_side[Decimal("2")] = Decimal("2")
+
+        assert copied_side.is_descending
+        assert copied_side.best_price == Decimal("2")
+        assert list(side) == [Decimal("1")]
+        assert side == {Decimal("1"): Decimal("1")}
+
+
+def test_order_book_side_snapshot_is_copy_on_write() -> None:
+    side = OrderBookSide({Decimal("1"): Decimal("1")})
+
+    snapshot = side.snapshot()
+    side[Decimal("2")] = Decimal("2")
+    del side[Decimal("1")]
+
+    assert snapshot == {Decimal("1"): Decimal("1")}
+    assert list(snapshot) == [Decimal("1")]
+    assert side == {Decimal("2"): Decimal("2")}
+
+    snapshot[Decimal("3")] = Decimal("3")
+
+    assert side == {Decimal("2"): Decimal("2")}
+
+
+def test_order_book_side_truncate() -> None:
+    asks = OrderBookSide({Decimal(price): Decimal(1) for price in range(10)})
+    bids = OrderBookSide(
+        {Decimal(price): Decimal(1) for price in range(10)}, is_descending=True
+    )
+
+    assert [price for price, _ in asks.truncate(3)] == list(range(3, 10))
+    assert [price for price, _ in bids.truncate(3)] == list(range(0, 7))
+    assert list(asks) == [0, 1, 2]
+    assert list(bids) == [9, 8, 7]
+    assert asks.truncate(5) == []
+
+
+def test_order_book_side_truncate_beyond_price() -> None:
+    asks = OrderBookSide({Decimal(price): Decimal(1) for price in range(10)})
+    bids = OrderBookSide(
+        {Decimal(price): Decimal(1) for price in range(10)}, is_descending=True
+    )
+    snapshot = asks.snapshot()
+
+    assert len(asks.truncate_beyond_price(Decimal("6"))) == 3
+    assert len(bids.truncate_beyond_price(Decimal("2.5"))) == 3
+    assert list(asks) == list(range(7))
+    assert list(bids) == list(range(9, 2, -1))
+    assert len(snapshot) == 10
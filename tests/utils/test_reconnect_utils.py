@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from app.utilities.reconnect_utils import CircuitBreaker, ReconnectPolicy
+
+
+@pytest.mark.parametrize(
+    "attempt, max_delay", [(1, 1.0), (2, 2.0), (3, 4.0), (10, 30.0)]
+)
+def test_reconnect_delay_grows_exponentially(
+    attempt: int, max_delay: float
+) -> None:
+    policy = ReconnectPolicy(initial_delay=1.0, max_delay=30.0, jitter=0.5)
+
+    for _ in range(100):
+        assert max_delay / 2 <= policy.get_delay(attempt) <= max_delay
+
+
+def test_reconnect_attempts_are_exhausted() -> None:
+    assert not ReconnectPolicy().is_exhausted(100)
+    assert not ReconnectPolicy(max_attempts=3).is_exhausted(2)
+    assert ReconnectPolicy(max_attempts=3).is_exhausted(3)
+
+
+async def test_circuit_breaker_lets_one_probe_after_timeout() -> None:
+    circuit_breaker = CircuitBreaker(
+        host="example.com", failure_threshold=2, reset_timeout=0.05
+    )
+
+    circuit_breaker.record_failure()
+    assert not circuit_breaker.is_open
+
+    circuit_breaker.record_failure()
+    assert circuit_breaker.is_open
+
+    started_at = time.monotonic()
+    await circuit_breaker.wait()
+
+    assert time.monotonic() - started_at >= 0.04
+    # Still open for the others until the probe succeeds
+    assert circuit_breaker.is_open
+
+    circuit_breaker.record_success()
+    assert not circuit_breaker.is_open
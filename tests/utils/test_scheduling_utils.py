@@ -1,83 +1,215 @@
 import asyncio
-from unittest.mock import AsyncMock, Mock, patch
+from typing import Any, AsyncIterator, Callable, Coroutine
 
-from app.utilities.scheduling_utils import SetInterval
+import pytest
+from prometheus_client import REGISTRY
 
+from app.utilities.scheduling_utils import (OverrunPolicy, Scheduler,
+                                            SetInterval, get_first_deadline)
+from app.utilities.time_utils import Clock, ReplayClock, set_clock
 
-@SetInterval(5, "test")
-async def func(callback_event: asyncio.Event | None = None) -> None:
-    if callback_event:
-        callback_event.set()
 
+@pytest.fixture
+async def clock() -> AsyncIterator[ReplayClock]:
+    replay_clock = ReplayClock()
+    set_clock(replay_clock)
 
-@patch(
-    "app.utilities.scheduling_utils.get_current_time",
-)
-@patch(
-    "app.utilities.scheduling_utils.SetInterval.get_is_interrupted",
-)
-@patch(
-    "app.utilities.scheduling_utils.asyncio.sleep",
-    new_callable=AsyncMock,
-)
-async def test_is_fast_executed_function_invoked_n_times_in_specified_interval(
-    mock_sleep: AsyncMock,
-    mock_get_is_interrupted: Mock,
-    mock_get_current_time: Mock,
-) -> None:
-    max_call_counts = 200
-    expected_call_counts = 12
-    func_time = 3
-    interval_time = 5
-    tested_time = 59
-
-    expected_call = [False] * max_call_counts + [True]
-    time_sequence_response = [
-        i // 2 * interval_time
-        if i % 2 == 0
-        else (func_time + i // 2 * interval_time)
-        for i in range(2 * max_call_counts)
-    ]
-
-    mock_get_is_interrupted.side_effect = expected_call
-    mock_get_current_time.side_effect = time_sequence_response
+    yield replay_clock
 
-    assert (
-        time_sequence_response[(2 * (expected_call_counts - 1))] <= tested_time
+    set_clock(Clock())
+
+
+async def settle() -> None:
+    # Lets the woken jobs and their runs go on
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+async def advance(clock: ReplayClock, until: float, step: float = 1) -> None:
+    while clock.time() < until:
+        clock.advance_to(clock.time() + step)
+        await settle()
+
+
+def get_dispatches() -> tuple[float, float]:
+    """
+    Returns the number of dispatches of the scheduler and of the jobs they
+    dispatched.
+    """
+    return (
+        REGISTRY.get_sample_value("scheduler_dispatched_jobs_count") or 0.0,
+        REGISTRY.get_sample_value("scheduler_dispatched_jobs_sum") or 0.0,
     )
-    assert time_sequence_response[(2 * expected_call_counts)] >= tested_time
 
 
-@patch(
-    "app.utilities.scheduling_utils.get_current_time",
-)
-@patch(
-    "app.utilities.scheduling_utils.SetInterval.get_is_interrupted",
-)
-@patch(
-    "app.utilities.scheduling_utils.asyncio.sleep",
-    new_callable=AsyncMock,
+async def run_job(
+    clock: ReplayClock,
+    set_interval: SetInterval,
+    until: float,
+    run_time: float = 0,
+) -> list[float]:
+    """
+    Runs a job taking run_time seconds until the time and returns the
+    start times of its runs.
+    """
+    start_times: list[float] = []
+
+    @set_interval
+    async def job(callback_event: asyncio.Event | None = None) -> None:
+        start_times.append(clock.time())
+        await clock.sleep(run_time)
+
+    task = asyncio.create_task(job())
+    await settle()
+    await advance(clock, until)
+    task.cancel()
+
+    return start_times
+
+
+async def test_fast_job_runs_on_fixed_rate_ticks(clock: ReplayClock) -> None:
+    start_times = await run_job(
+        clock, SetInterval(5, "test", phase=0), until=59, run_time=3
+    )
+
+    assert start_times == [5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55]
+
+
+async def test_ticks_are_offset_by_phase(clock: ReplayClock) -> None:
+    start_times = await run_job(
+        clock, SetInterval(5, "test", phase=2), until=20
+    )
+
+    assert start_times == [7, 12, 17]
+
+
+@pytest.mark.parametrize(
+    "overrun_policy, expected_start_times",
+    [
+        # Ticks at 10, 15 and 20 are missed by the run started at 5
+        (OverrunPolicy.SKIP, [5, 25, 45]),
+        (OverrunPolicy.COALESCE, [5, 22, 39]),
+        (OverrunPolicy.CATCH_UP, [5, 22, 39]),
+    ],
 )
-async def test_is_long_executed_function_invoked_n_times_in_specified_interval(
-    mock_sleep: AsyncMock,
-    mock_get_is_interrupted: Mock,
-    mock_get_current_time: Mock,
+async def test_long_job_follows_overrun_policy(
+    clock: ReplayClock,
+    overrun_policy: OverrunPolicy,
+    expected_start_times: list[float],
+) -> None:
+    set_interval = SetInterval(
+        5, "test", overrun_policy=overrun_policy, phase=0
+    )
+
+    start_times = await run_job(clock, set_interval, until=50, run_time=17)
+
+    assert start_times == expected_start_times
+
+
+async def test_catch_up_runs_missed_ticks_back_to_back(
+    clock: ReplayClock,
 ) -> None:
-    max_call_counts = 200
-    expected_call_counts = 8
-    func_time = 8
-    tested_time = 59
+    set_interval = SetInterval(
+        5, "test", overrun_policy=OverrunPolicy.CATCH_UP, phase=0
+    )
+    start_times: list[float] = []
+    is_released = asyncio.Event()
+
+    @set_interval
+    async def job(callback_event: asyncio.Event | None = None) -> None:
+        start_times.append(clock.time())
+        if len(start_times) == 1:
+            await is_released.wait()
+
+    task = asyncio.create_task(job())
+    await settle()
+    await advance(clock, until=22)
+    is_released.set()
+    await settle()
+    task.cancel()
+
+    # Ticks at 10, 15 and 20 missed by the first run are caught up
+    assert start_times == [5, 22, 22, 22]
+
+
+async def test_concurrent_runs_are_bounded(clock: ReplayClock) -> None:
+    start_times = await run_job(
+        clock,
+        SetInterval(5, "test", max_concurrent_runs=2, phase=0),
+        until=31,
+        run_time=12,
+    )
+
+    # The tick at 15 finds the runs of 5 and 10 busy and is coalesced
+    assert start_times == [5, 10, 17, 22, 29]
+
+
+async def test_due_jobs_are_dispatched_together(clock: ReplayClock) -> None:
+    scheduler = Scheduler()
+    start_times: dict[str, list[float]] = {"a": [], "b": [], "c": []}
 
-    expected_call = [False] * max_call_counts + [True]
-    time_sequence_response = [
-        i // 2 * func_time if i % 2 == 0 else (func_time + i // 2 * func_time)
-        for i in range(2 * max_call_counts)
-    ]
+    def create_job(name: str) -> Callable[[], Coroutine[Any, Any, None]]:
+        async def job() -> None:
+            start_times[name].append(clock.time())
 
-    mock_get_is_interrupted.side_effect = expected_call
-    mock_get_current_time.side_effect = time_sequence_response
+        return job
 
+    dispatches = get_dispatches()
+    scheduler.add_job(create_job("a"), 5, phase=0)
+    scheduler.add_job(create_job("b"), 5, phase=0)
+    scheduler.add_job(create_job("c"), 10, phase=0)
+    await advance(clock, until=20)
+
+    assert start_times == {
+        "a": [5, 10, 15, 20],
+        "b": [5, 10, 15, 20],
+        "c": [10, 20],
+    }
+    # Ticks at 5 and 15 dispatch 2 jobs, ticks at 10 and 20 dispatch 3
+    assert get_dispatches() == (dispatches[0] + 4, dispatches[1] + 10)
+
+
+async def test_job_lateness_is_reported(clock: ReplayClock) -> None:
+    scheduler = Scheduler()
+
+    async def job() -> None:
+        pass
+
+    scheduled_job = scheduler.add_job(job, 5, name="late job", phase=0.5)
+    await advance(clock, until=6)
+
+    # The replayed time only reaches the tick at 5.5 on 6
+    assert scheduled_job.lateness == 0.5
     assert (
-        time_sequence_response[(2 * (expected_call_counts - 1))] <= tested_time
+        REGISTRY.get_sample_value(
+            "scheduler_job_lateness_seconds_sum", {"job": "late job"}
+        )
+        == 0.5
     )
-    assert time_sequence_response[(2 * expected_call_counts)] >= tested_time
+
+
+async def test_removed_job_stops_running(clock: ReplayClock) -> None:
+    scheduler = Scheduler()
+    start_times: list[float] = []
+
+    async def job() -> None:
+        start_times.append(clock.time())
+        await clock.sleep(3)
+        start_times.append(-1)
+
+    scheduled_job = scheduler.add_job(job, 5, phase=0)
+    assert scheduler.jobs_count == 1
+
+    await advance(clock, until=11)
+    scheduler.remove_job(scheduled_job)
+    await advance(clock, until=30)
+
+    # The run started at 10 is cancelled with the job
+    assert start_times == [5, -1, 10]
+    assert scheduler.jobs_count == 0
+
+
+def test_first_deadline_is_aligned_to_phase() -> None:
+    assert get_first_deadline(12, 5, phase=1.5) == 21.5
+    assert get_first_deadline(11.5, 5, phase=1.5) == 16.5
+    assert get_first_deadline(0, 5, phase=0) == 5
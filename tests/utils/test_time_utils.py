@@ -1,14 +1,14 @@
-from datetime import datetime
+import asyncio
 from datetime import datetime as original_datetime
-from datetime import time
-from typing import Callable
-from unittest.mock import patch
+from datetime import time, timezone
 
 from app.utilities.time_utils import (LONDON_TRADING_SESSION,
                                       NEW_YORK_TRADING_SESSION,
-                                      TOKYO_TRADING_SESSION, TradingSession,
+                                      TOKYO_TRADING_SESSION, Clock,
+                                      ReplayClock, TradingSession,
                                       get_current_time,
-                                      is_current_time_inside_trading_sessions)
+                                      is_current_time_inside_trading_sessions,
+                                      set_clock)
 
 
 def test_trading_session() -> None:
@@ -18,59 +18,70 @@ def test_trading_session() -> None:
     assert not ts1.is_time_inside(original_datetime(2022, 1, 1, 12, 1))
 
 
-class MockDateTime:
-    @classmethod
-    def utcnow(cls) -> Callable[[], datetime]:
-        return cls.mocked_utcnow()
-
-    @staticmethod
-    def time(*args: str, **kwargs: int) -> time:
-        return original_datetime.time(*args, **kwargs)
-
-    @staticmethod
-    def datetime(*args: str, **kwargs: int) -> datetime:
-        return original_datetime(*args, **kwargs)
+def test_is_current_time_inside_trading_sessions() -> None:
+    trading_sessions = [
+        TOKYO_TRADING_SESSION,
+        LONDON_TRADING_SESSION,
+        NEW_YORK_TRADING_SESSION,
+    ]
 
+    try:
+        # Sessions follow the clock, which replays recorded time
+        for current_time, is_inside in [
+            (original_datetime(2022, 1, 1, 1, 0), False),
+            (original_datetime(2022, 1, 3, 1, 0), True),
+            (original_datetime(2022, 1, 3, 8, 30), True),
+            (original_datetime(2022, 1, 3, 13, 30), True),
+            (original_datetime(2022, 1, 3, 22, 30), False),
+        ]:
+            set_clock(
+                ReplayClock(
+                    start_time=current_time.replace(
+                        tzinfo=timezone.utc
+                    ).timestamp()
+                )
+            )
 
-@patch("app.utilities.time_utils.datetime", new=MockDateTime)
-def test_is_current_time_inside_trading_sessions() -> None:
-    MockDateTime.mocked_utcnow = lambda: original_datetime(2022, 1, 1, 1, 0)
-    assert not is_current_time_inside_trading_sessions(
-        [
-            TOKYO_TRADING_SESSION,
-            LONDON_TRADING_SESSION,
-            NEW_YORK_TRADING_SESSION,
-        ]
-    )
-
-    MockDateTime.mocked_utcnow = lambda: original_datetime(2022, 1, 3, 1, 0)
-    assert is_current_time_inside_trading_sessions(
-        [
-            TOKYO_TRADING_SESSION,
-            LONDON_TRADING_SESSION,
-            NEW_YORK_TRADING_SESSION,
-        ]
-    )
-
-    MockDateTime.mocked_utcnow = lambda: original_datetime(2022, 1, 3, 8, 30)
-    assert is_current_time_inside_trading_sessions(
-        [
-            TOKYO_TRADING_SESSION,
-            LONDON_TRADING_SESSION,
-            NEW_YORK_TRADING_SESSION,
-        ]
-    )
-
-    MockDateTime.mocked_utcnow = lambda: original_datetime(2022, 1, 3, 13, 30)
-    assert is_current_time_inside_trading_sessions(
-        [
-            TOKYO_TRADING_SESSION,
-            LONDON_TRADING_SESSION,
-            NEW_YORK_TRADING_SESSION,
-        ]
-    )
+            assert (
+                is_current_time_inside_trading_sessions(trading_sessions)
+                == is_inside
+            )
+    finally:
+        set_clock(Clock())
 
 
 def test_get_current_time() -> None:
     result = get_current_time()
     assert isinstance(result, float)
+
+
+async def test_replay_clock_wakes_sleepers_when_advanced() -> None:
+    clock = ReplayClock(start_time=100.0)
+    woken_up: list[str] = []
+
+    async def sleep(name: str, seconds: float) -> None:
+        await clock.sleep(seconds)
+        woken_up.append(name)
+
+    tasks = [
+        asyncio.create_task(sleep("long", 10)),
+        asyncio.create_task(sleep("short", 5)),
+    ]
+    await asyncio.sleep(0)
+
+    clock.advance_to(106.0)
+    await asyncio.sleep(0)
+    assert woken_up == ["short"]
+
+    clock.advance_to(110.0)
+    await asyncio.gather(*tasks)
+    assert woken_up == ["short", "long"]
+
+
+def test_current_time_follows_the_clock() -> None:
+    set_clock(ReplayClock(start_time=100.0))
+
+    try:
+        assert get_current_time() == 100.0
+    finally:
+        set_clock(Clock())